@@ -11,6 +11,7 @@ import asyncio
 # Import your models here
 from app.db.base import Base
 from app.models.job import Job  # Import all models
+from app.models.batch import Batch
 from app.core.config import settings
 
 # this is the Alembic Config object
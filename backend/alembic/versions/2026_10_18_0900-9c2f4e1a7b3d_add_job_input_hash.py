@@ -0,0 +1,28 @@
+"""add job input_hash
+
+Revision ID: 9c2f4e1a7b3d
+Revises: 4837ef55f2af
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c2f4e1a7b3d'
+down_revision: Union[str, None] = '4837ef55f2af'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('jobs', sa.Column('input_hash', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_jobs_input_hash'), 'jobs', ['input_hash'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_jobs_input_hash'), table_name='jobs')
+    op.drop_column('jobs', 'input_hash')
@@ -0,0 +1,26 @@
+"""add job output_parts
+
+Revision ID: 3b8d61c0f5e2
+Revises: 9c2f4e1a7b3d
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8d61c0f5e2'
+down_revision: Union[str, None] = '9c2f4e1a7b3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('jobs', sa.Column('output_parts', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('jobs', 'output_parts')
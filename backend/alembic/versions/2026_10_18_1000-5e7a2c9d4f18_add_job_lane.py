@@ -0,0 +1,30 @@
+"""add job lane and estimated_cost
+
+Revision ID: 5e7a2c9d4f18
+Revises: 3b8d61c0f5e2
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e7a2c9d4f18'
+down_revision: Union[str, None] = '3b8d61c0f5e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('jobs', sa.Column('lane', sa.String(length=20), nullable=True))
+    op.add_column('jobs', sa.Column('estimated_cost', sa.Float(), nullable=True))
+    op.create_index('idx_lane_status_created_at', 'jobs', ['lane', 'status', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_lane_status_created_at', table_name='jobs')
+    op.drop_column('jobs', 'estimated_cost')
+    op.drop_column('jobs', 'lane')
@@ -0,0 +1,26 @@
+"""add job checkpoints
+
+Revision ID: a41f7d3e6b20
+Revises: 5e7a2c9d4f18
+Create Date: 2026-10-18 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41f7d3e6b20'
+down_revision: Union[str, None] = '5e7a2c9d4f18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('jobs', sa.Column('checkpoints', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('jobs', 'checkpoints')
@@ -0,0 +1,32 @@
+"""add job leader_id
+
+Revision ID: c7d3e9a15f42
+Revises: a41f7d3e6b20
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d3e9a15f42'
+down_revision: Union[str, None] = 'a41f7d3e6b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('jobs', sa.Column('leader_id', postgresql.UUID(as_uuid=True), nullable=True))
+    op.create_foreign_key(
+        'fk_jobs_leader_id_jobs', 'jobs', 'jobs', ['leader_id'], ['id'], ondelete='SET NULL'
+    )
+    op.create_index(op.f('ix_jobs_leader_id'), 'jobs', ['leader_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_jobs_leader_id'), table_name='jobs')
+    op.drop_constraint('fk_jobs_leader_id_jobs', 'jobs', type_='foreignkey')
+    op.drop_column('jobs', 'leader_id')
@@ -0,0 +1,52 @@
+"""add batches
+
+Revision ID: e8b4f27c9a61
+Revises: c7d3e9a15f42
+Create Date: 2026-10-18 11:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b4f27c9a61'
+down_revision: Union[str, None] = 'c7d3e9a15f42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('batches',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('total_jobs', sa.Integer(), nullable=False),
+    sa.Column('combine', sa.Boolean(), nullable=False),
+    sa.Column('output_filename', sa.String(length=500), nullable=True),
+    sa.Column('output_path', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_batches_status'), 'batches', ['status'], unique=False)
+    op.create_index(op.f('ix_batches_expires_at'), 'batches', ['expires_at'], unique=False)
+
+    op.add_column('jobs', sa.Column('batch_id', sa.UUID(), nullable=True))
+    op.add_column('jobs', sa.Column('batch_index', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'fk_jobs_batch_id_batches', 'jobs', 'batches', ['batch_id'], ['id'], ondelete='CASCADE'
+    )
+    op.create_index(op.f('ix_jobs_batch_id'), 'jobs', ['batch_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_jobs_batch_id'), table_name='jobs')
+    op.drop_constraint('fk_jobs_batch_id_batches', 'jobs', type_='foreignkey')
+    op.drop_column('jobs', 'batch_index')
+    op.drop_column('jobs', 'batch_id')
+    op.drop_index(op.f('ix_batches_expires_at'), table_name='batches')
+    op.drop_index(op.f('ix_batches_status'), table_name='batches')
+    op.drop_table('batches')
@@ -0,0 +1,25 @@
+"""add job version
+
+Revision ID: f3a8c61d2e07
+Revises: e8b4f27c9a61
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a8c61d2e07'
+down_revision: Union[str, None] = 'e8b4f27c9a61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('jobs', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('jobs', 'version')
@@ -0,0 +1,30 @@
+"""replace status indexes with status, created_at
+
+Revision ID: a9d2e5b7c318
+Revises: f3a8c61d2e07
+Create Date: 2026-10-18 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d2e5b7c318'
+down_revision: Union[str, None] = 'f3a8c61d2e07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Serves list_jobs' status filter and its created_at ordering
+    op.create_index('idx_status_created_at', 'jobs', ['status', 'created_at'], unique=False)
+    op.drop_index('idx_status', table_name='jobs')
+    op.drop_index(op.f('ix_jobs_status'), table_name='jobs')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_jobs_status'), 'jobs', ['status'], unique=False)
+    op.create_index('idx_status', 'jobs', ['status'], unique=False)
+    op.drop_index('idx_status_created_at', table_name='jobs')
@@ -0,0 +1,286 @@
+"""
+Batches API Endpoints.
+
+Handles batch submissions (several PDFs, or several ranges of one PDF),
+aggregate batch status and the combined document download.
+"""
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from pydantic import TypeAdapter, ValidationError
+from celery import group
+from typing import List
+from uuid import UUID
+import uuid
+import logging
+
+from app.api.deps import get_db
+from app.models.batch import Batch
+from app.models.job import Job
+from app.schemas.batch import BatchItem, BatchResponse
+from app.schemas.job import JobResponse
+from app.services.batch_manager import batch_manager, FINISHED_STATUSES
+from app.services.file_manager import file_manager
+from app.services.job_submission import prepare_job, confirm_job
+from app.tasks.processing import process_pdf_pipeline
+from app.tasks.batches import update_batch
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/batches", tags=["batches"])
+
+_items_adapter = TypeAdapter(List[BatchItem])
+
+
+@router.post("/", response_model=BatchResponse, status_code=201)
+async def create_batch(
+    pdf_files: List[UploadFile] = File(..., description="PDF files to process"),
+    items: str = Form(
+        ...,
+        description="JSON list of jobs: POST /jobs/ fields plus file_index (default 0)"
+    ),
+    combine: bool = Form(False, description="Also build one document of all completed jobs"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create a batch of PDF processing jobs in one submission.
+
+    Steps:
+    1. Validate files and job items
+    2. Save each PDF once (jobs on the same PDF share it via hard links)
+    3. Create the batch and all job records in one transaction
+       (result cache and single-flight apply per job)
+    4. Queue the jobs' pipelines as one Celery group
+    5. Return batch with its jobs
+
+    Example items (two ranges of the first file, one of the second):
+        [{"page_start": 1, "page_end": 10, "question_start": 1, "question_end": 30},
+         {"page_start": 11, "page_end": 20, "question_start": 31, "question_end": 60},
+         {"file_index": 1, "page_start": 1, "page_end": 8, "question_start": 1, "question_end": 25}]
+
+    Args:
+        pdf_files: Uploaded PDF files
+        items: Job configurations (JSON list)
+        combine: Build a combined document once all jobs have finished
+        db: Database session
+
+    Returns:
+        BatchResponse with batch and job details
+
+    Raises:
+        HTTPException 400: Invalid files or items
+        HTTPException 413: File too large
+    """
+    logger.info(f"Creating batch for {len(pdf_files)} PDFs")
+
+    # Validate files
+    for pdf_file in pdf_files:
+        if not pdf_file.filename.endswith('.pdf'):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Only PDF files are allowed ({pdf_file.filename})"
+            )
+
+    # Validate items
+    try:
+        batch_items = _items_adapter.validate_json(items)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid items: {e.errors(include_url=False)}"
+        )
+
+    if not batch_items:
+        raise HTTPException(status_code=400, detail="items must not be empty")
+
+    if len(batch_items) > settings.BATCH_MAX_JOBS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many jobs in batch: {len(batch_items)} (max {settings.BATCH_MAX_JOBS})"
+        )
+
+    used_files = {item.file_index for item in batch_items}
+    if max(used_files) >= len(pdf_files):
+        raise HTTPException(
+            status_code=400,
+            detail=f"file_index out of range (got {len(pdf_files)} files)"
+        )
+    if len(used_files) < len(pdf_files):
+        raise HTTPException(
+            status_code=400,
+            detail="Every uploaded file must be used by at least one item"
+        )
+
+    job_ids = [uuid.uuid4() for _ in batch_items]
+
+    try:
+        batch = Batch(
+            id=uuid.uuid4(),
+            total_jobs=len(batch_items),
+            combine=combine,
+            status="processing"
+        )
+        db.add(batch)
+        await db.flush()
+
+        # Save each file once, under the first job that uses it
+        saved = {}
+        jobs, leaders = [], []
+        for index, (job_id, item) in enumerate(zip(job_ids, batch_items)):
+            pdf_file = pdf_files[item.file_index]
+            if item.file_index in saved:
+                pdf_path = file_manager.link_upload(saved[item.file_index], job_id)
+            else:
+                pdf_path = await file_manager.save_upload(job_id, pdf_file)
+                saved[item.file_index] = pdf_path
+
+            config = item.model_dump(exclude={'file_index'})
+
+            # Cache lookup, routing and single-flight
+            job, leader = await prepare_job(
+                db, job_id, pdf_file.filename, pdf_path, config,
+                batch_id=batch.id, batch_index=index
+            )
+            db.add(job)
+            jobs.append(job)
+            leaders.append(leader)
+
+        # One transaction for the batch and all its jobs
+        await db.commit()
+
+        logger.info(f"Created batch {batch.id} with {len(jobs)} jobs")
+
+        pipelines = [
+            process_pdf_pipeline(str(job.id), job.config, job.lane)
+            for job, leader in zip(jobs, leaders)
+            if await confirm_job(db, job, leader)
+        ]
+
+        if pipelines:
+            # Queue Celery group
+            group(pipelines).apply_async()
+            logger.info(f"Queued {len(pipelines)} processing tasks for batch {batch.id}")
+
+        if any(job.status in FINISHED_STATUSES for job in jobs):
+            # Cached jobs finished already (possibly the whole batch)
+            update_batch.delay(str(batch.id))
+
+        return await _batch_response(db, batch)
+
+    except ValueError as e:
+        # File validation errors
+        logger.error(f"Validation error: {e}")
+        for job_id in job_ids:
+            await file_manager.cleanup_job(job_id)
+        raise HTTPException(status_code=400, detail=str(e))
+
+    except Exception as e:
+        # Cleanup on error
+        logger.error(f"Error creating batch: {e}", exc_info=True)
+        for job_id in job_ids:
+            await file_manager.cleanup_job(job_id)
+        raise HTTPException(status_code=500, detail="Failed to create batch")
+
+
+@router.get("/{batch_id}", response_model=BatchResponse)
+async def get_batch(
+    batch_id: UUID,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get batch status, aggregate progress and its jobs.
+
+    Args:
+        batch_id: Batch UUID
+        db: Database session
+
+    Returns:
+        BatchResponse with current batch status
+
+    Raises:
+        HTTPException 404: Batch not found
+    """
+    batch = await _get_batch_or_404(db, batch_id)
+    return await _batch_response(db, batch)
+
+
+@router.get("/{batch_id}/download")
+async def download_combined(
+    batch_id: UUID,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Download a batch's combined Word document.
+
+    Args:
+        batch_id: Batch UUID
+        db: Database session
+
+    Returns:
+        FileResponse with Word document
+
+    Raises:
+        HTTPException 404: Batch not found, not finished or no combined document
+        HTTPException 410: Batch expired (files deleted)
+    """
+    batch = await _get_batch_or_404(db, batch_id)
+
+    if batch.is_processing:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Batch not finished yet (status: {batch.status})"
+        )
+
+    if not batch.output_path or not file_manager.file_exists(batch.output_path):
+        if batch.is_expired:
+            raise HTTPException(
+                status_code=410,
+                detail="Batch expired - files have been deleted after 24 hours"
+            )
+        raise HTTPException(
+            status_code=404,
+            detail="Combined document not available"
+        )
+
+    return FileResponse(
+        path=batch.output_path,
+        media_type='application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+        filename=batch.output_filename,
+        headers={
+            "Content-Disposition": f'attachment; filename="{batch.output_filename}"'
+        }
+    )
+
+
+async def _get_batch_or_404(db: AsyncSession, batch_id: UUID) -> Batch:
+    """Load batch or raise 404."""
+    result = await db.execute(
+        select(Batch).where(Batch.id == batch_id)
+    )
+    batch = result.scalar_one_or_none()
+
+    if not batch:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Batch {batch_id} not found"
+        )
+
+    return batch
+
+
+async def _batch_response(db: AsyncSession, batch: Batch) -> BatchResponse:
+    """Build BatchResponse with aggregate progress and jobs in submission order."""
+    stats = batch_manager.summarize(batch, (await db.execute(batch_manager.stats_query(batch.id))).all())
+
+    result = await db.execute(
+        select(Job).where(Job.batch_id == batch.id).order_by(Job.batch_index)
+    )
+    jobs = result.scalars().all()
+
+    response = BatchResponse.model_validate(batch)
+    response.progress = stats['progress'] if batch.is_processing else 100
+    response.counts = stats['counts']
+    response.jobs = [JobResponse.model_validate(job) for job in jobs]
+    return response
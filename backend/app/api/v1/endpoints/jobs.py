@@ -3,22 +3,39 @@ Jobs API Endpoints.
 
 Handles job creation, status retrieval, and file downloads.
 """
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Header, Query, Response
+from fastapi.responses import FileResponse, StreamingResponse
+from redis.exceptions import LockError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
+from sqlalchemy import select, update, desc, func, tuple_
 from datetime import datetime, timedelta
 from typing import List, Optional
 from uuid import UUID
+import os
+import time
+import base64
 import uuid
+import asyncio
 import logging
 
 from app.api.deps import get_db
 from app.models.job import Job
-from app.schemas.job import JobResponse, JobListResponse
+from app.schemas.job import JobResponse, JobListResponse, JobStatusRequest, JobStatusResponse
 from app.schemas.config import ProcessingConfig
+from app.schemas.question import QuestionUpdate
+from app.services.document_generator import DocumentGenerator, QuestionNotFound
+from app.services.question_parser import ParsedQuestion
 from app.services.file_manager import file_manager
-from app.tasks.processing import process_pdf_task
+from app.services.job_router import job_router
+from app.services.job_submission import prepare_job, confirm_job
+from app.services.single_flight import single_flight
+from app.services.job_control import request_cancel
+from app.services.event_bus import event_relay, publish_job_event
+from app.core.redis import get_async_redis
+from app.services.event_stream import JobEventStream
+from app.utils.ooxml import COMPRESSION_MODES
+from app.tasks.processing import process_pdf_pipeline
+from app.tasks.batches import update_batch
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -36,6 +53,8 @@ async def create_job(
     chapter_name: Optional[str] = Form(None, max_length=200, description="Chapter name"),
     subject: Optional[str] = Form(None, max_length=100, description="Subject"),
     year: Optional[int] = Form(None, ge=1900, le=2100, description="Year"),
+    shard_size: Optional[int] = Form(None, ge=1, description="Split output into documents of N questions"),
+    compression: Optional[str] = Form(None, description="Package compression: store, fast, default, max"),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -44,9 +63,11 @@ async def create_job(
     Steps:
     1. Validate PDF file
     2. Save to storage
-    3. Create job record in database
-    4. Queue Celery task for processing
-    5. Return job ID and initial status
+    3. Look up result cache (PDF hash + config + code versions)
+    4. Join an identical pending/running job as its follower (single-flight)
+    5. Create job record in database
+    6. Queue Celery task for processing (skipped on cache hit or for followers)
+    7. Return job ID and initial status
 
     Args:
         pdf_file: Uploaded PDF file
@@ -57,6 +78,8 @@ async def create_job(
         chapter_name: Optional chapter/section name
         subject: Optional subject name
         year: Optional examination year
+        shard_size: Optional number of questions per output document
+        compression: Optional package compression mode (DOCX_COMPRESSION if not set)
         db: Database session
 
     Returns:
@@ -89,6 +112,13 @@ async def create_job(
             detail=f"question_end ({question_end}) must be >= question_start ({question_start})"
         )
 
+    # Validate compression mode
+    if compression is not None and compression not in COMPRESSION_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid compression. Must be one of: {', '.join(COMPRESSION_MODES)}"
+        )
+
     try:
         # Generate job ID
         job_id = uuid.uuid4()
@@ -106,18 +136,13 @@ async def create_job(
             "question_end": question_end,
             "chapter_name": chapter_name,
             "subject": subject,
-            "year": year
+            "year": year,
+            "shard_size": shard_size,
+            "compression": compression
         }
 
-        # Create job record
-        job = Job(
-            id=job_id,
-            pdf_filename=pdf_file.filename,
-            pdf_path=pdf_path,
-            config=config,
-            status="pending",
-            progress=0
-        )
+        # Cache lookup, routing and single-flight
+        job, leader = await prepare_job(db, job_id, pdf_file.filename, pdf_path, config)
 
         db.add(job)
         await db.commit()
@@ -125,11 +150,12 @@ async def create_job(
 
         logger.info(f"Created job record: {job_id}")
 
-        # Queue Celery task
-        process_pdf_task.delay(str(job_id))
-        logger.info(f"Queued processing task for job: {job_id}")
+        if await confirm_job(db, job, leader):
+            # Queue Celery task
+            process_pdf_pipeline(str(job_id), config, job.lane).apply_async()
+            logger.info(f"Queued processing task for job: {job_id} ({job.lane} lane, ~{job.estimated_cost}s)")
 
-        return JobResponse.model_validate(job)
+        return await _job_response(db, job)
 
     except ValueError as e:
         # File validation errors
@@ -144,24 +170,108 @@ async def create_job(
         raise HTTPException(status_code=500, detail="Failed to create job")
 
 
+@router.post("/status", response_model=JobStatusResponse)
+async def bulk_status(
+    request: JobStatusRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get the status of many jobs in one request (dashboards).
+
+    One primary-key query over the compact columns. Job.version is bumped
+    in the same commit as every status or progress change, so a refresh
+    that sends back the versions it has in `since` gets only the jobs that
+    changed.
+
+    Example:
+        {"job_ids": ["550e8400-...", "7c9e6679-..."], "since": {"550e8400-...": 12}}
+
+    Args:
+        request: Job IDs and known versions
+        db: Database session
+
+    Returns:
+        JobStatusResponse with (id, status, progress, current_step, version)
+        tuples of changed jobs, and the IDs that don't exist
+
+    Raises:
+        HTTPException 400: Too many job IDs
+    """
+    job_ids = list(dict.fromkeys(request.job_ids))
+
+    if len(job_ids) > settings.BULK_STATUS_MAX_JOBS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many job IDs: {len(job_ids)} (max {settings.BULK_STATUS_MAX_JOBS})"
+        )
+
+    result = await db.execute(
+        select(Job.id, Job.status, Job.progress, Job.current_step, Job.version)
+        .where(Job.id.in_(job_ids))
+    )
+    rows = result.all()
+
+    found = {row.id for row in rows}
+    jobs = [
+        (row.id, row.status, row.progress or 0, row.current_step, row.version)
+        for row in rows
+        if row.version > request.since.get(row.id, 0)
+    ]
+
+    return JobStatusResponse(
+        jobs=jobs,
+        missing=[job_id for job_id in job_ids if job_id not in found]
+    )
+
+
 @router.get("/{job_id}", response_model=JobResponse)
 async def get_job(
     job_id: UUID,
+    response: Response,
+    wait: Optional[float] = Query(
+        None, ge=0, le=settings.LONG_POLL_MAX_SECONDS,
+        description="Long-poll: with If-None-Match, hold the request up to this many seconds until the job changes"
+    ),
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get job status and details.
 
+    Conditional: the ETag is the job's version (bumped on every change;
+    plus queue position while pending). A matching If-None-Match gets
+    304 Not Modified from a version-only query, without loading or
+    serializing the job. With ?wait=N a matching request is held until
+    the job changes (woken by its relayed events, rechecked every
+    LONG_POLL_CHECK_SECONDS) or N seconds pass.
+
     Args:
         job_id: Job UUID
+        response: Response (ETag header)
+        wait: Long-poll timeout in seconds
+        if_none_match: If-None-Match header
         db: Database session
 
     Returns:
-        JobResponse with current job status
+        JobResponse with current job status, or 304 if unchanged
 
     Raises:
         HTTPException 404: Job not found
     """
+    etag = await _job_etag(db, job_id)
+
+    if etag and wait and _etag_matches(if_none_match, etag):
+        etag = await _wait_for_change(db, job_id, etag, wait)
+
+    if not etag:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Job {job_id} not found"
+        )
+
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={'ETag': etag, 'Cache-Control': 'no-cache'})
+
     result = await db.execute(
         select(Job).where(Job.id == job_id)
     )
@@ -173,27 +283,95 @@ async def get_job(
             detail=f"Job {job_id} not found"
         )
 
-    return JobResponse.model_validate(job)
+    job_response = await _job_response(db, job)
+    response.headers['ETag'] = _format_etag(job.version, job_response.queue_position)
+    response.headers['Cache-Control'] = 'no-cache'
+    return job_response
+
+
+@router.get("/{job_id}/events")
+async def job_events(
+    job_id: UUID,
+    last_event_id: Optional[str] = Header(None, description="ID of the last event received (set by EventSource on reconnect)"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Stream job events as Server-Sent Events.
+
+    Lightweight alternative to Socket.IO (one plain HTTP response, works
+    through proxies that break WebSocket upgrades). Sends the job's current
+    state, then its progress, complete, error and cancelled events, with
+    heartbeats while idle; the stream ends after the terminal event.
+    Reconnecting clients resume from Last-Event-ID.
+
+    Example:
+        const events = new EventSource(`/api/v1/jobs/${jobId}/events`)
+        events.addEventListener('progress', e => show(JSON.parse(e.data)))
+        events.addEventListener('complete', () => events.close())
+
+    Args:
+        job_id: Job UUID
+        last_event_id: Last-Event-ID header
+        db: Database session
+
+    Returns:
+        StreamingResponse (text/event-stream), or 204 if the client already
+        has the job's terminal event
+
+    Raises:
+        HTTPException 404: Job not found
+    """
+    result = await db.execute(
+        select(Job).where(Job.id == job_id)
+    )
+    job = result.scalar_one_or_none()
+
+    if not job:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Job {job_id} not found"
+        )
+
+    stream = JobEventStream(job, last_event_id)
+
+    if await stream.is_finished():
+        # Stops EventSource from reconnecting
+        return Response(status_code=204)
+
+    return StreamingResponse(
+        stream.events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # Disable proxy buffering (nginx)
+        }
+    )
 
 
 @router.get("/", response_model=JobListResponse)
 async def list_jobs(
     limit: int = 20,
-    offset: int = 0,
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    offset: int = Query(0, deprecated=True, description="Use cursor instead"),
     status: Optional[str] = None,
     db: AsyncSession = Depends(get_db)
 ):
     """
     List recent jobs (last 24 hours).
 
+    Keyset pagination, newest first: pass the previous page's next_cursor
+    to get the next page (stable while jobs are being created, and each
+    page is an index range scan instead of skipping offset rows).
+
     Args:
         limit: Maximum number of jobs to return (default 20, max 100)
-        offset: Number of jobs to skip (for pagination)
-        status: Optional status filter (pending, parsing, generating, completed, failed)
+        cursor: Opaque position from the previous page's next_cursor
+        offset: Number of jobs to skip (deprecated, ignored with cursor)
+        status: Optional status filter (pending, parsing, generating, completed, failed, cancelled)
         db: Database session
 
     Returns:
-        JobListResponse with list of jobs
+        JobListResponse with list of jobs, total and next_cursor (None on the last page)
 
     Raises:
         HTTPException 400: Invalid parameters
@@ -208,39 +386,41 @@ async def list_jobs(
     cutoff = datetime.utcnow() - timedelta(hours=24)
 
     # Build query
-    query = select(Job).where(Job.created_at >= cutoff)
+    filters = [Job.created_at >= cutoff]
 
     # Filter by status if provided
     if status:
-        valid_statuses = ['pending', 'parsing', 'generating', 'completed', 'failed']
+        valid_statuses = ['pending', 'parsing', 'generating', 'completed', 'failed', 'cancelled']
         if status not in valid_statuses:
             raise HTTPException(
                 status_code=400,
                 detail=f"Invalid status. Must be one of: {', '.join(valid_statuses)}"
             )
-        query = query.where(Job.status == status)
+        filters.append(Job.status == status)
 
-    # Order by creation time (newest first)
-    query = query.order_by(desc(Job.created_at))
+    # Order by creation time (newest first), ID breaking ties
+    query = select(Job).where(*filters).order_by(desc(Job.created_at), desc(Job.id))
 
-    # Apply pagination
-    query = query.limit(limit).offset(offset)
+    # Apply pagination (one extra row tells whether there is a next page)
+    if cursor:
+        query = query.where(tuple_(Job.created_at, Job.id) < _decode_cursor(cursor))
+    elif offset:
+        query = query.offset(offset)
+    query = query.limit(limit + 1)
 
     # Execute query
     result = await db.execute(query)
     jobs = result.scalars().all()
 
-    # Get total count
-    count_query = select(Job).where(Job.created_at >= cutoff)
-    if status:
-        count_query = count_query.where(Job.status == status)
-
-    total_result = await db.execute(count_query)
-    total = len(total_result.scalars().all())
+    next_cursor = None
+    if len(jobs) > limit:
+        jobs = jobs[:limit]
+        next_cursor = _encode_cursor(jobs[-1])
 
     return JobListResponse(
         jobs=[JobResponse.model_validate(job) for job in jobs],
-        total=total
+        total=await _count_jobs(db, filters, status),
+        next_cursor=next_cursor
     )
 
 
@@ -252,12 +432,15 @@ async def download_result(
     """
     Download generated Word document.
 
+    Sharded jobs are downloaded as a ZIP bundle of all parts, streamed
+    as it is built.
+
     Args:
         job_id: Job UUID
         db: Database session
 
     Returns:
-        FileResponse with Word document
+        FileResponse with Word document, or StreamingResponse with ZIP bundle
 
     Raises:
         HTTPException 404: Job not found or not completed
@@ -283,7 +466,8 @@ async def download_result(
         )
 
     # Check if output file exists
-    if not job.output_path or not file_manager.file_exists(job.output_path):
+    output_files = _get_output_files(job)
+    if not output_files or not all(file_manager.file_exists(path) for path in output_files):
         # Check if expired
         if job.is_expired:
             raise HTTPException(
@@ -295,6 +479,16 @@ async def download_result(
             detail="Output file not found"
         )
 
+    # Return ZIP bundle of all parts
+    if job.output_parts:
+        return StreamingResponse(
+            file_manager.iter_zip_bundle(output_files),
+            media_type='application/zip',
+            headers={
+                "Content-Disposition": f'attachment; filename="{job.output_filename}"'
+            }
+        )
+
     # Return file
     return FileResponse(
         path=job.output_path,
@@ -306,6 +500,197 @@ async def download_result(
     )
 
 
+@router.put("/{job_id}/questions/{question_number}", response_model=JobResponse)
+async def update_question(
+    job_id: UUID,
+    question_number: int,
+    question: QuestionUpdate,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Patch a single question in the generated Word document.
+
+    Only the question's table is replaced; the rest of the document is
+    copied unchanged, so this is much faster than regenerating. Edits of
+    the same job are serialized (Redis lock, shared by all API replicas)
+    so concurrent edits don't overwrite each other, and each one bumps the
+    job's version (ETag, /jobs/status `since`).
+
+    Args:
+        job_id: Job UUID
+        question_number: Question number to replace
+        question: Corrected question content
+        db: Database session
+
+    Returns:
+        JobResponse with job details
+
+    Raises:
+        HTTPException 404: Job, output file or question not found
+        HTTPException 409: Job not completed yet, or another edit holds the lock too long
+        HTTPException 410: Job expired (files deleted)
+        HTTPException 500: Patching failed
+    """
+    # Get job
+    result = await db.execute(
+        select(Job).where(Job.id == job_id)
+    )
+    job = result.scalar_one_or_none()
+
+    if not job:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Job {job_id} not found"
+        )
+
+    if job.status != 'completed':
+        raise HTTPException(
+            status_code=409,
+            detail=f"Job not completed yet (status: {job.status})"
+        )
+
+    output_files = _get_output_files(job)
+    if not output_files or not all(file_manager.file_exists(path) for path in output_files):
+        if job.is_expired:
+            raise HTTPException(
+                status_code=410,
+                detail="Job expired - files have been deleted after 24 hours"
+            )
+        raise HTTPException(
+            status_code=404,
+            detail="Output file not found"
+        )
+
+    parsed = ParsedQuestion(
+        number=question_number,
+        question_text=question.question_text,
+        options=question.options,
+        correct_option_idx=question.correct_option_idx,
+        solution_text=question.solution_text,
+        has_diagram=question.has_diagram,
+        confidence=1.0  # Reviewed by a human
+    )
+
+    # Sharded outputs: the question is in exactly one of the parts.
+    # Patching rewrites the zip package, so keep it off the event loop.
+    doc_gen = DocumentGenerator(compression=job.config.get('compression'))
+    lock = get_async_redis().lock(
+        f"job:{job_id}:patch",
+        timeout=settings.QUESTION_PATCH_LOCK_SECONDS * 4,
+        blocking_timeout=settings.QUESTION_PATCH_LOCK_SECONDS
+    )
+    if not await lock.acquire():
+        raise HTTPException(
+            status_code=409,
+            detail="Another update of this job is in progress, try again"
+        )
+
+    try:
+        for path in output_files:
+            try:
+                await asyncio.to_thread(doc_gen.patch_question, path, parsed)
+                break
+            except QuestionNotFound:
+                continue
+            except Exception as e:
+                logger.error(f"Error patching question {question_number} of job {job_id}: {e}", exc_info=True)
+                raise HTTPException(status_code=500, detail="Failed to update question")
+        else:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Question {question_number} not found in document"
+            )
+
+        # Clients comparing versions (ETag, since) see the edited document
+        await db.execute(
+            update(Job).where(Job.id == job.id).values(version=Job.version + 1)
+        )
+        await db.commit()
+        await db.refresh(job)
+
+    finally:
+        try:
+            await lock.release()
+        except LockError:
+            logger.warning(f"Patch lock of job {job_id} expired before release")
+
+    logger.info(f"Updated question {question_number} for job: {job_id}")
+
+    return JobResponse.model_validate(job)
+
+
+@router.post("/{job_id}/cancel", response_model=JobResponse, status_code=202)
+async def cancel_job(
+    job_id: UUID,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Cancel a pending or running job.
+
+    Sets the job's cancellation flag; the worker stops at its next check
+    (within CANCEL_CHECK_INTERVAL_MS of reaching a page, question block or
+    question), removes partial files and marks the job cancelled. Pending
+    jobs, and followers of an identical job (which run nothing), are
+    marked cancelled immediately.
+
+    Args:
+        job_id: Job UUID
+        db: Database session
+
+    Returns:
+        JobResponse with job details (202 Accepted)
+
+    Raises:
+        HTTPException 404: Job not found
+        HTTPException 409: Job already finished
+    """
+    # Get job
+    result = await db.execute(
+        select(Job).where(Job.id == job_id)
+    )
+    job = result.scalar_one_or_none()
+
+    if not job:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Job {job_id} not found"
+        )
+
+    if not job.is_processing:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Job already finished (status: {job.status})"
+        )
+
+    await request_cancel(job_id)
+
+    if job.leader_id:
+        # The leader keeps running for its own clients and other followers
+        await single_flight.remove_follower(job.leader_id, job_id)
+
+    if job.status == 'pending' or job.leader_id:
+        # Not picked up yet: the first stage will skip it
+        job.status = 'cancelled'
+        job.current_step = "Cancelled"
+        job.completed_at = datetime.utcnow()
+        await db.commit()
+        await db.refresh(job)
+
+        cancelled = {
+            'progress': job.progress,
+            'timestamp': datetime.utcnow().isoformat()
+        }
+        # Relayed by every API process (subscribers may be connected to any)
+        await publish_job_event(str(job_id), 'cancelled', cancelled)
+
+        if job.batch_id:
+            update_batch.delay(str(job.batch_id))
+
+    logger.info(f"Cancellation requested for job: {job_id} (status: {job.status})")
+
+    return JobResponse.model_validate(job)
+
+
 @router.delete("/{job_id}", status_code=204)
 async def delete_job(
     job_id: UUID,
@@ -352,3 +737,158 @@ async def delete_job(
     await db.commit()
 
     logger.info(f"Deleted job: {job_id}")
+
+
+def _get_output_files(job: Job) -> List[str]:
+    """
+    Get paths of a job's generated documents.
+
+    Args:
+        job: Job model
+
+    Returns:
+        One path for single-document output, one per part for sharded output
+    """
+    if not job.output_path:
+        return []
+    if job.output_parts:
+        return [os.path.join(job.output_path, name) for name in job.output_parts]
+    return [job.output_path]
+
+
+async def _job_response(db: AsyncSession, job: Job) -> JobResponse:
+    """Build JobResponse including queue estimates for pending jobs."""
+    response = JobResponse.model_validate(job)
+    response.queue_position, response.estimated_wait_seconds = await job_router.queue_stats(db, job)
+    return response
+
+
+def _format_etag(version: int, queue_position: Optional[int] = None) -> str:
+    """ETag of a job version (and queue position while pending)."""
+    if queue_position is None:
+        return f'"{version}"'
+    return f'"{version}.{queue_position}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header (list of tags, possibly weak, or *) against an ETag."""
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+    return '*' in tags or etag in tags
+
+
+async def _job_etag(db: AsyncSession, job_id: UUID) -> Optional[str]:
+    """Current ETag of a job without loading the row (None if not found)."""
+    result = await db.execute(
+        select(Job.version, Job.status, Job.lane, Job.created_at).where(Job.id == job_id)
+    )
+    row = result.one_or_none()
+    if not row:
+        return None
+
+    # queue_stats only reads status, lane and created_at
+    queue_position, _ = await job_router.queue_stats(db, row)
+    return _format_etag(row.version, queue_position)
+
+
+async def _wait_for_change(db: AsyncSession, job_id: UUID, etag: str, timeout: float) -> Optional[str]:
+    """
+    Wait until a job's ETag differs from etag (long-poll).
+
+    Args:
+        db: Database session (its connection is released while waiting)
+        job_id: Job UUID
+        etag: ETag the client has
+        timeout: Max seconds to wait
+
+    Returns:
+        Current ETag (etag on timeout, None if the job was deleted)
+    """
+    # Any relayed event of the job wakes the wait for a recheck
+    queue = event_relay.listen(str(job_id))
+    deadline = time.monotonic() + timeout
+
+    try:
+        while True:
+            # End the read transaction: don't hold a pooled connection while idle
+            await db.rollback()
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return etag
+
+            try:
+                await asyncio.wait_for(queue.get(), min(remaining, settings.LONG_POLL_CHECK_SECONDS))
+            except asyncio.TimeoutError:
+                pass
+
+            current = await _job_etag(db, job_id)
+            if current != etag:
+                return current
+    finally:
+        event_relay.unlisten(str(job_id), queue)
+
+
+def _encode_cursor(job: Job) -> str:
+    """Opaque list_jobs cursor positioned after a job."""
+    raw = f"{job.created_at.isoformat()}|{job.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    """
+    Decode a list_jobs cursor.
+
+    Returns:
+        (created_at, id) of the last job of the previous page
+
+    Raises:
+        HTTPException 400: Malformed cursor
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        created_at, job_id = raw.split('|')
+        return datetime.fromisoformat(created_at), UUID(job_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def _count_jobs(db: AsyncSession, filters: list, status: Optional[str]) -> int:
+    """
+    Count jobs matching list_jobs filters (SELECT count(*)).
+
+    Cached in Redis for JOB_COUNT_CACHE_SECONDS per status filter, so
+    paging through a large list doesn't recount on every page.
+
+    Args:
+        db: Database session
+        filters: list_jobs WHERE clauses
+        status: Status filter (cache key)
+
+    Returns:
+        Number of matching jobs
+    """
+    key = f"jobs:count:{status or 'all'}"
+    ttl = settings.JOB_COUNT_CACHE_SECONDS
+
+    if ttl:
+        try:
+            cached = await get_async_redis().get(key)
+            if cached is not None:
+                return int(cached)
+        except Exception as e:
+            logger.warning(f"Error reading cached job count: {e}")
+
+    result = await db.execute(
+        select(func.count()).select_from(Job).where(*filters)
+    )
+    total = result.scalar_one()
+
+    if ttl:
+        try:
+            await get_async_redis().set(key, total, ex=ttl)
+        except Exception as e:
+            logger.warning(f"Error caching job count: {e}")
+
+    return total
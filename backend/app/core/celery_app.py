@@ -5,7 +5,10 @@ Background task processing for PDF parsing and document generation.
 """
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_init, worker_process_init, worker_process_shutdown
 from app.core.config import settings
+from app.core.event_loop import start_worker_loop, stop_worker_loop
+from app.core.warmup import warm_up
 
 # Create Celery app
 celery_app = Celery(
@@ -14,6 +17,7 @@ celery_app = Celery(
     backend=settings.CELERY_RESULT_BACKEND,
     include=[
         "app.tasks.processing",
+        "app.tasks.batches",
         "app.tasks.cleanup"
     ]
 )
@@ -31,6 +35,8 @@ celery_app.conf.update(
     task_acks_late=True,
     task_reject_on_worker_lost=True,
     worker_prefetch_multiplier=1,
+    # Recycle children whose RSS stayed high after a task (KB; None disables)
+    worker_max_memory_per_child=settings.WORKER_MAX_MEMORY_PER_CHILD_MB * 1024 or None,
 
     # Result backend
     result_expires=86400,  # 24 hours
@@ -46,14 +52,48 @@ celery_app.conf.beat_schedule = {
         'task': 'app.tasks.cleanup.cleanup_expired_jobs',
         'schedule': crontab(minute=0),  # Every hour at minute 0
     },
+    # Enforce result cache retention/size every hour
+    'cleanup-result-cache': {
+        'task': 'app.tasks.cleanup.cleanup_result_cache',
+        'schedule': crontab(minute=30),  # Every hour at minute 30
+    },
 }
 
-# Task routes (optional - for multiple queues)
+# Task routes: one queue per pipeline stage, so each pool can be sized on its own
 celery_app.conf.task_routes = {
+    'app.tasks.processing.extract_stage': {'queue': 'processing.extract'},
+    'app.tasks.processing.extract_pages': {'queue': 'processing.extract'},
+    'app.tasks.processing.parse_stage': {'queue': 'processing.parse'},
+    'app.tasks.processing.generate_stage': {'queue': 'processing.generate'},
     'app.tasks.processing.*': {'queue': 'processing'},
+    'app.tasks.batches.*': {'queue': 'processing'},
     'app.tasks.cleanup.*': {'queue': 'cleanup'},
 }
 
 
+# Worker startup: warm up once in the parent, children inherit it via fork
+@worker_init.connect
+def init_worker(**kwargs):
+    """Preload heavy modules/caches and freeze the GC heap before the pool forks."""
+    if settings.WORKER_WARMUP:
+        warm_up(freeze=True)
+
+
+# Worker process lifecycle: one persistent event loop per worker process
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    """Start the worker's event loop (runs in each prefork child)."""
+    if settings.WORKER_WARMUP:
+        # No-op when inherited from the parent (prefork)
+        warm_up()
+    start_worker_loop()
+
+
+@worker_process_shutdown.connect
+def shutdown_worker_process(**kwargs):
+    """Stop the worker's event loop."""
+    stop_worker_loop()
+
+
 if __name__ == "__main__":
     celery_app.start()
@@ -22,6 +22,8 @@ class Settings(BaseSettings):
 
     # Redis
     REDIS_URL: str
+    EVENTS_CHANNEL: str = "jobs:events"  # Worker -> API job events (pub/sub)
+    EVENTS_FLUSH_INTERVAL_MS: int = 250  # Worker-side event batching window
 
     # Celery
     CELERY_BROKER_URL: str
@@ -32,6 +34,84 @@ class Settings(BaseSettings):
     MAX_UPLOAD_SIZE: int = 52428800  # 50MB
     FILE_RETENTION_HOURS: int = 24
 
+    # Rendered question table cache
+    FRAGMENT_CACHE_ENABLED: bool = True
+    FRAGMENT_CACHE_MAX_MB: int = 256
+
+    # Whole-output result cache (independent of job retention)
+    RESULT_CACHE_ENABLED: bool = True
+    RESULT_CACHE_RETENTION_HOURS: int = 168  # 7 days
+    RESULT_CACHE_MAX_MB: int = 2048
+
+    # Single-flight: identical concurrent jobs follow one running pipeline
+    SINGLE_FLIGHT_ENABLED: bool = True
+    SINGLE_FLIGHT_TTL_SECONDS: int = 3600  # Max lifetime of a leader claim
+
+    # Size-aware routing (estimated cost in seconds)
+    COST_BASE_SECONDS: float = 2.0
+    COST_PER_PAGE_SECONDS: float = 0.3
+    COST_PER_QUESTION_SECONDS: float = 0.05
+    FAST_LANE_MAX_COST: float = 15.0  # Jobs up to this cost use processing.fast
+    FAST_LANE_CONCURRENCY: int = 2  # Worker processes on processing.fast
+    BULK_LANE_CONCURRENCY: int = 2  # Worker processes on the per-stage queues
+
+    # Batch submissions
+    BATCH_MAX_JOBS: int = 50  # Jobs (files x ranges) per batch
+
+    # Bulk status (POST /jobs/status)
+    BULK_STATUS_MAX_JOBS: int = 500
+
+    # Distributed PDF extraction (chord of page-range subtasks)
+    EXTRACT_FANOUT_MIN_PAGES: int = 60  # Fan out ranges at least this long (0 disables)
+    EXTRACT_CHUNK_PAGES: int = 20  # Pages per extraction subtask
+    EXTRACT_MAX_RETRIES: int = 3  # Retries per page range
+
+    # Worker startup
+    WORKER_WARMUP: bool = True  # Preload modules/caches and gc.freeze() before forking
+
+    # Document generation
+    GENERATION_WORKERS: int = 2  # Concurrent shards per job (threads)
+    DOCX_COMPRESSION: str = "default"  # store, fast, default, max (overridable per job)
+    QUESTION_PATCH_LOCK_SECONDS: float = 30.0  # Max wait for another edit of the same job's document
+
+    # Per-job budgets, scaled by page and question counts (over budget: job fails)
+    JOB_TIME_BASE_SECONDS: float = 120.0
+    JOB_TIME_PER_PAGE_SECONDS: float = 3.0
+    JOB_TIME_PER_QUESTION_SECONDS: float = 1.0
+    JOB_TIME_LIMIT_GRACE_SECONDS: int = 60  # Hard kill this long after the soft limit
+    JOB_MEMORY_BASE_MB: float = 512.0  # Worker RSS, including its baseline
+    JOB_MEMORY_PER_PAGE_MB: float = 2.0
+    JOB_MEMORY_PER_QUESTION_MB: float = 0.5
+    JOB_MEMORY_MAX_MB: float = 2048.0
+    WORKER_MAX_MEMORY_PER_CHILD_MB: int = 1024  # Replace children above this RSS after a task (0 disables)
+
+    # Cancellation (max delay between a cancel request and the worker noticing)
+    CANCEL_CHECK_INTERVAL_MS: int = 250
+
+    # WebSocket progress emits (per room; 0 emits every update immediately)
+    WS_FLUSH_HZ: float = 4.0
+    JOB_STATE_TTL_SECONDS: int = 3600  # Latest job state kept in Redis for subscribe replay
+    WS_IDLE_TIMEOUT_SECONDS: int = 600  # Disconnect sockets with no events or emits once their jobs finished (0 = never)
+
+    # Server-Sent Events (GET /jobs/{id}/events)
+    SSE_HEARTBEAT_SECONDS: float = 15.0  # Comment line sent on idle streams
+    SSE_RETRY_MS: int = 3000  # Client reconnect delay
+
+    # GET /jobs/ total count cache (0 counts on every request)
+    JOB_COUNT_CACHE_SECONDS: int = 5
+
+    # Long-poll on GET /jobs/{id}?wait=N (max wait, recheck interval without events)
+    LONG_POLL_MAX_SECONDS: float = 60.0
+    LONG_POLL_CHECK_SECONDS: float = 2.0
+
+    # Socket.IO message queue shared by API processes/replicas (empty = single process)
+    SOCKETIO_REDIS_URL: str = ""
+    SOCKETIO_CHANNEL: str = "socketio"
+
+    # Progress reporting (throttle for DB writes and emits)
+    PROGRESS_MIN_INTERVAL_MS: int = 500
+    PROGRESS_MIN_DELTA: int = 5  # Percentage points
+
     # Security
     SECRET_KEY: str
     CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:5173"]
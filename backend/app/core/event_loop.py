@@ -0,0 +1,126 @@
+"""
+Worker Event Loop.
+
+One long-lived asyncio event loop per Celery worker process, running in a
+background thread. Synchronous task code submits coroutines to it instead
+of creating and closing a new event loop around every async call.
+
+The loop is for async I/O only. CPU-bound work (extraction, parsing,
+document generation) runs in the task thread through the services' sync
+entry points: Celery's soft time limit is raised in the task thread, so
+work on the shared loop would outlive it and hold up every later call.
+"""
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Coroutine, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_thread: Optional[threading.Thread] = None
+_lock = threading.Lock()
+
+
+def start_worker_loop() -> asyncio.AbstractEventLoop:
+    """
+    Start the process-wide event loop (idempotent).
+
+    Called from the worker_process_init signal, so every prefork child gets
+    its own loop (threads do not survive fork). Also started lazily on first
+    use, e.g. with the solo pool or eager tasks.
+
+    Returns:
+        The running event loop
+    """
+    global _loop, _thread
+
+    with _lock:
+        if _loop is not None and _thread is not None and _thread.is_alive():
+            return _loop
+
+        _loop = asyncio.new_event_loop()
+        _thread = threading.Thread(
+            target=_loop.run_forever,
+            name="worker-event-loop",
+            daemon=True
+        )
+        _thread.start()
+
+        logger.info("Started worker event loop")
+        return _loop
+
+
+def stop_worker_loop(timeout: float = 5.0):
+    """
+    Stop the process-wide event loop.
+
+    Pending coroutines get up to `timeout` seconds to finish.
+
+    Args:
+        timeout: Seconds to wait for pending work
+    """
+    global _loop, _thread
+
+    with _lock:
+        if _loop is None:
+            return
+
+        loop, thread = _loop, _thread
+        _loop, _thread = None, None
+
+    async def drain():
+        pending = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        if pending:
+            await asyncio.wait(pending, timeout=timeout)
+
+    try:
+        asyncio.run_coroutine_threadsafe(drain(), loop).result(timeout + 1)
+    except Exception as e:
+        logger.warning(f"Error draining worker event loop: {e}")
+
+    loop.call_soon_threadsafe(loop.stop)
+    if thread is not None:
+        thread.join(timeout)
+    loop.close()
+
+    logger.info("Stopped worker event loop")
+
+
+def submit(coro: Coroutine) -> Future:
+    """
+    Schedule a coroutine on the worker loop without waiting for it.
+
+    Safe to call from any thread, including the loop thread itself.
+    Coroutines run in submission order.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        concurrent.futures.Future with the coroutine's result
+    """
+    return asyncio.run_coroutine_threadsafe(coro, start_worker_loop())
+
+
+def run_sync(coro: Coroutine, timeout: Optional[float] = None) -> Any:
+    """
+    Run a coroutine on the worker loop and wait for its result.
+
+    Args:
+        coro: Coroutine to run
+        timeout: Optional timeout in seconds
+
+    Returns:
+        The coroutine's result
+
+    Raises:
+        RuntimeError: If called from the loop thread (would deadlock)
+        Exception: Whatever the coroutine raises
+    """
+    if _thread is not None and threading.current_thread() is _thread:
+        coro.close()
+        raise RuntimeError("run_sync() called from the worker event loop thread; use submit()")
+
+    return submit(coro).result(timeout)
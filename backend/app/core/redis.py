@@ -0,0 +1,55 @@
+"""
+Redis Clients.
+
+Lazily created, process-wide Redis clients for REDIS_URL.
+The sync client is used by Celery workers, the asyncio client by the API.
+"""
+from typing import Optional
+import redis
+import redis.asyncio as aioredis
+from app.core.config import settings
+
+_sync_client: Optional[redis.Redis] = None
+_async_client: Optional[aioredis.Redis] = None
+
+
+def get_redis() -> redis.Redis:
+    """
+    Get the shared synchronous Redis client.
+
+    Returns:
+        redis.Redis with a persistent connection pool
+    """
+    global _sync_client
+    if _sync_client is None:
+        _sync_client = redis.Redis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            health_check_interval=30
+        )
+    return _sync_client
+
+
+def get_async_redis() -> aioredis.Redis:
+    """
+    Get the shared asyncio Redis client.
+
+    Returns:
+        redis.asyncio.Redis with a persistent connection pool
+    """
+    global _async_client
+    if _async_client is None:
+        _async_client = aioredis.Redis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            health_check_interval=30
+        )
+    return _async_client
+
+
+async def close_async_redis():
+    """Close the shared asyncio Redis client."""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
@@ -6,6 +6,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from app.core.config import settings
+from app.core.redis import close_async_redis
+from app.services.event_bus import event_relay
+from app.services.websocket_manager import ws_manager
 import socketio
 import logging
 
@@ -87,6 +90,10 @@ async def startup_event():
     logger.info(f"Environment: {settings.ENVIRONMENT}")
     logger.info(f"Debug mode: {settings.DEBUG}")
 
+    # Relay worker events (Redis pub/sub) to Socket.IO clients
+    await ws_manager.start()
+    await event_relay.start()
+
 
 # Application shutdown
 @app.on_event("shutdown")
@@ -94,6 +101,10 @@ async def shutdown_event():
     """Cleanup resources on shutdown."""
     logger.info(f"Shutting down {settings.PROJECT_NAME}")
 
+    await event_relay.stop()
+    await ws_manager.stop()
+    await close_async_redis()
+
 
 # Include API routers
 from app.api.v1.api import api_router
@@ -0,0 +1,5 @@
+"""
+Database models.
+"""
+from app.models.batch import Batch  # noqa: F401
+from app.models.job import Job  # noqa: F401
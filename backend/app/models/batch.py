@@ -0,0 +1,64 @@
+"""
+Batch database model.
+Groups jobs submitted together (several PDFs, or several ranges of one PDF).
+"""
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, Text
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.base import Base
+
+
+class Batch(Base):
+    """
+    Batch model: a set of jobs created in one submission.
+
+    Progress and per-status counts are aggregated from the batch's jobs;
+    the optional combined document is built once every job has finished.
+
+    Table: batches
+    """
+    __tablename__ = "batches"
+
+    # Primary key
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    # Jobs in the batch (Job.batch_id, ordered by Job.batch_index)
+    total_jobs = Column(Integer, nullable=False)
+
+    # Combined document of all completed jobs (optional)
+    combine = Column(Boolean, nullable=False, default=False)
+    output_filename = Column(String(500), nullable=True)
+    output_path = Column(Text, nullable=True)
+
+    # Status tracking
+    status = Column(
+        String(50),
+        nullable=False,
+        default="processing",
+        index=True
+    )  # processing, combining, completed, partial (some jobs failed), failed
+    error_message = Column(Text, nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    completed_at = Column(DateTime, nullable=True)
+    expires_at = Column(
+        DateTime,
+        default=lambda: datetime.utcnow() + timedelta(hours=24),
+        nullable=False,
+        index=True
+    )
+
+    def __repr__(self):
+        return f"<Batch {self.id} - {self.status} ({self.total_jobs} jobs)>"
+
+    @property
+    def is_processing(self) -> bool:
+        """Check if any job is still running or the combined document is being built."""
+        return self.status in ['processing', 'combining']
+
+    @property
+    def is_expired(self) -> bool:
+        """Check if batch has expired (24 hours)."""
+        return datetime.utcnow() > self.expires_at
@@ -4,7 +4,7 @@ Tracks PDF processing jobs with status, progress, and results.
 """
 import uuid
 from datetime import datetime, timedelta
-from sqlalchemy import Column, String, Integer, DateTime, Text, Index
+from sqlalchemy import Column, String, Integer, Float, DateTime, Text, Index, ForeignKey, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from app.db.base import Base
 
@@ -25,21 +25,51 @@ class Job(Base):
     pdf_path = Column(Text, nullable=False)
     output_filename = Column(String(500), nullable=True)
     output_path = Column(Text, nullable=True)
+    output_parts = Column(JSONB, nullable=True)  # Filenames in output_path dir when sharded
 
     # Configuration (stored as JSON)
     # Example: {page_start: 44, page_end: 64, question_start: 101, question_end: 150, chapter_name: "Chapter 2"}
     config = Column(JSONB, nullable=False)
 
+    # Hash of PDF bytes + normalized config + code versions (result cache key)
+    input_hash = Column(String(64), nullable=True, index=True)
+
+    # Single-flight: identical job whose pipeline this job follows (no own pipeline)
+    leader_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey('jobs.id', ondelete='SET NULL'),
+        nullable=True,
+        index=True
+    )
+
+    # Stage checkpoints: {stage: {files: {path: size}, version, result}}
+    checkpoints = Column(JSONB, nullable=True)
+
+    # Batch submission (see Batch); position of this job in the batch
+    batch_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey('batches.id', ondelete='CASCADE'),
+        nullable=True,
+        index=True
+    )
+    batch_index = Column(Integer, nullable=True)
+
+    # Routing (see JobRouter)
+    lane = Column(String(20), nullable=True)  # fast, bulk
+    estimated_cost = Column(Float, nullable=True)  # Estimated processing seconds
+
     # Status tracking
     status = Column(
         String(50),
         nullable=False,
-        default="pending",
-        index=True
-    )  # pending, parsing, generating, completed, failed
+        default="pending"
+    )  # pending, parsing, generating, completed, failed, cancelled
     progress = Column(Integer, default=0)  # 0-100
     current_step = Column(String(200), nullable=True)  # "Parsing question 45/100"
 
+    # Bumped by every UPDATE of the row, ORM or Core (ETag of GET /jobs/{id})
+    version = Column(Integer, nullable=False, default=1, server_default='1', onupdate=text('version + 1'))
+
     # Results
     total_questions = Column(Integer, nullable=True)
     diagrams_detected = Column(Integer, nullable=True)
@@ -61,11 +91,15 @@ class Job(Base):
 
     # Indexes
     __table_args__ = (
-        Index('idx_status', 'status'),
+        Index('idx_status_created_at', 'status', 'created_at'),
         Index('idx_created_at', 'created_at'),
         Index('idx_expires_at', 'expires_at'),
+        Index('idx_lane_status_created_at', 'lane', 'status', 'created_at'),
     )
 
+    # Read back the bumped version with RETURNING instead of expiring it
+    __mapper_args__ = {'eager_defaults': True}
+
     def __repr__(self):
         return f"<Job {self.id} - {self.status} ({self.progress}%)>"
 
@@ -84,6 +118,16 @@ class Job(Base):
         """Check if job is completed successfully."""
         return self.status == 'completed'
 
+    @property
+    def is_follower(self) -> bool:
+        """Check if job follows an identical job's pipeline."""
+        return self.leader_id is not None
+
+    @property
+    def is_cancelled(self) -> bool:
+        """Check if job was cancelled."""
+        return self.status == 'cancelled'
+
     @property
     def has_failed(self) -> bool:
         """Check if job has failed."""
@@ -0,0 +1,48 @@
+"""
+Batch schemas for API requests and responses.
+"""
+from pydantic import BaseModel, ConfigDict, Field
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from app.schemas.config import ProcessingConfig
+from app.schemas.job import JobResponse
+
+
+class BatchItem(ProcessingConfig):
+    """
+    One job of a batch submission: a range of one of the uploaded files.
+    """
+    file_index: int = Field(0, ge=0, description="Index of the PDF in pdf_files")
+
+
+class BatchResponse(BaseModel):
+    """
+    Batch status response schema.
+
+    Progress and counts are aggregated from the batch's jobs.
+    """
+    # Identification
+    id: UUID
+
+    # Status
+    status: str  # processing, combining, completed, partial, failed
+    progress: int = 0  # 0-100
+    total_jobs: int
+    counts: dict = {}  # {status: number of jobs}
+
+    # Combined document (when requested and finished)
+    combine: bool
+    output_filename: Optional[str] = None
+    error_message: Optional[str] = None
+
+    # Jobs in submission order
+    jobs: list[JobResponse] = []
+
+    # Timestamps
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+    expires_at: datetime
+
+    # Config from model
+    model_config = ConfigDict(from_attributes=True)
@@ -2,7 +2,7 @@
 Configuration schemas for PDF processing.
 """
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from typing import Optional, Literal
 
 
 class ProcessingConfig(BaseModel):
@@ -24,6 +24,12 @@ class ProcessingConfig(BaseModel):
     subject: Optional[str] = Field(None, max_length=100, description="Subject name")
     year: Optional[int] = Field(None, ge=1900, le=2100, description="Examination year")
 
+    # Output options
+    shard_size: Optional[int] = Field(None, ge=1, description="Split output into documents of N questions")
+    compression: Optional[Literal['store', 'fast', 'default', 'max']] = Field(
+        None, description="Package compression (DOCX_COMPRESSION if not set)"
+    )
+
     @field_validator('page_end')
     @classmethod
     def validate_page_range(cls, v, info):
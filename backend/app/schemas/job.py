@@ -1,9 +1,9 @@
 """
 Job schemas for API requests and responses.
 """
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple
 from uuid import UUID
 
 
@@ -33,17 +33,28 @@ class JobResponse(BaseModel):
     pdf_filename: str
 
     # Status
-    status: str  # pending, parsing, generating, completed, failed
+    status: str  # pending, parsing, generating, completed, failed, cancelled
     progress: int  # 0-100
     current_step: Optional[str] = None
+    version: int = 1  # Bumped on every change of the job
+
+    # Routing / queue estimates (queue fields only while pending)
+    lane: Optional[str] = None  # fast, bulk
+    estimated_cost: Optional[float] = None  # Seconds
+    queue_position: Optional[int] = None  # Jobs ahead in the lane
+    estimated_wait_seconds: Optional[float] = None
+    leader_id: Optional[UUID] = None  # Identical job whose pipeline this job follows
+    batch_id: Optional[UUID] = None  # Batch this job was submitted in
 
     # Results (when completed)
     output_filename: Optional[str] = None
+    output_parts: Optional[list[str]] = None  # Part filenames when sharded
     total_questions: Optional[int] = None
     diagrams_detected: Optional[int] = None
 
     # Error (when failed)
     error_message: Optional[str] = None
+    error_details: Optional[dict] = None  # {code, error_type, ...}; code e.g. time_limit_exceeded
 
     # Timestamps
     created_at: datetime
@@ -58,6 +69,20 @@ class JobListResponse(BaseModel):
     """Response schema for listing jobs."""
     jobs: list[JobResponse]
     total: int
+    next_cursor: Optional[str] = None  # Pass as cursor for the next page (None on the last page)
+
+
+class JobStatusRequest(BaseModel):
+    """Request schema for bulk job status."""
+    job_ids: list[UUID] = Field(..., min_length=1)
+    since: dict[UUID, int] = {}  # job_id -> version the client has; only newer jobs are returned
+
+
+class JobStatusResponse(BaseModel):
+    """Compact bulk job status."""
+    fields: Tuple[str, ...] = ('id', 'status', 'progress', 'current_step', 'version')
+    jobs: list[Tuple[UUID, str, int, Optional[str], int]]  # One tuple per changed job (see fields)
+    missing: list[UUID] = []  # Requested jobs that don't exist (or were deleted)
 
 
 class JobProgressUpdate(BaseModel):
@@ -0,0 +1,30 @@
+"""
+Question schemas for editing generated documents.
+"""
+from pydantic import BaseModel, Field
+from typing import List
+
+
+class QuestionUpdate(BaseModel):
+    """
+    Corrected question content.
+
+    Used to patch a single question in a job's generated document.
+    """
+    question_text: List[str] = Field(min_length=1, description="Question paragraphs")
+    options: List[str] = Field(min_length=4, max_length=4, description="Option texts (a-d)")
+    correct_option_idx: int = Field(ge=0, le=3, description="Index of correct option (0-3)")
+    solution_text: List[str] = Field(min_length=1, description="Solution paragraphs")
+    has_diagram: bool = False
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "question_text": ["Which law states that energy can neither be created nor destroyed?"],
+                "options": ["Zeroth law", "First law", "Second law", "Third law"],
+                "correct_option_idx": 1,
+                "solution_text": ["The first law of thermodynamics is the law of conservation of energy."],
+                "has_diagram": False
+            }
+        }
+    }
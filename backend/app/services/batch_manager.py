@@ -0,0 +1,104 @@
+"""
+Batch Manager Service.
+
+Aggregates the jobs of a batch (Job.batch_id) into batch-level progress
+and status. Shared by the API (async session) and the batch tasks (sync
+session): both run stats_query() and pass the rows to summarize().
+"""
+from typing import Iterable
+from uuid import UUID
+from sqlalchemy import select, func
+from app.models.batch import Batch
+from app.models.job import Job
+import logging
+
+logger = logging.getLogger(__name__)
+
+JOB_STATUSES = ('pending', 'parsing', 'generating', 'completed', 'failed', 'cancelled')
+FINISHED_STATUSES = ('completed', 'failed', 'cancelled')
+
+
+class BatchManager:
+    """
+    Batch progress aggregation.
+
+    Batch progress is the mean of its jobs' progress, finished jobs
+    (completed, failed or cancelled) counting as 100. With a combined
+    document the last 5% is the combine step.
+    """
+
+    COMBINE_SHARE = 5  # Percentage points reserved for the combined document
+
+    def stats_query(self, batch_id: UUID):
+        """
+        Build the aggregate query over a batch's jobs.
+
+        Args:
+            batch_id: Batch UUID
+
+        Returns:
+            Select of (status, job count, progress sum) per status
+        """
+        return (
+            select(Job.status, func.count(), func.coalesce(func.sum(Job.progress), 0))
+            .where(Job.batch_id == batch_id)
+            .group_by(Job.status)
+        )
+
+    def summarize(self, batch: Batch, rows: Iterable) -> dict:
+        """
+        Aggregate stats_query() rows.
+
+        Args:
+            batch: Batch
+            rows: (status, count, progress sum) rows
+
+        Returns:
+            {progress, finished, active, counts: {status: n}}
+        """
+        counts = {status: 0 for status in JOB_STATUSES}
+        progress_sum = 0
+
+        for status, count, progress in rows:
+            counts[status] = count
+            progress_sum += count * 100 if status in FINISHED_STATUSES else progress
+
+        total = max(batch.total_jobs, 1)
+        finished = sum(counts[status] for status in FINISHED_STATUSES)
+        progress = progress_sum / total
+
+        if batch.combine and batch.is_processing:
+            progress = progress * (100 - self.COMBINE_SHARE) / 100
+
+        return {
+            'progress': int(progress),
+            'finished': finished,
+            'active': batch.total_jobs - finished,
+            'counts': counts,
+        }
+
+    def final_status(self, batch: Batch, stats: dict) -> str:
+        """
+        Get status of a batch whose jobs have all finished.
+
+        Args:
+            batch: Batch
+            stats: summarize() result
+
+        Returns:
+            'completed' (every job completed), 'failed' (none did) or 'partial'
+        """
+        completed = stats['counts']['completed']
+        if completed == batch.total_jobs:
+            return 'completed'
+        if completed == 0:
+            return 'failed'
+        return 'partial'
+
+    def combined_filename(self, batch: Batch) -> str:
+        """Filename of a batch's combined document."""
+        return f"Batch_{str(batch.id)[:8]}_Combined.docx"
+
+
+# Global instance
+batch_manager = BatchManager()
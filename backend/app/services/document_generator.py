@@ -4,16 +4,32 @@ Document Generator Service.
 Generates formatted Word documents from parsed questions.
 Uses formatting utilities ported from existing scripts.
 """
+import os
+import re
+import uuid
+import zipfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from docx import Document
 from docx.shared import Cm
+from docx.oxml import parse_xml
+from lxml import etree
 from typing import List, Optional, Callable
+from app.core.config import settings
 from app.services.question_parser import ParsedQuestion
-from app.utils.formatters import add_question_table
+from app.services.fragment_cache import FragmentCache, fragment_cache
+from app.services.job_control import INTERRUPT_EXCEPTIONS, JobInterrupted
+from app.utils.formatters import add_question_table, add_bookmark
+from app.utils.ooxml import replace_members, save_document
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+class QuestionNotFound(ValueError):
+    """Question's table is not in the document (e.g. another shard holds it)."""
+
+
 class DocumentGenerator:
     """
     Generate Word documents from parsed questions.
@@ -41,6 +57,41 @@ class DocumentGenerator:
     COL_WIDTH_CONTENT = 8.5
     COL_WIDTH_STATUS = 3.0
 
+    # Bump whenever generated documents change (invalidates cached results)
+    VERSION = "1"
+
+    # Bump whenever the rendered table XML changes (invalidates cached fragments)
+    LAYOUT_VERSION = "2"
+
+    # Main document part inside the .docx package
+    DOCUMENT_PART = 'word/document.xml'
+
+    # Table boundaries in serialized document XML
+    _TABLE_TAG = re.compile(rb'<(/?)w:tbl[\s>]')
+
+    # Bookmarks (question numbers may repeat across combined documents)
+    _BOOKMARK_TAG = re.compile(rb'<w:bookmark(?:Start|End)\b[^>]*/>')
+
+    # Page break between combined documents
+    _PAGE_BREAK_XML = b'<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+
+    def __init__(self, cache: Optional[FragmentCache] = None, compression: Optional[str] = None):
+        """
+        Initialize generator.
+
+        Args:
+            cache: Fragment cache for rendered question tables (global cache if not provided)
+            compression: Package compression mode: store, fast, default or max
+                (DOCX_COMPRESSION if not provided)
+        """
+        self.cache = cache if cache is not None else fragment_cache
+        self.compression = compression or settings.DOCX_COMPRESSION
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        # Scratch document for rendering standalone tables (patching)
+        self._scratch_doc = None
+
     async def create_document(
         self,
         questions: List[ParsedQuestion],
@@ -51,6 +102,20 @@ class DocumentGenerator:
         """
         Create Word document from parsed questions.
 
+        See create_document_sync (this runs it on the calling event loop).
+        """
+        return self.create_document_sync(questions, config, output_path, progress_callback)
+
+    def create_document_sync(
+        self,
+        questions: List[ParsedQuestion],
+        config: dict,
+        output_path: str,
+        progress_callback: Optional[Callable[[float], None]] = None
+    ) -> str:
+        """
+        Create Word document from parsed questions (blocking).
+
         Args:
             questions: List of ParsedQuestion objects
             config: Processing configuration (for filename, metadata)
@@ -65,40 +130,150 @@ class DocumentGenerator:
         """
         try:
             logger.info(f"Generating document with {len(questions)} questions")
+            return self._build_document(questions, output_path, progress_callback)
 
-            # Create new document
-            doc = Document()
+        except INTERRUPT_EXCEPTIONS:
+            raise
 
-            # Set page margins
-            self._set_page_margins(doc)
+        except Exception as e:
+            logger.error(f"Error generating document: {e}", exc_info=True)
+            raise Exception(f"Failed to generate document: {str(e)}")
 
-            # Add each question as a table
-            total_questions = len(questions)
+    def create_sharded_documents(
+        self,
+        questions: List[ParsedQuestion],
+        config: dict,
+        output_dir: str,
+        shard_size: int,
+        progress_callback: Optional[Callable[[float], None]] = None,
+        interrupt_check: Optional[Callable[[], None]] = None
+    ) -> List[str]:
+        """
+        Create several Word documents of at most shard_size questions each.
 
-            for idx, question in enumerate(questions):
-                logger.debug(f"Adding question {question.number} ({idx + 1}/{total_questions})")
+        Shards are generated concurrently in worker threads (up to
+        GENERATION_WORKERS at a time), each with its own generator sharing
+        this generator's fragment cache. Blocks until all shards are saved;
+        if the caller is interrupted meanwhile (e.g. soft time limit), the
+        shard threads stop at their next question before it re-raises.
 
-                # Add question table
-                self._add_question(doc, question)
+        Args:
+            questions: List of ParsedQuestion objects
+            config: Processing configuration (for filenames)
+            output_dir: Directory where to save the documents
+            shard_size: Maximum number of questions per document
+            progress_callback: Optional callback for progress updates (0.0-1.0),
+                called as shards complete (from the calling thread)
+            interrupt_check: Optional callable raising to stop generation, called
+                between questions (from the shard threads)
+
+        Returns:
+            Paths to generated documents, in question order
+
+        Raises:
+            JobInterrupted: If interrupt_check stops generation
+            Exception: If document generation fails
+        """
+        shards = [questions[i:i + shard_size] for i in range(0, len(questions), shard_size)]
+        logger.info(f"Generating {len(shards)} documents with up to {shard_size} questions each")
+
+        generators = [DocumentGenerator(self.cache, self.compression) for _ in shards]
+        stopped = threading.Event()
+
+        def check_interrupt(_):
+            if stopped.is_set():
+                raise JobInterrupted("Document generation stopped")
+            if interrupt_check:
+                interrupt_check()
+
+        def build_shard(shard: List[ParsedQuestion], generator: 'DocumentGenerator') -> str:
+            filename = self.generate_filename({
+                **config,
+                'question_start': shard[0].number,
+                'question_end': shard[-1].number
+            })
+            output_path = os.path.join(output_dir, filename)
+            return generator._build_document(shard, output_path, check_interrupt)
+
+        executor = ThreadPoolExecutor(
+            max_workers=settings.GENERATION_WORKERS,
+            thread_name_prefix="docx-shard"
+        )
 
-                # Add page break (except for last question)
-                if idx < total_questions - 1:
-                    doc.add_page_break()
+        try:
+            futures = [
+                executor.submit(build_shard, shard, generator)
+                for shard, generator in zip(shards, generators)
+            ]
 
-                # Progress callback
+            for completed, future in enumerate(as_completed(futures), 1):
+                future.result()
                 if progress_callback:
-                    progress = (idx + 1) / total_questions
-                    progress_callback(progress)
+                    progress_callback(completed / len(shards))
 
-            # Save document
-            doc.save(output_path)
-            logger.info(f"Document saved to: {output_path}")
+            return [future.result() for future in futures]
 
-            return output_path
+        except INTERRUPT_EXCEPTIONS:
+            raise
 
         except Exception as e:
-            logger.error(f"Error generating document: {e}", exc_info=True)
-            raise Exception(f"Failed to generate document: {str(e)}")
+            logger.error(f"Error generating documents: {e}", exc_info=True)
+            raise Exception(f"Failed to generate documents: {str(e)}")
+
+        finally:
+            # Stop the remaining shards before returning or re-raising
+            stopped.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+            self.cache_hits += sum(g.cache_hits for g in generators)
+            self.cache_misses += sum(g.cache_misses for g in generators)
+
+    def _build_document(
+        self,
+        questions: List[ParsedQuestion],
+        output_path: str,
+        progress_callback: Optional[Callable[[float], None]] = None
+    ) -> str:
+        """
+        Build and save a document (blocking).
+
+        Args:
+            questions: List of ParsedQuestion objects
+            output_path: Path where to save the document
+            progress_callback: Optional callback for progress updates (0.0-1.0)
+
+        Returns:
+            Path to generated document
+        """
+        # Create new document
+        doc = Document()
+
+        # Set page margins
+        self._set_page_margins(doc)
+
+        # Add each question as a table
+        total_questions = len(questions)
+
+        for idx, question in enumerate(questions):
+            logger.debug(f"Adding question {question.number} ({idx + 1}/{total_questions})")
+
+            # Add question table
+            self._add_question(doc, question)
+
+            # Add page break (except for last question)
+            if idx < total_questions - 1:
+                doc.add_page_break()
+
+            # Progress callback
+            if progress_callback:
+                progress = (idx + 1) / total_questions
+                progress_callback(progress)
+
+        # Save document
+        save_document(doc, output_path, self.compression)
+        logger.info(f"Document saved to: {output_path} (compression: {self.compression})")
+
+        return output_path
 
     def _set_page_margins(self, doc):
         """Set page margins for document."""
@@ -112,12 +287,39 @@ class DocumentGenerator:
         """
         Add a single question to document.
 
+        Reuses the cached table XML when the same question was rendered
+        before with the current layout version.
+
         Args:
             doc: Document object
             question: ParsedQuestion object
         """
+        key = self.cache.make_key(question, self.LAYOUT_VERSION)
+        cached_xml = self.cache.get(key)
+
+        if cached_xml is not None:
+            self.cache_hits += 1
+            doc.element.body._insert_tbl(parse_xml(cached_xml))
+            return
+
+        self.cache_misses += 1
+
+        table = self._render_question(doc, question)
+        self.cache.put(key, etree.tostring(table._tbl))
+
+    def _render_question(self, doc, question: ParsedQuestion):
+        """
+        Render question table and tag it with a bookmark.
+
+        Args:
+            doc: Document object
+            question: ParsedQuestion object
+
+        Returns:
+            Created table object
+        """
         # Use the formatting utility to add question table
-        add_question_table(
+        table = add_question_table(
             doc,
             question_parts=question.question_text,
             options=question.options,
@@ -126,6 +328,201 @@ class DocumentGenerator:
             has_diagram=question.has_diagram
         )
 
+        # Tag table so the question can be located in the saved document
+        add_bookmark(
+            table.rows[0].cells[0].paragraphs[0],
+            question.number,
+            self.bookmark_name(question.number)
+        )
+
+        return table
+
+    def _question_table_xml(self, question: ParsedQuestion) -> bytes:
+        """
+        Get standalone table XML for a question (cached or freshly rendered).
+
+        Args:
+            question: ParsedQuestion object
+
+        Returns:
+            Serialized w:tbl element
+        """
+        key = self.cache.make_key(question, self.LAYOUT_VERSION)
+        cached_xml = self.cache.get(key)
+
+        if cached_xml is not None:
+            self.cache_hits += 1
+            return cached_xml
+
+        self.cache_misses += 1
+
+        if self._scratch_doc is None:
+            self._scratch_doc = Document()
+
+        table = self._render_question(self._scratch_doc, question)
+        xml = etree.tostring(table._tbl)
+
+        # Keep scratch document empty
+        table._tbl.getparent().remove(table._tbl)
+
+        self.cache.put(key, xml)
+        return xml
+
+    def _find_question_table(self, document_xml: bytes, question_number: int):
+        """
+        Find byte range of a question's table in serialized document XML.
+
+        Args:
+            document_xml: Contents of word/document.xml
+            question_number: Question number
+
+        Returns:
+            (start, end) offsets of the w:tbl element
+
+        Raises:
+            QuestionNotFound: If the question's bookmark is not found
+            ValueError: If the question's table is malformed
+        """
+        name = self.bookmark_name(question_number).encode('utf-8')
+        bookmark = re.search(rb'<w:bookmarkStart\b[^>]*\bw:name="' + re.escape(name) + rb'"', document_xml)
+        if not bookmark:
+            raise QuestionNotFound(f"Question {question_number} not found in document")
+
+        # Enclosing table starts at the last table opening tag before the bookmark
+        start = None
+        for match in self._TABLE_TAG.finditer(document_xml, 0, bookmark.start()):
+            if not match.group(1):
+                start = match.start()
+        if start is None:
+            raise QuestionNotFound(f"Question {question_number} not found in document")
+
+        # Matching closing tag
+        depth = 0
+        for match in self._TABLE_TAG.finditer(document_xml, start):
+            depth += -1 if match.group(1) else 1
+            if depth == 0:
+                return start, document_xml.index(b'>', match.start()) + 1
+
+        raise ValueError(f"Malformed table for question {question_number}")
+
+    @staticmethod
+    def bookmark_name(question_number: int) -> str:
+        """Get bookmark name identifying a question's table."""
+        return f"question_{question_number}"
+
+    def patch_question(self, docx_path: str, question: ParsedQuestion) -> str:
+        """
+        Replace a single question's table in an existing document.
+
+        Blocking (zip read, splice and rewrite); call it from a thread
+        when running on an event loop.
+
+        Locates the table by the bookmark written at generation time and
+        splices the new table into word/document.xml at the byte level
+        (no XML parse of the whole document; generated tables are never
+        nested). The package is rewritten copying all other parts as raw
+        bytes, and replaced atomically (new inode), so hard links to the
+        old file (e.g. the result cache) keep the original content.
+
+        Args:
+            docx_path: Path to generated document
+            question: Updated ParsedQuestion (matched by number)
+
+        Returns:
+            Path to patched document
+
+        Raises:
+            QuestionNotFound: If the question is not present in the document
+            ValueError: If the question's table is malformed
+            Exception: If patching fails
+        """
+        tmp_path = f"{docx_path}.{uuid.uuid4().hex}.tmp"
+
+        try:
+            with zipfile.ZipFile(docx_path, 'r') as zf:
+                document_xml = zf.read(self.DOCUMENT_PART)
+
+            start, end = self._find_question_table(document_xml, question.number)
+            document_xml = document_xml[:start] + self._question_table_xml(question) + document_xml[end:]
+
+            replace_members(docx_path, tmp_path, {self.DOCUMENT_PART: document_xml}, self.compression)
+            os.replace(tmp_path, docx_path)
+
+            logger.info(f"Patched question {question.number} in {docx_path}")
+            return docx_path
+
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"Error patching document: {e}", exc_info=True)
+            raise Exception(f"Failed to patch document: {str(e)}")
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def combine_documents(self, docx_paths: List[str], output_path: str) -> str:
+        """
+        Concatenate generated documents into one, a page break between each (blocking).
+
+        Works on word/document.xml bytes: the body content of every
+        document (up to its final section properties) is appended to the
+        first document's body; all other parts come from the first
+        package. Generated bodies reference no other parts (no images or
+        hyperlinks), so this is safe for documents from this generator.
+        Bookmarks are dropped from all but the first document, since
+        question numbers may repeat.
+
+        Args:
+            docx_paths: Generated documents, in order
+            output_path: Path where to save the combined document
+
+        Returns:
+            Path to combined document
+
+        Raises:
+            ValueError: If no documents are given
+            Exception: If combining fails
+        """
+        if not docx_paths:
+            raise ValueError("No documents to combine")
+
+        tmp_path = f"{output_path}.{uuid.uuid4().hex}.tmp"
+
+        def body_content(document_xml: bytes) -> tuple:
+            start = document_xml.index(b'>', document_xml.index(b'<w:body')) + 1
+            end = document_xml.rfind(b'<w:sectPr')
+            if end < start:
+                end = document_xml.rindex(b'</w:body>')
+            return start, end
+
+        try:
+            contents = []
+            for idx, path in enumerate(docx_paths):
+                with zipfile.ZipFile(path, 'r') as zf:
+                    document_xml = zf.read(self.DOCUMENT_PART)
+                if idx == 0:
+                    base_xml = document_xml
+                start, end = body_content(document_xml)
+                content = document_xml[start:end]
+                contents.append(content if idx == 0 else self._BOOKMARK_TAG.sub(b'', content))
+
+            start, end = body_content(base_xml)
+            combined_xml = base_xml[:start] + self._PAGE_BREAK_XML.join(contents) + base_xml[end:]
+
+            replace_members(docx_paths[0], tmp_path, {self.DOCUMENT_PART: combined_xml}, self.compression)
+            os.replace(tmp_path, output_path)
+
+            logger.info(f"Combined {len(docx_paths)} documents into {output_path}")
+            return output_path
+
+        except Exception as e:
+            logger.error(f"Error combining documents: {e}", exc_info=True)
+            raise Exception(f"Failed to combine documents: {str(e)}")
+
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
     async def validate_questions(self, questions: List[ParsedQuestion]) -> bool:
         """
         Validate questions before generating document.
@@ -162,6 +559,20 @@ class DocumentGenerator:
 
         return True
 
+    def generate_bundle_filename(self, config: dict) -> str:
+        """
+        Generate filename of the ZIP bundle for sharded output.
+
+        Format: {chapter_name}_Q{start}-{end}.zip
+
+        Args:
+            config: Processing configuration
+
+        Returns:
+            Generated filename
+        """
+        return os.path.splitext(self.generate_filename(config))[0] + '.zip'
+
     def generate_filename(self, config: dict) -> str:
         """
         Generate output filename from config.
@@ -175,7 +586,7 @@ class DocumentGenerator:
         Returns:
             Generated filename
         """
-        chapter = config.get('chapter_name', 'Questions')
+        chapter = config.get('chapter_name') or 'Questions'
         q_start = config.get('question_start', 1)
         q_end = config.get('question_end', 100)
 
@@ -194,12 +605,20 @@ class DocumentGenerator:
             questions: List of ParsedQuestion objects
 
         Returns:
-            Dictionary with stats
+            Dictionary with stats (fragment cache counters cover every
+            document created by this generator instance)
         """
+        lookups = self.cache_hits + self.cache_misses
+
         return {
             'total_questions': len(questions),
             'diagrams_detected': sum(1 for q in questions if q.has_diagram),
             'low_confidence_count': sum(1 for q in questions if q.confidence < 0.7),
             'average_confidence': sum(q.confidence for q in questions) / len(questions) if questions else 0,
             'question_numbers': [q.number for q in questions],
+            'fragment_cache': {
+                'hits': self.cache_hits,
+                'misses': self.cache_misses,
+                'hit_rate': self.cache_hits / lookups if lookups else 0,
+            },
         }
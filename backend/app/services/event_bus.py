@@ -0,0 +1,373 @@
+"""
+Event Bus Service.
+
+Cross-process job events over Redis pub/sub.
+
+Celery workers cannot reach browsers directly: their Socket.IO server has
+no clients. Workers publish progress/complete/error events to Redis with
+EventPublisher, and every API process relays them into its Socket.IO job
+rooms and SSE streams with EventRelay (events raised by the API itself
+go the same way, see publish_job_event). Events of a single-flight leader
+are also relayed to its followers' rooms (except 'cancelled': a follower
+is promoted, not cancelled, when its leader is).
+
+Wire format (one PUBLISH per flush):
+    [[job_id, event, data, version], ...]
+
+The same flush (one script call) also stores each job's latest state in a
+Redis hash (job:{id}:state, expiring after JOB_STATE_TTL_SECONDS), so a
+client that subscribes mid-job is sent the current state at once, without
+a database query:
+    event     last event name (progress, complete, error, cancelled)
+    progress  JSON of the last progress data
+    data      JSON of the terminal event's data
+    version   number of events recorded for the job (SSE event ID)
+"""
+import json
+import time
+import asyncio
+from typing import Dict, List, Optional, Set
+from app.core.config import settings
+from app.core.redis import get_redis, get_async_redis
+from app.services.single_flight import single_flight
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Events that are never coalesced and flush the buffer immediately
+TERMINAL_EVENTS = ('complete', 'error', 'cancelled')
+
+# Record each event in its job's state, then publish the batch with the
+# new versions. KEYS: state keys, one per event. ARGV: channel, TTL, then
+# job_id, event, state field, data JSON per event (JSON is spliced in as is)
+_PUBLISH_SCRIPT = """
+local items = {}
+for i, key in ipairs(KEYS) do
+    local n = 3 + (i - 1) * 4
+    local version = redis.call('hincrby', key, 'version', 1)
+    redis.call('hset', key, 'event', ARGV[n + 1], ARGV[n + 2], ARGV[n + 3])
+    redis.call('expire', key, ARGV[2])
+    items[i] = '["' .. ARGV[n] .. '","' .. ARGV[n + 1] .. '",' .. ARGV[n + 3] .. ',' .. version .. ']'
+end
+redis.call('publish', ARGV[1], '[' .. table.concat(items, ',') .. ']')
+return #items
+"""
+
+
+def state_key(job_id: str) -> str:
+    """Redis key of a job's latest state."""
+    return f"job:{job_id}:state"
+
+
+def _script_params(channel: str, batch: List[list]) -> tuple:
+    """KEYS and ARGV of _PUBLISH_SCRIPT for a batch of [job_id, event, data]."""
+    keys, args = [], [channel, settings.JOB_STATE_TTL_SECONDS]
+    for job_id, event, data in batch:
+        keys.append(state_key(job_id))
+        args += [
+            str(job_id), event,
+            'progress' if event == 'progress' else 'data',
+            json.dumps(data, separators=(',', ':'))
+        ]
+    return keys, args
+
+
+async def publish_job_event(job_id: str, event: str, data: dict):
+    """
+    Publish an event raised by the API itself (e.g. cancelling a pending job).
+
+    Recorded in the job's state and relayed by every API process, like
+    worker events.
+
+    Args:
+        job_id: Job UUID
+        event: Event name
+        data: Event data
+    """
+    script = get_async_redis().register_script(_PUBLISH_SCRIPT)
+    keys, args = _script_params(settings.EVENTS_CHANNEL, [[str(job_id), event, data]])
+    await script(keys=keys, args=args)
+
+
+async def read_job_state(job_id: str) -> Optional[dict]:
+    """
+    Get a job's latest state (a follower gets its leader's).
+
+    Args:
+        job_id: Job UUID
+
+    Returns:
+        {event, progress, data, version} (progress/data None if not
+        recorded), or None
+    """
+    redis = get_async_redis()
+    state = await redis.hgetall(state_key(job_id))
+
+    if not state:
+        leader_id = await single_flight.leader_of(job_id)
+        if leader_id:
+            state = await redis.hgetall(state_key(leader_id))
+    if not state:
+        return None
+
+    return {
+        'event': state.get('event'),
+        'progress': json.loads(state['progress']) if state.get('progress') else None,
+        'data': json.loads(state['data']) if state.get('data') else None,
+        'version': int(state['version']) if state.get('version') else None,
+    }
+
+
+class EventPublisher:
+    """
+    Write-only, batching event publisher (used in Celery workers).
+
+    Progress events are coalesced per job (only the latest is kept) and
+    flushed at most once per EVENTS_FLUSH_INTERVAL_MS. Terminal events
+    flush immediately, after any pending progress, so a burst of updates
+    costs a single Redis round-trip.
+    """
+
+    def __init__(self, channel: Optional[str] = None, flush_interval_ms: Optional[int] = None):
+        """
+        Initialize publisher.
+
+        Args:
+            channel: Redis channel (EVENTS_CHANNEL if not provided)
+            flush_interval_ms: Minimum time between flushes (EVENTS_FLUSH_INTERVAL_MS if not provided)
+        """
+        self.channel = channel or settings.EVENTS_CHANNEL
+        self.flush_interval = (
+            flush_interval_ms if flush_interval_ms is not None else settings.EVENTS_FLUSH_INTERVAL_MS
+        ) / 1000
+
+        self._progress: Dict[str, dict] = {}  # job_id -> latest progress data
+        self._events: List[list] = []  # ordered non-progress events
+        self._last_flush = 0.0
+        self._script = None  # _PUBLISH_SCRIPT, registered on first flush
+
+    def publish_progress(self, job_id: str, data: dict):
+        """
+        Queue progress update.
+
+        Args:
+            job_id: Job UUID
+            data: Progress data {progress: int, step: str, timestamp: str}
+        """
+        self._progress[job_id] = data
+
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def publish_complete(self, job_id: str, data: dict):
+        """
+        Publish completion event (flushes immediately).
+
+        Args:
+            job_id: Job UUID
+            data: Completion data {output_filename, total_questions, diagrams_detected}
+        """
+        self._publish_event(job_id, 'complete', data)
+
+    def publish_error(self, job_id: str, error: str, details: Optional[dict] = None):
+        """
+        Publish error event (flushes immediately).
+
+        Args:
+            job_id: Job UUID
+            error: Error message
+            details: Optional error details
+        """
+        self._publish_event(job_id, 'error', {
+            'message': error,
+            'details': details or {}
+        })
+
+    def publish_cancelled(self, job_id: str, data: dict):
+        """
+        Publish cancellation event (flushes immediately).
+
+        Args:
+            job_id: Job UUID
+            data: Cancellation data {progress, timestamp}
+        """
+        self._publish_event(job_id, 'cancelled', data)
+
+    def _publish_event(self, job_id: str, event: str, data: dict):
+        """Queue a non-progress event and flush."""
+        # Pending progress for this job goes out first
+        progress = self._progress.pop(job_id, None)
+        if progress is not None:
+            self._events.append([job_id, 'progress', progress])
+
+        self._events.append([job_id, event, data])
+
+        if event in TERMINAL_EVENTS:
+            self.flush()
+        elif time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Publish all buffered events in one message, recording job states in the same script call."""
+        batch = self._events + [
+            [job_id, 'progress', data] for job_id, data in self._progress.items()
+        ]
+        self._events = []
+        self._progress = {}
+        self._last_flush = time.monotonic()
+
+        if not batch:
+            return
+
+        try:
+            if self._script is None:
+                self._script = get_redis().register_script(_PUBLISH_SCRIPT)
+            keys, args = _script_params(self.channel, batch)
+            self._script(keys=keys, args=args)
+        except Exception as e:
+            # Events are best-effort; job state is always persisted in the database
+            logger.error(f"Error publishing {len(batch)} events: {e}")
+
+
+class EventRelay:
+    """
+    Relay published job events into Socket.IO rooms (used in the API).
+
+    Runs as a background task for the lifetime of the API process and
+    reconnects with backoff if Redis goes away. Every API process relays
+    every event to its own clients (emits bypass the Socket.IO message
+    queue, which would deliver them once per process).
+    """
+
+    # Events buffered per SSE stream; a slow client loses the oldest progress
+    LISTENER_QUEUE_SIZE = 100
+
+    def __init__(self, channel: Optional[str] = None):
+        """
+        Initialize relay.
+
+        Args:
+            channel: Redis channel (EVENTS_CHANNEL if not provided)
+        """
+        self.channel = channel or settings.EVENTS_CHANNEL
+        self._task: Optional[asyncio.Task] = None
+        self._listeners: Dict[str, Set[asyncio.Queue]] = {}  # job_id -> SSE stream queues
+
+    def listen(self, job_id: str) -> asyncio.Queue:
+        """
+        Receive a job's relayed events in this process (SSE streams).
+
+        Args:
+            job_id: Job UUID
+
+        Returns:
+            Queue of (event, data, version) tuples; call unlisten() when done
+        """
+        queue = asyncio.Queue(maxsize=self.LISTENER_QUEUE_SIZE)
+        self._listeners.setdefault(job_id, set()).add(queue)
+        return queue
+
+    def unlisten(self, job_id: str, queue: asyncio.Queue):
+        """
+        Stop receiving a job's events.
+
+        Args:
+            job_id: Job UUID
+            queue: Queue returned by listen()
+        """
+        queues = self._listeners.get(job_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._listeners[job_id]
+
+    async def start(self):
+        """Start relaying in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Event relay listening on {self.channel}")
+
+    async def stop(self):
+        """Stop relaying."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        """Subscribe and dispatch until cancelled."""
+        backoff = 1
+
+        while True:
+            try:
+                pubsub = get_async_redis().pubsub(ignore_subscribe_messages=True)
+                await pubsub.subscribe(self.channel)
+                backoff = 1
+
+                try:
+                    async for message in pubsub.listen():
+                        await self._dispatch(message['data'])
+                finally:
+                    await pubsub.aclose()
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Event relay error: {e} (reconnecting in {backoff}s)")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+
+    async def _dispatch(self, payload: str):
+        """Emit each event in a published batch (to the job's and its followers' rooms and streams)."""
+        # Imported here to keep workers free of the Socket.IO server
+        from app.services.websocket_manager import ws_manager
+
+        try:
+            batch = json.loads(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed event batch")
+            return
+
+        try:
+            followers = await single_flight.get_followers_many(list({item[0] for item in batch}))
+        except Exception as e:
+            logger.warning(f"Error looking up followers: {e}")
+            followers = {}
+
+        for job_id, event, data, *version in batch:
+            rooms = [job_id]
+            if event != 'cancelled':
+                rooms += followers.get(job_id, [])
+
+            for room in rooms:
+                for queue in self._listeners.get(room, ()):
+                    self._enqueue(queue, (event, data, version[0] if version else None))
+
+                try:
+                    if event == 'progress':
+                        await ws_manager.send_progress(room, data, local=True)
+                    elif event == 'complete':
+                        await ws_manager.send_complete(room, data, local=True)
+                    elif event == 'error':
+                        await ws_manager.send_error(room, data.get('message'), data.get('details'), local=True)
+                    elif event == 'cancelled':
+                        await ws_manager.send_cancelled(room, data, local=True)
+                    else:
+                        logger.warning(f"Ignoring unknown event {event} for job {room}")
+                except Exception as e:
+                    logger.error(f"Error relaying {event} for job {room}: {e}")
+
+    @staticmethod
+    def _enqueue(queue: asyncio.Queue, item: tuple):
+        """Queue an event for a stream, dropping its oldest event if full."""
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(item)
+
+
+# Global instances
+event_publisher = EventPublisher()
+event_relay = EventRelay()
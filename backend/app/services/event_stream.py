@@ -0,0 +1,162 @@
+"""
+Event Stream Service.
+
+Server-Sent Events stream of one job's events (GET /jobs/{id}/events),
+for clients that can't keep a WebSocket open. Fed by the same EventRelay
+as the Socket.IO rooms, so it carries the same progress, complete, error
+and cancelled events (full progress data, no deltas):
+
+    id: 42
+    event: progress
+    data: {"progress":40,"step":"Parsing questions...","timestamp":"..."}
+
+The ID is the job state version from Redis (see event_bus). A stream
+starts with the job's current state, unless the client's Last-Event-ID
+shows it already has it, sends a comment line every SSE_HEARTBEAT_SECONDS
+while idle, and ends after the terminal event.
+"""
+import asyncio
+import json
+from typing import AsyncIterator, List, Optional
+from app.core.config import settings
+from app.models.job import Job
+from app.services.event_bus import event_relay, read_job_state, TERMINAL_EVENTS
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def format_event(event: str, data: dict, version: Optional[int] = None) -> str:
+    """
+    Encode one SSE message.
+
+    Args:
+        event: Event name
+        data: Event data (JSON-encoded on one line)
+        version: Event ID (omitted if None)
+
+    Returns:
+        SSE message text
+    """
+    message = f"id: {version}\n" if version is not None else ""
+    return f"{message}event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+class JobEventStream:
+    """
+    One client's SSE stream of a job's events.
+
+    Built from the Job row while the request's database session is open;
+    the stream itself only uses Redis and the relay.
+    """
+
+    def __init__(self, job: Job, last_event_id: Optional[str] = None):
+        """
+        Initialize stream.
+
+        Args:
+            job: Job (state source when Redis has none)
+            last_event_id: Last-Event-ID header of a reconnecting client
+        """
+        self.job_id = str(job.id)
+        self.last_event_id = last_event_id
+        self._fallback = self._job_events(job)
+
+    async def is_finished(self) -> bool:
+        """
+        Check whether the client already has the job's terminal event.
+
+        A reconnecting EventSource is then answered with 204 No Content,
+        which stops it from reconnecting.
+
+        Returns:
+            True if Last-Event-ID is the version of a terminal state
+        """
+        if not self.last_event_id:
+            return False
+
+        state = await self._read_state()
+        return bool(
+            state and state['event'] in TERMINAL_EVENTS
+            and str(state['version']) == self.last_event_id
+        )
+
+    async def events(self) -> AsyncIterator[str]:
+        """
+        Yield SSE messages until the job's terminal event (or disconnect).
+
+        Yields:
+            SSE message text
+        """
+        # Listen first: events relayed while the state is read are queued
+        queue = event_relay.listen(self.job_id)
+
+        try:
+            yield f"retry: {settings.SSE_RETRY_MS}\n\n"
+
+            replayed = None
+            state = await self._read_state()
+
+            if state:
+                replayed = state['version']
+                if replayed is None or str(replayed) != self.last_event_id:
+                    if state['progress']:
+                        yield format_event('progress', state['progress'], replayed)
+                    if state['event'] in TERMINAL_EVENTS and state['data'] is not None:
+                        yield format_event(state['event'], state['data'], replayed)
+                        return
+            else:
+                # Nothing in Redis (not started yet, or state expired)
+                for event, data in self._fallback:
+                    yield format_event(event, data)
+                    if event in TERMINAL_EVENTS:
+                        return
+
+            while True:
+                try:
+                    event, data, version = await asyncio.wait_for(
+                        queue.get(), settings.SSE_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    # Keeps proxies from closing an idle stream
+                    yield ": heartbeat\n\n"
+                    continue
+
+                if version is not None and replayed is not None and version <= replayed:
+                    continue  # Already sent with the current state (or older)
+
+                yield format_event(event, data, version)
+                if event in TERMINAL_EVENTS:
+                    return
+
+        finally:
+            event_relay.unlisten(self.job_id, queue)
+
+    async def _read_state(self) -> Optional[dict]:
+        """Job state from Redis (None if missing or Redis is unavailable)."""
+        try:
+            return await read_job_state(self.job_id)
+        except Exception as e:
+            logger.warning(f"Error reading state of job {self.job_id}: {e}")
+            return None
+
+    @staticmethod
+    def _job_events(job: Job) -> List[tuple]:
+        """Current state of a job row as (event, data) pairs."""
+        events = [('progress', {'progress': job.progress or 0, 'step': job.current_step})]
+
+        if job.status == 'completed':
+            events.append(('complete', {
+                'output_filename': job.output_filename,
+                'total_questions': job.total_questions,
+                'diagrams_detected': job.diagrams_detected
+            }))
+        elif job.status == 'failed':
+            events.append(('error', {
+                'message': job.error_message,
+                'details': job.error_details or {}
+            }))
+        elif job.status == 'cancelled':
+            events.append(('cancelled', {'progress': job.progress or 0}))
+
+        return events
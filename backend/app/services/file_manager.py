@@ -5,10 +5,11 @@ Handles file uploads, downloads, storage, and cleanup.
 """
 import os
 import shutil
+import zipfile
 import aiofiles
 from pathlib import Path
 from uuid import UUID
-from typing import Optional
+from typing import Optional, List, Iterator
 from fastapi import UploadFile
 from app.core.config import settings
 import logging
@@ -16,6 +17,31 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+class _StreamBuffer:
+    """
+    Write-only, unseekable sink for zipfile.
+
+    zipfile falls back to data descriptors when the output cannot seek,
+    so an archive can be produced chunk by chunk without touching disk.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        """Return and clear buffered bytes."""
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
 class FileManager:
     """
     Manage file operations for PDF uploads and Word outputs.
@@ -28,6 +54,10 @@ class FileManager:
       outputs/
         {job-uuid}/
           output.docx
+      artifacts/
+        {job-uuid}/
+          text.txt
+          questions.json
     """
 
     def __init__(self):
@@ -35,6 +65,7 @@ class FileManager:
         self.base_path = Path(settings.STORAGE_PATH)
         self.uploads_path = self.base_path / 'uploads'
         self.outputs_path = self.base_path / 'outputs'
+        self.artifacts_path = self.base_path / 'artifacts'
 
         # Create directories if they don't exist
         self._ensure_directories()
@@ -43,6 +74,7 @@ class FileManager:
         """Create storage directories if they don't exist."""
         self.uploads_path.mkdir(parents=True, exist_ok=True)
         self.outputs_path.mkdir(parents=True, exist_ok=True)
+        self.artifacts_path.mkdir(parents=True, exist_ok=True)
         logger.info(f"Storage paths initialized: {self.base_path}")
 
     async def save_upload(
@@ -102,6 +134,41 @@ class FileManager:
             logger.error(f"Error saving upload: {e}")
             raise
 
+    def link_upload(self, src_path: str, job_id: UUID) -> str:
+        """
+        Share an already saved upload with another job (batch ranges of one PDF).
+
+        Each job keeps its own link, so deleting one job leaves the others'
+        input intact.
+
+        Args:
+            src_path: Saved upload path
+            job_id: Job UUID
+
+        Returns:
+            Path to the job's input file
+        """
+        job_dir = self.uploads_path / str(job_id)
+        job_dir.mkdir(parents=True, exist_ok=True)
+
+        file_path = str(job_dir / 'input.pdf')
+        self.link_file(src_path, file_path)
+        return file_path
+
+    def get_output_dir(self, job_id: UUID) -> str:
+        """
+        Get output directory for a job.
+
+        Args:
+            job_id: Job UUID
+
+        Returns:
+            Full path of the job's output directory
+        """
+        job_dir = self.outputs_path / str(job_id)
+        job_dir.mkdir(parents=True, exist_ok=True)
+        return str(job_dir)
+
     def get_output_path(self, job_id: UUID, filename: str) -> str:
         """
         Get path for output file.
@@ -119,6 +186,56 @@ class FileManager:
         file_path = job_dir / filename
         return str(file_path)
 
+    def get_artifact_path(self, job_id: UUID, name: str) -> str:
+        """
+        Get path for an intermediate pipeline artifact.
+
+        Args:
+            job_id: Job UUID
+            name: Artifact filename (e.g. 'text.txt')
+
+        Returns:
+            Full path for artifact file
+        """
+        job_dir = self.artifacts_path / str(job_id)
+        job_dir.mkdir(parents=True, exist_ok=True)
+
+        file_path = job_dir / name
+        return str(file_path)
+
+    @staticmethod
+    def link_file(src: str, dst: str):
+        """
+        Hard-link src to dst, copying when links are not possible (e.g. across devices).
+
+        Args:
+            src: Existing file
+            dst: Link path (replaced if it exists)
+        """
+        if os.path.exists(dst):
+            os.unlink(dst)
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)
+
+    def remove_partial_files(self, job_id: UUID):
+        """
+        Delete a job's outputs and intermediate artifacts (keeps the upload).
+
+        Args:
+            job_id: Job UUID
+        """
+        output_dir = self.outputs_path / str(job_id)
+        if output_dir.exists():
+            shutil.rmtree(output_dir)
+            logger.info(f"Deleted output directory: {output_dir}")
+
+        artifact_dir = self.artifacts_path / str(job_id)
+        if artifact_dir.exists():
+            shutil.rmtree(artifact_dir)
+            logger.info(f"Deleted artifact directory: {artifact_dir}")
+
     async def cleanup_job(self, job_id: UUID) -> bool:
         """
         Delete all files for a job.
@@ -136,11 +253,8 @@ class FileManager:
                 shutil.rmtree(upload_dir)
                 logger.info(f"Deleted upload directory: {upload_dir}")
 
-            # Delete outputs
-            output_dir = self.outputs_path / str(job_id)
-            if output_dir.exists():
-                shutil.rmtree(output_dir)
-                logger.info(f"Deleted output directory: {output_dir}")
+            # Delete outputs and intermediate artifacts
+            self.remove_partial_files(job_id)
 
             return True
 
@@ -148,6 +262,35 @@ class FileManager:
             logger.error(f"Error cleaning up job {job_id}: {e}")
             return False
 
+    def iter_zip_bundle(self, file_paths: List[str], chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+        """
+        Stream a ZIP archive of the given files, built on the fly.
+
+        Members are stored uncompressed (.docx files are already deflated),
+        and nothing is written to disk.
+
+        Args:
+            file_paths: Files to include (archived under their base names)
+            chunk_size: Read size in bytes
+
+        Yields:
+            ZIP archive bytes
+        """
+        buffer = _StreamBuffer()
+
+        with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_STORED) as bundle:
+            for file_path in file_paths:
+                with open(file_path, 'rb') as src, \
+                        bundle.open(os.path.basename(file_path), 'w') as dst:
+                    while chunk := src.read(chunk_size):
+                        dst.write(chunk)
+                        yield buffer.drain()
+
+                yield buffer.drain()
+
+        # Central directory
+        yield buffer.drain()
+
     def get_file_size(self, file_path: str) -> int:
         """
         Get file size in bytes.
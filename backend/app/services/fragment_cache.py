@@ -0,0 +1,182 @@
+"""
+Fragment Cache Service.
+
+On-disk LRU cache of rendered question table XML fragments.
+"""
+import os
+import hashlib
+import json
+import threading
+import uuid
+from dataclasses import asdict
+from pathlib import Path
+from typing import Optional
+from app.core.config import settings
+from app.services.question_parser import ParsedQuestion
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class FragmentCache:
+    """
+    Cache rendered `w:tbl` XML per question.
+
+    Keys are a SHA-256 of the ParsedQuestion fields plus the generator
+    layout version, so any change to a question or to the table layout
+    produces a new key.
+
+    Storage structure:
+    /data/
+      cache/
+        fragments/
+          {key[:2]}/
+            {key}.xml
+
+    Recency is tracked through file mtimes (touched on every hit), and the
+    least recently used fragments are evicted once the cache grows beyond
+    FRAGMENT_CACHE_MAX_MB.
+    """
+
+    def __init__(self, cache_path: Optional[Path] = None, max_bytes: Optional[int] = None):
+        """Initialize cache directory and size limit."""
+        self.cache_path = cache_path or Path(settings.STORAGE_PATH) / 'cache' / 'fragments'
+        self.max_bytes = max_bytes if max_bytes is not None else settings.FRAGMENT_CACHE_MAX_MB * 1024 * 1024
+        self.enabled = settings.FRAGMENT_CACHE_ENABLED and self.max_bytes > 0
+
+        # Approximate size of the cache directory, computed lazily
+        self._size: Optional[int] = None
+        # Guards _size and eviction (generation worker threads share the cache)
+        self._lock = threading.Lock()
+
+        if self.enabled:
+            self.cache_path.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(question: ParsedQuestion, layout_version: str) -> str:
+        """
+        Build cache key for a question.
+
+        Args:
+            question: ParsedQuestion object
+            layout_version: Table layout/template version
+
+        Returns:
+            Hex digest identifying the rendered fragment
+        """
+        payload = json.dumps(
+            {'layout': layout_version, 'question': asdict(question)},
+            sort_keys=True,
+            separators=(',', ':'),
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path_for(self, key: str) -> Path:
+        """Get fragment file path for a key."""
+        return self.cache_path / key[:2] / f"{key}.xml"
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Get cached fragment XML.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Fragment XML bytes, or None on miss
+        """
+        if not self.enabled:
+            return None
+
+        path = self._path_for(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Error reading cached fragment {key}: {e}")
+            return None
+
+        # Mark as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return data
+
+    def put(self, key: str, xml: bytes):
+        """
+        Store fragment XML.
+
+        Args:
+            key: Cache key
+            xml: Serialized table XML
+        """
+        if not self.enabled:
+            return
+
+        path = self._path_for(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+            # Write atomically so concurrent workers never read partial fragments;
+            # the tmp name is unique per write, not per process (threads share a PID)
+            tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+            tmp_path.write_bytes(xml)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Error caching fragment {key}: {e}")
+            return
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(xml)
+
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _scan_size(self) -> int:
+        """Calculate total size of cached fragments."""
+        total = 0
+        for item in self.cache_path.rglob('*.xml'):
+            try:
+                total += item.stat().st_size
+            except OSError:
+                continue
+        return total
+
+    def _evict(self):
+        """Delete least recently used fragments until 90% of the size limit."""
+        entries = []
+        for item in self.cache_path.rglob('*.xml'):
+            try:
+                stat = item.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, item))
+
+        entries.sort(key=lambda e: e[0])
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+
+        for _, size, item in entries:
+            if total <= target:
+                break
+            try:
+                item.unlink()
+                total -= size
+                evicted += 1
+            except OSError:
+                continue
+
+        self._size = total
+        logger.info(f"Evicted {evicted} cached fragments ({total / (1024 * 1024):.2f}MB remaining)")
+
+
+# Global instance
+fragment_cache = FragmentCache()
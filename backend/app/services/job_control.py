@@ -0,0 +1,262 @@
+"""
+Job Control Service.
+
+Cooperative interruption of running jobs:
+
+- Cancellation: the API sets a cancellation flag in Redis; the worker
+  polls it between pages, question blocks and questions (through
+  CancellationToken) and stops by raising JobCancelled from inside the
+  services.
+- Budgets: JobBudget bounds a job's wall time and worker RSS, scaled by
+  its page and question counts, and raises BudgetExceeded at the same
+  checkpoints.
+"""
+import os
+import sys
+import time
+import resource
+from datetime import datetime, timedelta
+from typing import Optional
+from celery.exceptions import SoftTimeLimitExceeded
+from app.core.config import settings
+from app.core.redis import get_redis, get_async_redis
+import logging
+
+logger = logging.getLogger(__name__)
+
+CANCEL_FLAG_TTL = 86400  # Seconds (outlives any job run)
+
+
+class JobInterrupted(Exception):
+    """
+    Base for cooperative job stops.
+
+    Services re-raise it unchanged (never wrapped as a processing failure).
+    """
+
+
+class JobCancelled(JobInterrupted):
+    """Job was cancelled by the user."""
+
+
+class BudgetExceeded(JobInterrupted):
+    """
+    Job exceeded its time or memory budget.
+
+    Attributes:
+        code: Failure code stored in Job.error_details
+        details: Limit and measured value
+    """
+
+    def __init__(self, code: str, message: str, details: Optional[dict] = None):
+        super().__init__(message)
+        self.code = code
+        self.details = details or {}
+
+
+# Exceptions services must re-raise unchanged (Celery raises
+# SoftTimeLimitExceeded asynchronously, wherever the task happens to be)
+INTERRUPT_EXCEPTIONS = (JobInterrupted, SoftTimeLimitExceeded)
+
+TIME_LIMIT_EXCEEDED = 'time_limit_exceeded'
+MEMORY_LIMIT_EXCEEDED = 'memory_limit_exceeded'
+
+
+def cancel_key(job_id: str) -> str:
+    """Redis key of a job's cancellation flag."""
+    return f"job:{job_id}:cancel"
+
+
+async def request_cancel(job_id: str):
+    """
+    Set a job's cancellation flag (API side).
+
+    Args:
+        job_id: Job UUID
+    """
+    await get_async_redis().set(cancel_key(str(job_id)), '1', ex=CANCEL_FLAG_TTL)
+    logger.info(f"Cancellation requested for job {job_id}")
+
+
+class CancellationToken:
+    """
+    Poll a job's cancellation flag (worker side).
+
+    check() is cheap enough to call per page/block/question: Redis is
+    read at most once per CANCEL_CHECK_INTERVAL_MS, which bounds how long
+    a cancelled job keeps running. Safe to call from several threads.
+    """
+
+    def __init__(self, job_id: str, check_interval_ms: Optional[int] = None):
+        """
+        Initialize token.
+
+        Args:
+            job_id: Job UUID
+            check_interval_ms: Minimum time between Redis reads (CANCEL_CHECK_INTERVAL_MS if not provided)
+        """
+        self.job_id = str(job_id)
+        self.check_interval = (
+            check_interval_ms if check_interval_ms is not None else settings.CANCEL_CHECK_INTERVAL_MS
+        ) / 1000
+
+        self.cancelled = False
+        self._last_check = 0.0
+
+    def is_cancelled(self, force: bool = False) -> bool:
+        """
+        Check whether cancellation was requested.
+
+        Args:
+            force: Read Redis regardless of the poll interval
+
+        Returns:
+            True if the job has been cancelled
+        """
+        if self.cancelled:
+            return True
+
+        now = time.monotonic()
+        if not force and now - self._last_check < self.check_interval:
+            return False
+        self._last_check = now
+
+        try:
+            self.cancelled = bool(get_redis().exists(cancel_key(self.job_id)))
+        except Exception as e:
+            # Keep processing if Redis is unavailable
+            logger.warning(f"Error checking cancellation for job {self.job_id}: {e}")
+
+        return self.cancelled
+
+    def check(self):
+        """
+        Raise if cancellation was requested.
+
+        Raises:
+            JobCancelled: If the job has been cancelled
+        """
+        if self.is_cancelled():
+            raise JobCancelled(f"Job {self.job_id} was cancelled")
+
+
+class JobBudget:
+    """
+    Wall time and memory budget of one job.
+
+    Time counts from the job's start (across all stages and retries), so
+    a redelivered stage of an over-budget job fails immediately. Memory
+    is the worker process RSS, checked between pages and questions,
+    before the kernel OOM-kills the worker child.
+    """
+
+    def __init__(self, time_limit: float, memory_limit_mb: float, started_at: Optional[datetime] = None):
+        """
+        Initialize budget.
+
+        Args:
+            time_limit: Wall time budget in seconds
+            memory_limit_mb: RSS budget in MB
+            started_at: Job start (UTC); now if not provided
+        """
+        self.time_limit = time_limit
+        self.memory_limit_mb = memory_limit_mb
+        self.started_at = started_at or datetime.utcnow()
+        self.deadline = self.started_at + timedelta(seconds=time_limit)
+
+    @staticmethod
+    def limits_for_config(config: dict) -> tuple:
+        """
+        Compute budgets for a job configuration.
+
+        Args:
+            config: Job configuration (page and question ranges)
+
+        Returns:
+            (time limit in seconds, memory limit in MB)
+        """
+        pages = config['page_end'] - config['page_start'] + 1
+        questions = config['question_end'] - config['question_start'] + 1
+
+        time_limit = (
+            settings.JOB_TIME_BASE_SECONDS
+            + pages * settings.JOB_TIME_PER_PAGE_SECONDS
+            + questions * settings.JOB_TIME_PER_QUESTION_SECONDS
+        )
+        memory_limit = min(
+            settings.JOB_MEMORY_BASE_MB
+            + pages * settings.JOB_MEMORY_PER_PAGE_MB
+            + questions * settings.JOB_MEMORY_PER_QUESTION_MB,
+            settings.JOB_MEMORY_MAX_MB
+        )
+        return time_limit, memory_limit
+
+    @classmethod
+    def for_job(cls, config: dict, started_at: Optional[datetime] = None) -> 'JobBudget':
+        """
+        Create budget for a job.
+
+        Args:
+            config: Job configuration
+            started_at: Job start (UTC)
+
+        Returns:
+            JobBudget
+        """
+        time_limit, memory_limit = cls.limits_for_config(config)
+        return cls(time_limit, memory_limit, started_at)
+
+    def check(self):
+        """
+        Raise if the job is over budget.
+
+        Raises:
+            BudgetExceeded: Wall time or RSS over budget
+        """
+        if datetime.utcnow() > self.deadline:
+            raise BudgetExceeded(
+                TIME_LIMIT_EXCEEDED,
+                f"Job exceeded its time budget of {self.time_limit:.0f}s",
+                {'limit_seconds': round(self.time_limit, 1)}
+            )
+
+        rss_mb = current_rss_mb()
+        if rss_mb > self.memory_limit_mb:
+            raise BudgetExceeded(
+                MEMORY_LIMIT_EXCEEDED,
+                f"Job exceeded its memory budget of {self.memory_limit_mb:.0f}MB",
+                {'limit_mb': round(self.memory_limit_mb, 1), 'rss_mb': round(rss_mb, 1)}
+            )
+
+
+def current_rss_mb() -> float:
+    """
+    Get current resident set size of this process.
+
+    Returns:
+        RSS in MB (peak RSS where /proc is unavailable)
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        # ru_maxrss is in bytes on macOS, KB elsewhere
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def failure_details(error: Exception) -> dict:
+    """
+    Get Job.error_details for a processing failure.
+
+    Args:
+        error: Exception that stopped the job
+
+    Returns:
+        {code, error_type, ...details}
+    """
+    if isinstance(error, BudgetExceeded):
+        return {'code': error.code, 'error_type': type(error).__name__, **error.details}
+    if isinstance(error, SoftTimeLimitExceeded):
+        return {'code': TIME_LIMIT_EXCEEDED, 'error_type': type(error).__name__, 'source': 'soft_time_limit'}
+    return {'code': 'processing_error', 'error_type': type(error).__name__}
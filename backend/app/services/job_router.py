@@ -0,0 +1,131 @@
+"""
+Job Router Service.
+
+Estimates job cost at creation and picks a processing lane, so small
+jobs do not wait behind large ones:
+
+- fast: whole pipeline on the processing.fast queue
+- bulk: per-stage queues (processing.extract, .parse, .generate)
+
+Also estimates a pending job's queue position and wait time.
+"""
+from typing import Optional, Tuple
+from sqlalchemy import select, func, case
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.models.job import Job
+import logging
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ('pending', 'parsing', 'generating')
+
+
+class JobRouter:
+    """
+    Size-aware lane selection and queue estimates.
+
+    Cost is an estimate of processing time in seconds:
+        COST_BASE_SECONDS
+        + pages * COST_PER_PAGE_SECONDS
+        + questions * COST_PER_QUESTION_SECONDS
+    """
+
+    FAST = 'fast'
+    BULK = 'bulk'
+    FAST_QUEUE = 'processing.fast'
+
+    def estimate_cost(self, config: dict) -> float:
+        """
+        Estimate processing time of a job.
+
+        Args:
+            config: Job configuration (page and question ranges)
+
+        Returns:
+            Estimated cost in seconds
+        """
+        pages = config['page_end'] - config['page_start'] + 1
+        questions = config['question_end'] - config['question_start'] + 1
+
+        return round(
+            settings.COST_BASE_SECONDS
+            + pages * settings.COST_PER_PAGE_SECONDS
+            + questions * settings.COST_PER_QUESTION_SECONDS,
+            2
+        )
+
+    def choose_lane(self, cost: float) -> str:
+        """
+        Pick lane for a job.
+
+        Args:
+            cost: Estimated cost in seconds
+
+        Returns:
+            'fast' or 'bulk'
+        """
+        return self.FAST if cost <= settings.FAST_LANE_MAX_COST else self.BULK
+
+    def queue_options(self, lane: Optional[str]) -> dict:
+        """
+        Get Celery routing options for a lane.
+
+        Args:
+            lane: Lane name
+
+        Returns:
+            Options for Signature.set() (empty: default per-stage routes)
+        """
+        if lane == self.FAST:
+            return {'queue': self.FAST_QUEUE}
+        return {}
+
+    def lane_concurrency(self, lane: Optional[str]) -> int:
+        """Worker processes consuming a lane."""
+        if lane == self.FAST:
+            return max(settings.FAST_LANE_CONCURRENCY, 1)
+        return max(settings.BULK_LANE_CONCURRENCY, 1)
+
+    async def queue_stats(self, db: AsyncSession, job: Job) -> Tuple[Optional[int], Optional[float]]:
+        """
+        Estimate queue position and wait time of a job.
+
+        Jobs ahead are active jobs of the same lane created earlier
+        (followers run no pipeline and are not counted); their remaining
+        cost is spread over the lane's concurrency.
+
+        Args:
+            db: Database session
+            job: Job
+
+        Returns:
+            (jobs ahead, estimated seconds until processing starts);
+            (None, None) if the job is not waiting to run
+        """
+        if job.status != 'pending' or not job.lane:
+            return None, None
+
+        remaining = Job.estimated_cost * (100 - func.coalesce(Job.progress, 0)) / 100.0
+
+        result = await db.execute(
+            select(
+                func.count(case((Job.status == 'pending', 1))),
+                func.coalesce(func.sum(remaining), 0.0)
+            ).where(
+                Job.lane == job.lane,
+                Job.status.in_(ACTIVE_STATUSES),
+                Job.leader_id.is_(None),
+                Job.created_at < job.created_at
+            )
+        )
+        position, remaining_cost = result.one()
+
+        concurrency = self.lane_concurrency(job.lane)
+        wait = float(remaining_cost) / concurrency
+
+        return position, round(wait, 1)
+
+
+# Global instance
+job_router = JobRouter()
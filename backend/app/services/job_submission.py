@@ -0,0 +1,184 @@
+"""
+Job Submission Service.
+
+Builds Job rows for new submissions (single jobs and batches alike):
+result cache lookup, size-aware routing and single-flight leader
+selection. Endpoints add the rows, commit, then call confirm_job() to
+learn whether each job still needs its pipeline queued.
+"""
+from typing import Optional, Tuple
+from datetime import datetime
+from uuid import UUID
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.job import Job
+from app.services.result_cache import result_cache
+from app.services.job_router import job_router, ACTIVE_STATUSES
+from app.services.single_flight import single_flight
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def prepare_job(
+    db: AsyncSession,
+    job_id: UUID,
+    pdf_filename: str,
+    pdf_path: str,
+    config: dict,
+    **fields
+) -> Tuple[Job, Optional[Job]]:
+    """
+    Build (not add or commit) the Job row for a new submission.
+
+    The job is completed immediately on a result cache hit, and becomes a
+    follower of an identical pending/running job if there is one.
+
+    Args:
+        db: Database session
+        job_id: New job UUID
+        pdf_filename: Original upload filename
+        pdf_path: Saved upload path
+        config: Processing configuration
+        **fields: Extra Job columns (e.g. batch_id, batch_index)
+
+    Returns:
+        (job, leader); leader is None unless the job follows another job
+    """
+    # Look up identical previous result
+    input_hash = await result_cache.compute_key(pdf_path, config)
+    cached = result_cache.lookup(input_hash)
+
+    # Route by estimated size (small jobs skip the bulk queues)
+    estimated_cost = job_router.estimate_cost(config)
+    lane = job_router.choose_lane(estimated_cost)
+
+    # Identical job already pending or running: follow it instead of queuing
+    leader = None if cached else await _find_leader(db, input_hash, job_id)
+
+    job = Job(
+        id=job_id,
+        pdf_filename=pdf_filename,
+        pdf_path=pdf_path,
+        config=config,
+        input_hash=input_hash,
+        lane=lane,
+        estimated_cost=estimated_cost,
+        status="pending",
+        progress=0,
+        **fields
+    )
+
+    if cached:
+        # Complete immediately from cache
+        now = datetime.utcnow()
+        job.output_path = result_cache.link_output(cached, job_id)
+        job.output_filename = cached['output_filename']
+        job.total_questions = cached['total_questions']
+        job.diagrams_detected = cached['diagrams_detected']
+        job.status = "completed"
+        job.progress = 100
+        job.current_step = "Complete! (cached result)"
+        job.started_at = now
+        job.completed_at = now
+    elif leader:
+        job.leader_id = leader.id
+        job.status = leader.status
+        job.progress = leader.progress
+        job.current_step = leader.current_step
+
+    return job, leader
+
+
+async def confirm_job(db: AsyncSession, job: Job, leader: Optional[Job]) -> bool:
+    """
+    Finish submission of a committed job.
+
+    Args:
+        db: Database session
+        job: Job built by prepare_job() and committed
+        leader: Leader returned by prepare_job()
+
+    Returns:
+        True if the job's pipeline must be queued
+    """
+    if job.status == 'completed':
+        logger.info(f"Served job {job.id} from result cache")
+        return False
+
+    if leader:
+        await single_flight.add_follower(leader.id, job.id)
+        if await _confirm_leader(db, job, leader):
+            logger.info(f"Job {job.id} follows identical job {leader.id}")
+            return False
+
+    return True
+
+
+async def _find_leader(db: AsyncSession, input_hash: str, job_id: UUID) -> Optional[Job]:
+    """
+    Find the identical job a new job should follow (single-flight).
+
+    Args:
+        db: Database session
+        input_hash: New job's input hash
+        job_id: New job UUID
+
+    Returns:
+        Pending or running leader job; None if the new job becomes the
+        leader (no claim, or a stale claim that it takes over)
+    """
+    leader_id = await single_flight.claim(input_hash, job_id)
+    if not leader_id:
+        return None
+
+    result = await db.execute(
+        select(Job).where(Job.id == leader_id)
+    )
+    leader = result.scalar_one_or_none()
+
+    if leader and leader.is_processing and not leader.leader_id:
+        return leader
+
+    # Leader finished, crashed or was never committed
+    await single_flight.take_over(input_hash, job_id)
+    return None
+
+
+async def _confirm_leader(db: AsyncSession, job: Job, leader: Job) -> bool:
+    """
+    Detach a new follower whose leader finished while it was being created.
+
+    The leader hands its result to followers it finds when it finishes; a
+    follower committed after that point is detached and runs its own
+    pipeline.
+
+    Args:
+        db: Database session
+        job: Newly committed follower
+        leader: Its leader
+
+    Returns:
+        True if the job still follows (or was already completed by) the leader
+    """
+    result = await db.execute(
+        select(Job.status).where(Job.id == leader.id)
+    )
+    if result.scalar_one_or_none() in ACTIVE_STATUSES:
+        return True
+
+    result = await db.execute(
+        update(Job)
+        .where(Job.id == job.id, Job.leader_id == leader.id, Job.status.in_(ACTIVE_STATUSES))
+        .values(leader_id=None, status='pending', progress=0, current_step=None)
+    )
+    await db.commit()
+    await db.refresh(job)
+
+    if result.rowcount:
+        await single_flight.remove_follower(leader.id, job.id)
+        await single_flight.take_over(job.input_hash, job.id)
+        return False
+
+    # Leader completed (or failed) this follower in the meantime
+    return True
@@ -4,7 +4,8 @@ PDF Parser Service.
 Extracts text from PDF files using pdfplumber.
 """
 import pdfplumber
-from typing import Optional
+from typing import Optional, Callable, List, Tuple
+from app.services.job_control import INTERRUPT_EXCEPTIONS
 import logging
 
 logger = logging.getLogger(__name__)
@@ -25,7 +26,8 @@ class PDFParser:
     async def extract_text(
         pdf_path: str,
         start_page: int,
-        end_page: int
+        end_page: int,
+        progress_callback: Optional[Callable[[float], None]] = None
     ) -> str:
         """
         Extract text from specified PDF page range.
@@ -34,6 +36,7 @@ class PDFParser:
             pdf_path: Path to PDF file
             start_page: Starting page number (1-indexed)
             end_page: Ending page number (1-indexed)
+            progress_callback: Optional callback for progress updates (0.0-1.0), called per page
 
         Returns:
             Extracted text as string
@@ -43,11 +46,63 @@ class PDFParser:
             ValueError: If page range is invalid
             Exception: For other PDF reading errors
         """
+        pages = await PDFParser.extract_pages(pdf_path, start_page, end_page, progress_callback)
+
+        full_text = PDFParser.join_pages([text for _, text in pages])
+        logger.info(f"Total text extracted: {len(full_text)} characters")
+
+        return full_text
+
+    @staticmethod
+    async def extract_pages(
+        pdf_path: str,
+        start_page: int,
+        end_page: int,
+        progress_callback: Optional[Callable[[float], None]] = None,
+        page_callback: Optional[Callable[[int, str], None]] = None
+    ) -> List[Tuple[int, str]]:
+        """
+        Extract text of each page in specified PDF page range.
+
+        See extract_pages_sync (this runs it on the calling event loop).
+        """
+        return PDFParser.extract_pages_sync(pdf_path, start_page, end_page, progress_callback, page_callback)
+
+    @staticmethod
+    def extract_pages_sync(
+        pdf_path: str,
+        start_page: int,
+        end_page: int,
+        progress_callback: Optional[Callable[[float], None]] = None,
+        page_callback: Optional[Callable[[int, str], None]] = None
+    ) -> List[Tuple[int, str]]:
+        """
+        Extract text of each page in specified PDF page range (blocking).
+
+        Workers call this from the task thread, so Celery's soft time
+        limit interrupts extraction itself.
+
+        Args:
+            pdf_path: Path to PDF file
+            start_page: Starting page number (1-indexed)
+            end_page: Ending page number (1-indexed)
+            progress_callback: Optional callback for progress updates (0.0-1.0), called per page
+            page_callback: Optional callback receiving (page number, text) as each page is extracted
+
+        Returns:
+            List of (page number, text) in page order; text is '' for pages without text
+
+        Raises:
+            FileNotFoundError: If PDF file doesn't exist
+            ValueError: If page range is invalid
+            JobInterrupted: If a callback stops the job (cancelled, over budget)
+            Exception: For other PDF reading errors
+        """
         try:
             logger.info(f"Opening PDF: {pdf_path}")
             logger.info(f"Extracting pages {start_page} to {end_page}")
 
-            text_content = []
+            pages = []
 
             with pdfplumber.open(pdf_path) as pdf:
                 total_pages = len(pdf.pages)
@@ -62,22 +117,29 @@ class PDFParser:
                     raise ValueError(f"start_page ({start_page}) must be <= end_page ({end_page})")
 
                 # Extract text from specified pages
-                for page_num in range(start_page - 1, end_page):
+                total = end_page - start_page + 1
+                for idx, page_num in enumerate(range(start_page - 1, end_page)):
                     page = pdf.pages[page_num]
                     text = page.extract_text()
 
                     if text:
-                        text_content.append(text)
                         logger.debug(f"Extracted {len(text)} characters from page {page_num + 1}")
                     else:
                         logger.warning(f"No text found on page {page_num + 1}")
 
-            # Join all page text with double newlines
-            full_text = "\n\n".join(text_content)
-            logger.info(f"Total text extracted: {len(full_text)} characters")
+                    pages.append((page_num + 1, text or ''))
+
+                    if page_callback:
+                        page_callback(page_num + 1, text or '')
+
+                    # Progress callback
+                    if progress_callback:
+                        progress_callback((idx + 1) / total)
 
-            return full_text
+            return pages
 
+        except INTERRUPT_EXCEPTIONS:
+            raise
         except FileNotFoundError:
             logger.error(f"PDF file not found: {pdf_path}")
             raise
@@ -88,6 +150,19 @@ class PDFParser:
             logger.error(f"Error extracting PDF text: {e}", exc_info=True)
             raise Exception(f"Failed to extract PDF text: {str(e)}")
 
+    @staticmethod
+    def join_pages(page_texts: List[str]) -> str:
+        """
+        Join per-page text into the document text.
+
+        Args:
+            page_texts: Page text in page order
+
+        Returns:
+            Text of non-empty pages joined with double newlines
+        """
+        return "\n\n".join(text for text in page_texts if text)
+
     @staticmethod
     async def get_pdf_info(pdf_path: str) -> dict:
         """
@@ -0,0 +1,131 @@
+"""
+Progress Reporter Service.
+
+Maps per-stage progress onto the overall 0-100 job progress and throttles
+updates, so fine-grained hooks (per page, block, question) do not turn
+into one database write and one emit each.
+"""
+import time
+from typing import Callable, Optional
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressReporter:
+    """
+    Throttled, stage-weighted progress reporting for one job.
+
+    Stages (overall progress range, step label):
+    - extract:  5-20%   Extracting text from PDF
+    - parse:    25-70%  Parsing questions
+    - generate: 75-95%  Generating Word document
+
+    Updates are passed to `on_update(progress, step)` at most once per
+    PROGRESS_MIN_INTERVAL_MS, unless progress moved by PROGRESS_MIN_DELTA
+    or more, or the update is forced (stage boundaries, completion).
+
+    If `interrupt_check` is given, stage callbacks call it on every
+    invocation (per page/block/question), so it can stop the job by
+    raising (e.g. CancellationToken.check).
+    """
+
+    STAGES = {
+        'extract': (5, 20, "Extracting text from PDF"),
+        'parse': (25, 70, "Parsing questions"),
+        'generate': (75, 95, "Generating Word document"),
+    }
+
+    def __init__(
+        self,
+        on_update: Callable[[int, str], None],
+        min_interval_ms: Optional[int] = None,
+        min_delta: Optional[int] = None,
+        interrupt_check: Optional[Callable[[], None]] = None
+    ):
+        """
+        Initialize reporter.
+
+        Args:
+            on_update: Callback persisting/emitting an update (progress 0-100, step)
+            min_interval_ms: Minimum time between updates (PROGRESS_MIN_INTERVAL_MS if not provided)
+            min_delta: Progress change that bypasses the interval (PROGRESS_MIN_DELTA if not provided)
+            interrupt_check: Optional callable raising to stop the job, run by stage callbacks
+        """
+        self.on_update = on_update
+        self.min_interval = (min_interval_ms if min_interval_ms is not None else settings.PROGRESS_MIN_INTERVAL_MS) / 1000
+        self.min_delta = min_delta if min_delta is not None else settings.PROGRESS_MIN_DELTA
+        self.interrupt_check = interrupt_check
+
+        self._last_progress: Optional[int] = None
+        self._last_step: Optional[str] = None
+        self._last_time = 0.0
+        self._pending: Optional[tuple] = None
+
+    def update(self, progress: int, step: str, force: bool = False):
+        """
+        Report overall progress.
+
+        Args:
+            progress: Overall progress (0-100)
+            step: Human-readable current step
+            force: Emit regardless of throttling
+        """
+        if (progress, step) == (self._last_progress, self._last_step):
+            return
+
+        now = time.monotonic()
+        due = (
+            force
+            or self._last_progress is None
+            or abs(progress - self._last_progress) >= self.min_delta
+            or now - self._last_time >= self.min_interval
+        )
+
+        if not due:
+            # Keep latest state for flush()
+            self._pending = (progress, step)
+            return
+
+        self._emit(progress, step, now)
+
+    def stage_callback(self, stage: str) -> Callable[[float], None]:
+        """
+        Get a progress callback for a pipeline stage.
+
+        Args:
+            stage: Stage name (see STAGES)
+
+        Returns:
+            Callback taking stage progress (0.0-1.0)
+        """
+        start, end, label = self.STAGES[stage]
+
+        def callback(fraction: float):
+            if self.interrupt_check:
+                self.interrupt_check()
+
+            fraction = min(max(fraction, 0.0), 1.0)
+            progress = start + int(fraction * (end - start))
+            self.update(progress, f"{label}... ({int(fraction * 100)}%)")
+
+        return callback
+
+    def flush(self):
+        """Emit the latest throttled update, if any."""
+        if self._pending is not None:
+            progress, step = self._pending
+            self._emit(progress, step, time.monotonic())
+
+    def _emit(self, progress: int, step: str, now: float):
+        """Pass update to callback and record it."""
+        self._pending = None
+        self._last_progress = progress
+        self._last_step = step
+        self._last_time = now
+
+        try:
+            self.on_update(progress, step)
+        except Exception as e:
+            logger.error(f"Error reporting progress: {e}")
@@ -5,8 +5,9 @@ Parses questions from extracted PDF text using regex patterns.
 This is the most critical and complex component.
 """
 import re
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Callable
 from dataclasses import dataclass, asdict
+from app.services.job_control import INTERRUPT_EXCEPTIONS
 import logging
 
 logger = logging.getLogger(__name__)
@@ -31,6 +32,9 @@ class QuestionParser:
     Uses multi-stage regex-based parsing with confidence scoring.
     """
 
+    # Bump whenever parsing output changes (invalidates cached results)
+    VERSION = "1"
+
     # Regex patterns (configurable for different PDF formats)
     PATTERNS = {
         # Question number: "Q1.", "1.", "Q.1", "101)", "Q 101."
@@ -49,22 +53,52 @@ class QuestionParser:
         'diagram': r'(?:diagram|figure|image|graph|chart|table|see\s+(?:above|below|figure)|shown\s+in|refer\s+to)',
     }
 
+    # Compiled PATTERNS, shared by all instances (built once per process)
+    _compiled_patterns: Optional[Dict[str, re.Pattern]] = None
+
     def __init__(self):
         """Initialize parser with compiled regex patterns."""
-        self.compiled_patterns = {
-            key: re.compile(pattern, re.IGNORECASE | re.MULTILINE)
-            for key, pattern in self.PATTERNS.items()
-        }
+        self.compiled_patterns = self.get_compiled_patterns()
+
+    @classmethod
+    def get_compiled_patterns(cls) -> Dict[str, re.Pattern]:
+        """
+        Get compiled PATTERNS, compiling them on first use.
+
+        Returns:
+            Dictionary of pattern name to compiled regex
+        """
+        if cls._compiled_patterns is None:
+            cls._compiled_patterns = {
+                key: re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+                for key, pattern in cls.PATTERNS.items()
+            }
+        return cls._compiled_patterns
 
     async def parse_questions(
         self,
         text: str,
         start_q: int,
-        end_q: int
+        end_q: int,
+        progress_callback: Optional[Callable[[float], None]] = None
     ) -> List[ParsedQuestion]:
         """
         Parse multiple questions from text.
 
+        See parse_questions_sync (this runs it on the calling event loop).
+        """
+        return self.parse_questions_sync(text, start_q, end_q, progress_callback)
+
+    def parse_questions_sync(
+        self,
+        text: str,
+        start_q: int,
+        end_q: int,
+        progress_callback: Optional[Callable[[float], None]] = None
+    ) -> List[ParsedQuestion]:
+        """
+        Parse multiple questions from text (blocking).
+
         Strategy:
         1. Split text into question blocks by number markers
         2. Parse each block independently
@@ -75,6 +109,7 @@ class QuestionParser:
             text: Extracted PDF text
             start_q: First question number to extract
             end_q: Last question number to extract
+            progress_callback: Optional callback for progress updates (0.0-1.0), called per block
 
         Returns:
             List of ParsedQuestion objects
@@ -93,7 +128,7 @@ class QuestionParser:
 
         # Stage 2: Parse each block
         questions = []
-        for block in question_blocks:
+        for idx, block in enumerate(question_blocks):
             try:
                 parsed = self._parse_single_question(block)
                 if parsed:
@@ -101,9 +136,14 @@ class QuestionParser:
                     logger.debug(f"Parsed Q{parsed.number} (confidence: {parsed.confidence:.2f})")
                 else:
                     logger.warning(f"Failed to parse question {block['number']}")
+            except INTERRUPT_EXCEPTIONS:
+                raise
             except Exception as e:
                 logger.error(f"Error parsing question {block.get('number', '?')}: {e}")
-                continue
+
+            # Progress callback
+            if progress_callback:
+                progress_callback((idx + 1) / len(question_blocks))
 
         # Stage 3: Validate sequence
         self._validate_question_sequence(questions, start_q, end_q)
@@ -0,0 +1,237 @@
+"""
+Result Cache Service.
+
+Caches complete generated documents keyed by PDF content, normalized
+configuration and parser/generator versions.
+"""
+import os
+import json
+import shutil
+import hashlib
+import aiofiles
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import UUID
+from typing import Optional
+from app.core.config import settings
+from app.services.question_parser import QuestionParser
+from app.services.document_generator import DocumentGenerator
+from app.services.file_manager import file_manager
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ResultCache:
+    """
+    Whole-output cache for processing jobs.
+
+    Storage structure:
+    /data/
+      cache/
+        results/
+          {key}/
+            meta.json
+            {output_filename}
+
+    Cached outputs are hard-linked into job output directories, so deleting
+    a job (24-hour cleanup) never removes the cached copy. Entries have their
+    own retention (RESULT_CACHE_RETENTION_HOURS) and size limit
+    (RESULT_CACHE_MAX_MB), enforced by the cleanup task.
+    """
+
+    META_FILENAME = 'meta.json'
+
+    def __init__(self):
+        """Initialize cache directory."""
+        self.cache_path = Path(settings.STORAGE_PATH) / 'cache' / 'results'
+        self.enabled = settings.RESULT_CACHE_ENABLED
+
+        if self.enabled:
+            self.cache_path.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def normalize_config(config: dict) -> str:
+        """
+        Serialize config deterministically (sorted keys, unset values dropped).
+
+        Args:
+            config: Processing configuration
+
+        Returns:
+            Canonical JSON string
+        """
+        normalized = {
+            key: value.strip() if isinstance(value, str) else value
+            for key, value in config.items()
+            if value is not None
+        }
+        return json.dumps(normalized, sort_keys=True, separators=(',', ':'))
+
+    async def compute_key(self, pdf_path: str, config: dict) -> str:
+        """
+        Compute cache key for a job.
+
+        Args:
+            pdf_path: Path to uploaded PDF
+            config: Processing configuration
+
+        Returns:
+            Hex digest of PDF bytes, normalized config and code versions
+        """
+        digest = hashlib.sha256()
+        chunk_size = 1024 * 1024  # 1MB chunks
+
+        async with aiofiles.open(pdf_path, 'rb') as f:
+            while chunk := await f.read(chunk_size):
+                digest.update(chunk)
+
+        digest.update(b'\0')
+        digest.update(self.normalize_config(config).encode('utf-8'))
+        digest.update(f"\0parser={QuestionParser.VERSION}".encode('utf-8'))
+        digest.update(f"\0generator={DocumentGenerator.VERSION}".encode('utf-8'))
+
+        return digest.hexdigest()
+
+    def lookup(self, key: str) -> Optional[dict]:
+        """
+        Find cached result.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Entry metadata with 'path' to the cached document, or None on miss
+        """
+        if not self.enabled or not key:
+            return None
+
+        entry_dir = self.cache_path / key
+        try:
+            with open(entry_dir / self.META_FILENAME, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        output_file = entry_dir / meta['output_filename']
+        if not output_file.exists():
+            return None
+
+        # Mark as recently used
+        try:
+            os.utime(entry_dir)
+        except OSError:
+            pass
+
+        meta['path'] = str(output_file)
+        return meta
+
+    def link_output(self, entry: dict, job_id: UUID) -> str:
+        """
+        Hard-link cached document into a job's output directory.
+
+        Args:
+            entry: Entry returned by lookup()
+            job_id: Job UUID
+
+        Returns:
+            Path to the job's output file
+        """
+        output_path = file_manager.get_output_path(job_id, entry['output_filename'])
+        self._link(entry['path'], output_path)
+        return output_path
+
+    def store(self, key: str, output_path: str, metadata: dict):
+        """
+        Store a generated document in the cache.
+
+        Args:
+            key: Cache key
+            output_path: Path to generated document
+            metadata: {output_filename, total_questions, diagrams_detected}
+        """
+        if not self.enabled or not key:
+            return
+
+        entry_dir = self.cache_path / key
+        tmp_dir = self.cache_path / f".{key}.{os.getpid()}.tmp"
+
+        try:
+            if entry_dir.exists():
+                return
+
+            tmp_dir.mkdir(parents=True, exist_ok=True)
+            self._link(output_path, str(tmp_dir / metadata['output_filename']))
+
+            meta = dict(metadata, created_at=datetime.utcnow().isoformat())
+            with open(tmp_dir / self.META_FILENAME, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+
+            # Publish entry atomically
+            os.rename(tmp_dir, entry_dir)
+            logger.info(f"Cached result {key}")
+
+        except OSError as e:
+            logger.warning(f"Error caching result {key}: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def cleanup(self) -> dict:
+        """
+        Apply retention and size limits.
+
+        Removes entries unused for RESULT_CACHE_RETENTION_HOURS, then the
+        least recently used entries until the cache fits RESULT_CACHE_MAX_MB.
+
+        Returns:
+            Dictionary with cleanup stats
+        """
+        if not self.enabled:
+            return {'removed': 0, 'remaining': 0, 'size_mb': 0}
+
+        cutoff = (datetime.utcnow() - timedelta(hours=settings.RESULT_CACHE_RETENTION_HOURS)).timestamp()
+        max_bytes = settings.RESULT_CACHE_MAX_MB * 1024 * 1024
+
+        entries = []
+        removed = 0
+
+        for entry_dir in self.cache_path.iterdir():
+            if not entry_dir.is_dir():
+                continue
+
+            try:
+                last_used = entry_dir.stat().st_mtime
+            except OSError:
+                continue
+
+            # Expired entries and leftovers from interrupted writes
+            if last_used < cutoff or entry_dir.name.startswith('.'):
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                removed += 1
+                continue
+
+            size = sum(f.stat().st_size for f in entry_dir.iterdir() if f.is_file())
+            entries.append((last_used, size, entry_dir))
+
+        entries.sort(key=lambda e: e[0])
+        total = sum(size for _, size, _ in entries)
+
+        while entries and total > max_bytes:
+            _, size, entry_dir = entries.pop(0)
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
+            removed += 1
+
+        return {
+            'removed': removed,
+            'remaining': len(entries),
+            'size_mb': total / (1024 * 1024),
+        }
+
+    @staticmethod
+    def _link(src: str, dst: str):
+        """Hard-link src to dst (see FileManager.link_file)."""
+        file_manager.link_file(src, dst)
+
+
+# Global instance
+result_cache = ResultCache()
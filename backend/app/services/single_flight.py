@@ -0,0 +1,198 @@
+"""
+Single-Flight Service.
+
+Deduplicates identical concurrent jobs (same PDF bytes and normalized
+config, i.e. the same Job.input_hash). The first job claims the hash and
+runs the pipeline as the leader; identical jobs created while it is
+pending or running become followers (Job.leader_id) and queue nothing:
+
+- EventRelay fans the leader's progress/complete/error events out to
+  each follower's room
+- on completion the leader links its outputs into every follower
+- on failure followers fail with the leader's error
+- on cancellation the oldest follower is promoted to leader and queued
+
+Redis keys:
+    singleflight:{input_hash}  -> leader job ID (SET NX, expires)
+    job:{leader_id}:followers  -> set of follower job IDs
+    job:{follower_id}:leader   -> leader job ID (follower state lookups)
+"""
+from typing import List, Optional
+from app.core.config import settings
+from app.core.redis import get_redis, get_async_redis
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Delete the leader claim only if it still belongs to this leader
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlight:
+    """
+    Leader claims and follower sets for identical jobs.
+
+    Claims are advisory: callers still check the leader's status in the
+    database, so a stale claim (leader crashed, key not yet expired) only
+    costs one extra lookup before being taken over.
+    """
+
+    def __init__(self):
+        """Initialize single-flight coordinator."""
+        self.enabled = settings.SINGLE_FLIGHT_ENABLED
+        self.ttl = settings.SINGLE_FLIGHT_TTL_SECONDS
+
+    @staticmethod
+    def leader_key(input_hash: str) -> str:
+        """Redis key of the leader claim for an input hash."""
+        return f"singleflight:{input_hash}"
+
+    @staticmethod
+    def followers_key(leader_id: str) -> str:
+        """Redis key of a leader's follower set."""
+        return f"job:{leader_id}:followers"
+
+    @staticmethod
+    def follows_key(follower_id: str) -> str:
+        """Redis key of a follower's leader."""
+        return f"job:{follower_id}:leader"
+
+    async def claim(self, input_hash: str, job_id: str) -> Optional[str]:
+        """
+        Claim an input hash for a new job (API side).
+
+        Args:
+            input_hash: Job.input_hash
+            job_id: New job UUID
+
+        Returns:
+            Current leader's job ID if another job holds the claim, else None
+            (the new job is the leader)
+        """
+        if not self.enabled or not input_hash:
+            return None
+
+        redis = get_async_redis()
+        key = self.leader_key(input_hash)
+
+        if await redis.set(key, str(job_id), nx=True, ex=self.ttl):
+            return None
+        return await redis.get(key)
+
+    async def take_over(self, input_hash: str, job_id: str):
+        """
+        Replace a stale claim with a new leader (API side).
+
+        Args:
+            input_hash: Job.input_hash
+            job_id: New leader's job UUID
+        """
+        await get_async_redis().set(self.leader_key(input_hash), str(job_id), ex=self.ttl)
+
+    async def add_follower(self, leader_id: str, follower_id: str):
+        """
+        Attach a follower to a leader (API side).
+
+        Args:
+            leader_id: Leader job UUID
+            follower_id: Follower job UUID
+        """
+        key = self.followers_key(str(leader_id))
+        pipe = get_async_redis().pipeline(transaction=False)
+        pipe.sadd(key, str(follower_id))
+        pipe.expire(key, self.ttl)
+        pipe.set(self.follows_key(str(follower_id)), str(leader_id), ex=self.ttl)
+        await pipe.execute()
+
+    async def remove_follower(self, leader_id: str, follower_id: str):
+        """
+        Detach a follower, e.g. when it is cancelled (API side).
+
+        Args:
+            leader_id: Leader job UUID
+            follower_id: Follower job UUID
+        """
+        pipe = get_async_redis().pipeline(transaction=False)
+        pipe.srem(self.followers_key(str(leader_id)), str(follower_id))
+        pipe.delete(self.follows_key(str(follower_id)))
+        await pipe.execute()
+
+    async def leader_of(self, job_id: str) -> Optional[str]:
+        """
+        Get the leader a job follows (API side).
+
+        Args:
+            job_id: Job UUID
+
+        Returns:
+            Leader job ID, or None if the job is not a follower
+        """
+        if not self.enabled:
+            return None
+        return await get_async_redis().get(self.follows_key(str(job_id)))
+
+    async def get_followers_many(self, job_ids: List[str]) -> dict:
+        """
+        Get follower sets of several jobs in one round-trip (EventRelay).
+
+        Args:
+            job_ids: Job UUIDs
+
+        Returns:
+            {job_id: [follower job IDs]} for jobs that have followers
+        """
+        if not self.enabled or not job_ids:
+            return {}
+
+        pipe = get_async_redis().pipeline(transaction=False)
+        for job_id in job_ids:
+            pipe.smembers(self.followers_key(job_id))
+        results = await pipe.execute()
+
+        return {job_id: list(members) for job_id, members in zip(job_ids, results) if members}
+
+    def promote(self, input_hash: Optional[str], old_leader_id: str, new_leader_id: str):
+        """
+        Hand a cancelled leader's claim and followers to a follower (worker side).
+
+        Args:
+            input_hash: Job.input_hash
+            old_leader_id: Cancelled leader job UUID
+            new_leader_id: Promoted follower job UUID
+        """
+        old_key, new_key = self.followers_key(old_leader_id), self.followers_key(new_leader_id)
+        redis = get_redis()
+        followers = redis.smembers(old_key) - {new_leader_id}
+
+        pipe = redis.pipeline()
+        if input_hash:
+            pipe.set(self.leader_key(input_hash), new_leader_id, ex=self.ttl)
+        pipe.delete(self.follows_key(new_leader_id))
+        for follower_id in followers:
+            pipe.sadd(new_key, follower_id)
+            pipe.set(self.follows_key(follower_id), new_leader_id, ex=self.ttl)
+        pipe.expire(new_key, self.ttl)
+        pipe.delete(old_key)
+        pipe.execute()
+
+    def release(self, input_hash: Optional[str], leader_id: str):
+        """
+        Drop a finished leader's claim and follower set (worker side).
+
+        Args:
+            input_hash: Job.input_hash
+            leader_id: Leader job UUID
+        """
+        redis = get_redis()
+        if input_hash:
+            redis.eval(_RELEASE_SCRIPT, 1, self.leader_key(input_hash), leader_id)
+        redis.delete(self.followers_key(leader_id))
+
+
+# Global instance
+single_flight = SingleFlight()
@@ -2,16 +2,53 @@
 WebSocket Manager using Socket.IO.
 
 Manages real-time connections and broadcasts progress updates to clients.
+
+Progress is coalesced per room: send_progress() only records the latest
+state, and a flush loop emits at most WS_FLUSH_HZ updates per second per
+room. Each progress emit carries only the fields that changed since the
+room's previous emit, plus a per-room sequence number ('seq', +1 per
+emit including terminal events) so clients can detect gaps and resync
+(GET /jobs/{id}). New subscribers first get the room's full state:
+from memory if this process emitted to the room, else from the job
+state the workers keep in Redis (see event_bus), including a terminal
+event that was emitted before the client subscribed.
+
+Room membership lives in the Socket.IO manager (connection counts are
+read from it); the manager only keeps a reverse index sid -> job IDs so
+connect/disconnect are O(1), and disconnects sockets idle for
+WS_IDLE_TIMEOUT_SECONDS (no client event and no emit to any of their
+rooms) once all their jobs have finished. A client waiting on a queued
+job gets no emits for a long time, and Socket.IO clients do not
+reconnect after a server-side disconnect; dead connections are dropped
+by Engine.IO's own ping timeout.
+
+With SOCKETIO_REDIS_URL set, the server uses a Redis message queue so
+emits from any API replica reach clients connected to the others
+(replicas must sit behind sticky sessions, since clients may use
+long-polling). Every process runs its own EventRelay,
+so relayed events (local=True; the API publishes its own job events to
+the relay too) are emitted to the process's own clients only; other room
+emits go through the queue. Replies to a client's own sid never do.
 """
+import time
+import asyncio
 import socketio
-from typing import Dict, Set
+from typing import Dict, Optional, Set
+from app.core.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Message queue shared by all API processes (rooms span processes)
+client_manager = (
+    socketio.AsyncRedisManager(settings.SOCKETIO_REDIS_URL, channel=settings.SOCKETIO_CHANNEL)
+    if settings.SOCKETIO_REDIS_URL else None
+)
+
 # Create Socket.IO async server
 sio = socketio.AsyncServer(
     async_mode='asgi',
+    client_manager=client_manager,
     cors_allowed_origins='*',  # TODO: Configure for production
     logger=logger,
     engineio_logger=False
@@ -25,13 +62,101 @@ class WebSocketManager:
     Handles:
     - Client connections/disconnections
     - Room-based broadcasting (one room per job)
-    - Progress updates
-    - Completion/error notifications
+    - Progress updates (coalesced, delta-encoded, sequenced)
+    - Completion/error/cancellation notifications
     """
 
-    def __init__(self):
-        """Initialize WebSocket manager."""
-        self.active_connections: Dict[str, Set[str]] = {}  # job_id -> set of session_ids
+    # Forget room state not updated for this long (terminal event missed)
+    STATE_IDLE_SECONDS = 3600
+
+    # Max seconds between idle-socket sweeps
+    EVICT_INTERVAL_SECONDS = 60
+
+    def __init__(self, flush_hz: Optional[float] = None, idle_timeout: Optional[float] = None):
+        """
+        Initialize WebSocket manager.
+
+        Args:
+            flush_hz: Max progress emits per second per room (WS_FLUSH_HZ if
+                not provided; 0 emits every update immediately)
+            idle_timeout: Disconnect sockets idle for this many seconds
+                (WS_IDLE_TIMEOUT_SECONDS if not provided; 0 never)
+        """
+        self.rooms_by_sid: Dict[str, Set[str]] = {}  # session_id -> subscribed job_ids
+        self._last_seen: Dict[str, float] = {}  # session_id -> monotonic time of last client event
+        self._emitted_at: Dict[str, float] = {}  # job_id -> monotonic time of last emit
+        self._finished: Dict[str, float] = {}  # job_id -> monotonic time its terminal event was seen
+
+        self.idle_timeout = idle_timeout if idle_timeout is not None else settings.WS_IDLE_TIMEOUT_SECONDS
+        self._evict_task: Optional[asyncio.Task] = None
+
+        flush_hz = flush_hz if flush_hz is not None else settings.WS_FLUSH_HZ
+        self.flush_interval = 1 / flush_hz if flush_hz > 0 else 0
+
+        self._pending: Dict[str, dict] = {}  # job_id -> progress fields not yet emitted
+        self._queued: Set[str] = set()  # job_ids with pending progress from this process (not relayed)
+        self._state: Dict[str, dict] = {}  # job_id -> progress state as last emitted
+        self._seq: Dict[str, int] = {}  # job_id -> last sequence number
+        self._updated_at: Dict[str, float] = {}  # job_id -> monotonic time of last update
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Start the progress flush loop and idle-socket eviction."""
+        if self.flush_interval and self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+        if self.idle_timeout and self._evict_task is None:
+            self._evict_task = asyncio.create_task(self._evict_loop())
+
+    async def stop(self):
+        """Stop the background loops, emitting any pending progress."""
+        for task in (self._flush_task, self._evict_task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._flush_task = self._evict_task = None
+        await self.flush()
+
+    async def flush(self, job_id: Optional[str] = None):
+        """
+        Emit pending progress now.
+
+        Args:
+            job_id: Only this room (all rooms if not provided)
+        """
+        job_ids = [job_id] if job_id is not None else list(self._pending)
+        for room in job_ids:
+            data = self._pending.pop(room, None)
+            local = room not in self._queued
+            self._queued.discard(room)
+            if data:
+                await self._emit_progress(room, data, local)
+
+    def snapshot(self, job_id: str) -> Optional[dict]:
+        """
+        Get a room's full progress state as last emitted.
+
+        Args:
+            job_id: Job UUID
+
+        Returns:
+            {seq, progress, step, ...} or None if nothing was emitted yet
+        """
+        state = self._state.get(job_id)
+        if not state:
+            return None
+        return {'seq': self._seq.get(job_id, 0), **state}
+
+    def touch(self, sid: str):
+        """
+        Record client activity (resets the socket's idle timer).
+
+        Args:
+            sid: Socket.IO session ID
+        """
+        self._last_seen[sid] = time.monotonic()
 
     async def connect(self, sid: str, job_id: str):
         """
@@ -42,54 +167,123 @@ class WebSocketManager:
             job_id: Job UUID to subscribe to
         """
         await sio.enter_room(sid, job_id)
+        self.rooms_by_sid.setdefault(sid, set()).add(job_id)
+        self.touch(sid)
 
-        if job_id not in self.active_connections:
-            self.active_connections[job_id] = set()
-        self.active_connections[job_id].add(sid)
+        logger.debug(f"Client {sid} connected to job {job_id}")
 
-        logger.info(f"Client {sid} connected to job {job_id}")
+    async def unsubscribe(self, sid: str, job_id: str):
+        """
+        Remove client from a job room.
+
+        Args:
+            sid: Socket.IO session ID
+            job_id: Job UUID to unsubscribe from
+        """
+        self.touch(sid)
+        rooms = self.rooms_by_sid.get(sid)
+        if not rooms or job_id not in rooms:
+            return
+
+        rooms.discard(job_id)
+        await sio.leave_room(sid, job_id)
+        logger.debug(f"Client {sid} unsubscribed from job {job_id}")
 
     async def disconnect(self, sid: str):
         """
-        Disconnect client from all rooms.
+        Forget a disconnected client.
+
+        Socket.IO removes the sid from its rooms itself, so this only
+        drops the reverse index entry.
 
         Args:
             sid: Socket.IO session ID
         """
-        # Remove from all job rooms
-        for job_id, sids in list(self.active_connections.items()):
-            if sid in sids:
-                sids.remove(sid)
-                await sio.leave_room(sid, job_id)
-                logger.info(f"Client {sid} disconnected from job {job_id}")
+        rooms = self.rooms_by_sid.pop(sid, None)
+        self._last_seen.pop(sid, None)
+
+        if rooms:
+            logger.debug(f"Client {sid} disconnected from jobs {', '.join(rooms)}")
+
+    async def evict_idle(self) -> int:
+        """
+        Disconnect sockets idle for longer than the idle timeout.
 
-                # Clean up empty rooms
-                if not sids:
-                    del self.active_connections[job_id]
+        A socket is idle if the client sent no event and none of its rooms
+        got an emit within the timeout. Sockets subscribed to a job that
+        has not finished (or whose terminal event this process never saw)
+        are kept, however long the job stays queued.
 
-    async def send_progress(self, job_id: str, data: dict):
+        Returns:
+            Number of sockets disconnected
+        """
+        if not self.idle_timeout:
+            return 0
+
+        cutoff = time.monotonic() - self.idle_timeout
+        idle = [
+            sid for sid, seen in self._last_seen.items()
+            if seen < cutoff and all(
+                job_id in self._finished and self._emitted_at.get(job_id, 0) < cutoff
+                for job_id in self.rooms_by_sid.get(sid, ())
+            )
+        ]
+
+        for sid in idle:
+            # Forget first: the disconnect handler may run later (or never,
+            # if the transport is already gone)
+            await self.disconnect(sid)
+            await sio.disconnect(sid, ignore_queue=True)
+
+        # Emit times of rooms nobody listens to any more
+        for job_id in [j for j, t in self._emitted_at.items() if t < cutoff]:
+            del self._emitted_at[job_id]
+
+        subscribed = set().union(*self.rooms_by_sid.values())
+        for job_id in [j for j, t in self._finished.items() if t < cutoff and j not in subscribed]:
+            del self._finished[job_id]
+
+        if idle:
+            logger.info(f"Evicted {len(idle)} idle WebSocket clients")
+        return len(idle)
+
+    async def send_progress(self, job_id: str, data: dict, local: bool = False):
         """
         Send progress update to all clients subscribed to a job.
 
+        Coalesced: only the latest state per room is kept and emitted by
+        the flush loop (immediately if WS_FLUSH_HZ is 0).
+
         Args:
             job_id: Job UUID
             data: Progress data {progress: int, step: str, timestamp: str}
+            local: Emit to this process's clients only (relayed events)
         """
-        await sio.emit('progress', data, room=job_id)
-        logger.debug(f"Sent progress to job {job_id}: {data.get('progress')}%")
-
-    async def send_complete(self, job_id: str, data: dict):
+        if not self.flush_interval:
+            await self._emit_progress(job_id, data, local)
+            return
+
+        # Keep only the latest state; the flush loop emits it
+        self._pending.setdefault(job_id, {}).update(data)
+        if not local:
+            self._queued.add(job_id)
+        self._updated_at[job_id] = time.monotonic()
+        if self._flush_task is None:
+            await self.start()
+
+    async def send_complete(self, job_id: str, data: dict, local: bool = False):
         """
         Send completion notification.
 
         Args:
             job_id: Job UUID
             data: Completion data {output_filename, total_questions, diagrams_detected}
+            local: Emit to this process's clients only (relayed events)
         """
-        await sio.emit('complete', data, room=job_id)
+        await self._emit_terminal('complete', job_id, data, local)
         logger.info(f"Sent completion to job {job_id}")
 
-    async def send_error(self, job_id: str, error: str, details: dict = None):
+    async def send_error(self, job_id: str, error: str, details: dict = None, local: bool = False):
         """
         Send error notification.
 
@@ -97,16 +291,117 @@ class WebSocketManager:
             job_id: Job UUID
             error: Error message
             details: Optional error details
+            local: Emit to this process's clients only (relayed events)
         """
-        await sio.emit('error', {
+        await self._emit_terminal('error', job_id, {
             'message': error,
             'details': details or {}
-        }, room=job_id)
+        }, local)
         logger.error(f"Sent error to job {job_id}: {error}")
 
+    async def send_cancelled(self, job_id: str, data: dict, local: bool = False):
+        """
+        Send cancellation notification.
+
+        Args:
+            job_id: Job UUID
+            data: Cancellation data {progress, timestamp}
+            local: Emit to this process's clients only (relayed events)
+        """
+        await self._emit_terminal('cancelled', job_id, data, local)
+        logger.info(f"Sent cancellation to job {job_id}")
+
+    async def _emit_progress(self, job_id: str, data: dict, local: bool = False):
+        """Emit the fields of data that changed since the room's last emit."""
+        state = self._state.setdefault(job_id, {})
+        delta = {key: value for key, value in data.items() if key != 'timestamp' and state.get(key) != value}
+        if not delta:
+            return
+
+        state.update(delta)
+        self._finished.pop(job_id, None)
+        if 'timestamp' in data:
+            delta['timestamp'] = state['timestamp'] = data['timestamp']
+        self._updated_at[job_id] = time.monotonic()
+
+        await sio.emit('progress', {'seq': self._next_seq(job_id), **delta}, room=job_id, ignore_queue=local)
+        self._emitted_at[job_id] = time.monotonic()
+        logger.debug(f"Sent progress to job {job_id}: {delta.get('progress')}%")
+
+    async def _emit_terminal(self, event: str, job_id: str, data: dict, local: bool = False):
+        """Emit a terminal event after any pending progress, then forget the room's state."""
+        await self.flush(job_id)
+        await sio.emit(event, {'seq': self._next_seq(job_id), **data}, room=job_id, ignore_queue=local)
+        self._emitted_at[job_id] = self._finished[job_id] = time.monotonic()
+        self._forget(job_id)
+
+    def _next_seq(self, job_id: str) -> int:
+        """Increment and return a room's sequence number."""
+        self._seq[job_id] = self._seq.get(job_id, 0) + 1
+        return self._seq[job_id]
+
+    def _forget(self, job_id: str):
+        """Drop a room's progress state."""
+        self._pending.pop(job_id, None)
+        self._queued.discard(job_id)
+        self._state.pop(job_id, None)
+        self._seq.pop(job_id, None)
+        self._updated_at.pop(job_id, None)
+
+    async def _flush_loop(self):
+        """Emit pending progress every flush interval until cancelled."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+
+                # Rooms that never got a terminal event
+                cutoff = time.monotonic() - self.STATE_IDLE_SECONDS
+                for job_id in [j for j, t in self._updated_at.items() if t < cutoff]:
+                    self._forget(job_id)
+            except Exception as e:
+                logger.error(f"Error flushing progress: {e}")
+
+    async def _evict_loop(self):
+        """Disconnect idle sockets periodically until cancelled."""
+        interval = min(self.idle_timeout / 4, self.EVICT_INTERVAL_SECONDS)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.evict_idle()
+            except Exception as e:
+                logger.error(f"Error evicting idle clients: {e}")
+
+    async def replay(self, sid: str, job_id: str):
+        """
+        Send a new subscriber the job's current state.
+
+        Args:
+            sid: Socket.IO session ID
+            job_id: Job UUID
+        """
+        snapshot = self.snapshot(job_id)
+        if snapshot:
+            await sio.emit('progress', snapshot, room=sid, ignore_queue=True)
+            return
+
+        # Imported here: event_bus relays into this module
+        from app.services.event_bus import read_job_state, TERMINAL_EVENTS
+
+        state = await read_job_state(job_id)
+        if not state:
+            return
+
+        seq = self._seq.get(job_id, 0)
+        if state['progress']:
+            await sio.emit('progress', {'seq': seq, **state['progress']}, room=sid, ignore_queue=True)
+        if state['event'] in TERMINAL_EVENTS and state['data'] is not None:
+            await sio.emit(state['event'], {'seq': seq, **state['data']}, room=sid, ignore_queue=True)
+            self._finished.setdefault(job_id, time.monotonic())
+
     def get_connections_count(self, job_id: str = None) -> int:
         """
-        Get number of active connections.
+        Get number of active connections to this process (from the Socket.IO manager).
 
         Args:
             job_id: Optional job ID to get connections for specific job
@@ -114,9 +409,9 @@ class WebSocketManager:
         Returns:
             Number of connections
         """
-        if job_id:
-            return len(self.active_connections.get(job_id, set()))
-        return sum(len(sids) for sids in self.active_connections.values())
+        # Every connected sid is in the None room of its namespace
+        rooms = sio.manager.rooms.get('/', {})
+        return len(rooms.get(job_id or None, ()))
 
 
 # Global WebSocket manager instance
@@ -127,15 +422,16 @@ ws_manager = WebSocketManager()
 @sio.event
 async def connect(sid, environ):
     """Handle client connection."""
-    logger.info(f"Client connected: {sid}")
-    await sio.emit('connected', {'status': 'ok'}, room=sid)
+    ws_manager.touch(sid)
+    logger.debug(f"Client connected: {sid}")
+    await sio.emit('connected', {'status': 'ok'}, room=sid, ignore_queue=True)
 
 
 @sio.event
 async def disconnect(sid):
     """Handle client disconnection."""
     await ws_manager.disconnect(sid)
-    logger.info(f"Client disconnected: {sid}")
+    logger.debug(f"Client disconnected: {sid}")
 
 
 @sio.event
@@ -149,7 +445,7 @@ async def subscribe(sid, data):
     job_id = data.get('job_id')
 
     if not job_id:
-        await sio.emit('error', {'message': 'job_id is required'}, room=sid)
+        await sio.emit('error', {'message': 'job_id is required'}, room=sid, ignore_queue=True)
         return
 
     try:
@@ -157,13 +453,16 @@ async def subscribe(sid, data):
         await sio.emit('subscribed', {
             'subscribed': True,
             'job_id': job_id
-        }, room=sid)
+        }, room=sid, ignore_queue=True)
+
+        # Full current state, so later deltas apply to it
+        await ws_manager.replay(sid, job_id)
     except Exception as e:
         logger.error(f"Error subscribing client {sid} to job {job_id}: {e}")
         await sio.emit('error', {
             'message': 'Failed to subscribe',
             'details': str(e)
-        }, room=sid)
+        }, room=sid, ignore_queue=True)
 
 
 @sio.event
@@ -175,16 +474,13 @@ async def unsubscribe(sid, data):
     """
     job_id = data.get('job_id')
 
-    if job_id and job_id in ws_manager.active_connections:
-        if sid in ws_manager.active_connections[job_id]:
-            ws_manager.active_connections[job_id].remove(sid)
-            await sio.leave_room(sid, job_id)
-            logger.info(f"Client {sid} unsubscribed from job {job_id}")
+    if job_id:
+        await ws_manager.unsubscribe(sid, job_id)
 
     await sio.emit('unsubscribed', {
         'unsubscribed': True,
         'job_id': job_id
-    }, room=sid)
+    }, room=sid, ignore_queue=True)
 
 
 @sio.event
@@ -195,7 +491,8 @@ async def ping(sid, data):
     Client sends: {'timestamp': ms}
     Server responds: {'pong': True, 'timestamp': ms}
     """
+    ws_manager.touch(sid)
     await sio.emit('pong', {
         'pong': True,
         'timestamp': data.get('timestamp')
-    }, room=sid)
+    }, room=sid, ignore_queue=True)
@@ -0,0 +1,159 @@
+"""
+Batch Celery Tasks.
+
+Jobs of a batch run their own pipelines (queued together as a Celery
+group). Whenever one of them finishes, update_batch publishes the batch's
+aggregate progress to the batch room (room = batch ID) and, once every
+job has finished, completes the batch, or hands over to combine_batch
+when a combined document was requested.
+"""
+import os
+from datetime import datetime
+from app.core.celery_app import celery_app
+from app.services.batch_manager import batch_manager
+from app.services.document_generator import DocumentGenerator
+from app.services.event_bus import event_publisher
+from app.services.file_manager import file_manager
+from app.db.base import SyncSessionLocal
+from app.models.batch import Batch
+from app.models.job import Job
+from sqlalchemy import select, update
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task
+def update_batch(batch_id: str):
+    """
+    Publish batch progress and finish the batch once all its jobs have.
+
+    Queued after any job of the batch finishes; several concurrent runs
+    for the same batch are safe (only one wins the status transition).
+
+    Args:
+        batch_id: Batch UUID as string
+    """
+    db = SyncSessionLocal()
+
+    try:
+        batch = _get_batch(db, batch_id)
+        if not batch or batch.status != 'processing':
+            return
+
+        stats = batch_manager.summarize(batch, db.execute(batch_manager.stats_query(batch.id)).all())
+
+        event_publisher.publish_progress(batch_id, {
+            'progress': stats['progress'],
+            'step': f"{stats['finished']}/{batch.total_jobs} jobs finished",
+            'counts': stats['counts'],
+            'timestamp': datetime.utcnow().isoformat()
+        })
+
+        if stats['active']:
+            return
+
+        combine = batch.combine and stats['counts']['completed'] > 0
+        status = 'combining' if combine else batch_manager.final_status(batch, stats)
+
+        claimed = db.execute(
+            update(Batch)
+            .where(Batch.id == batch.id, Batch.status == 'processing')
+            .values(status=status, completed_at=None if combine else datetime.utcnow())
+        ).rowcount
+        db.commit()
+
+        if not claimed:
+            return
+
+        if combine:
+            combine_batch.delay(batch_id)
+        else:
+            _publish_finished(batch_id, status, stats)
+
+    finally:
+        event_publisher.flush()
+        db.close()
+
+
+@celery_app.task
+def combine_batch(batch_id: str):
+    """
+    Build a batch's combined document from its completed jobs, in batch order.
+
+    Args:
+        batch_id: Batch UUID as string
+    """
+    db = SyncSessionLocal()
+
+    try:
+        batch = _get_batch(db, batch_id)
+        if not batch or batch.status != 'combining':
+            return
+
+        stats = batch_manager.summarize(batch, db.execute(batch_manager.stats_query(batch.id)).all())
+        status = batch_manager.final_status(batch, stats)
+
+        jobs = db.execute(
+            select(Job)
+            .where(Job.batch_id == batch.id, Job.status == 'completed')
+            .order_by(Job.batch_index)
+        ).scalars().all()
+
+        paths = []
+        for job in jobs:
+            if job.output_parts:
+                paths += [os.path.join(job.output_path, name) for name in job.output_parts]
+            elif job.output_path:
+                paths.append(job.output_path)
+
+        try:
+            filename = batch_manager.combined_filename(batch)
+            output_path = file_manager.get_output_path(batch.id, filename)
+            DocumentGenerator().combine_documents(paths, output_path)
+
+            batch.output_path = output_path
+            batch.output_filename = filename
+
+        except Exception as e:
+            # Job documents are still downloadable individually
+            logger.error(f"Batch {batch_id}: combined document failed: {e}", exc_info=True)
+            batch.error_message = str(e)
+
+        batch.status = status
+        batch.completed_at = datetime.utcnow()
+        db.commit()
+
+        _publish_finished(batch_id, status, stats, batch.output_filename, batch.error_message)
+        logger.info(f"Batch {batch_id} finished ({status}, combined {len(paths)} documents)")
+
+    finally:
+        event_publisher.flush()
+        db.close()
+
+
+def _get_batch(db, batch_id: str):
+    """Load batch (None if deleted)."""
+    return db.execute(
+        select(Batch).where(Batch.id == batch_id)
+    ).scalar_one_or_none()
+
+
+def _publish_finished(batch_id: str, status: str, stats: dict, output_filename=None, error=None):
+    """Publish the batch's terminal event (error if no job completed)."""
+    if status == 'failed':
+        event_publisher.publish_error(batch_id, "No job in the batch completed", {'counts': stats['counts']})
+        return
+
+    event_publisher.publish_progress(batch_id, {
+        'progress': 100,
+        'step': "Complete!",
+        'counts': stats['counts'],
+        'timestamp': datetime.utcnow().isoformat()
+    })
+    event_publisher.publish_complete(batch_id, {
+        'status': status,
+        'counts': stats['counts'],
+        'output_filename': output_filename,
+        'error': error
+    })
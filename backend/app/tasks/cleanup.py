@@ -6,10 +6,13 @@ Periodic task to cleanup expired jobs (24-hour retention).
 from celery import Task
 from datetime import datetime
 from app.core.celery_app import celery_app
+from app.core.event_loop import run_sync
 from app.services.file_manager import file_manager
+from app.services.result_cache import result_cache
 from app.db.base import AsyncSessionLocal
 from app.models.job import Job
-from sqlalchemy import select
+from app.models.batch import Batch
+from sqlalchemy import select, exists
 import logging
 
 logger = logging.getLogger(__name__)
@@ -27,8 +30,27 @@ def cleanup_expired_jobs():
     2. Delete PDF files
     3. Delete Word document files
     4. Delete database records
+    5. Delete expired batches with no jobs left (and their combined documents)
     """
-    import asyncio
+    async def cleanup_batches(db) -> int:
+        """Delete expired, finished batches that have no jobs left."""
+        result = await db.execute(
+            select(Batch).where(
+                Batch.expires_at < datetime.utcnow(),
+                Batch.status.in_(['completed', 'partial', 'failed']),
+                ~exists().where(Job.batch_id == Batch.id)
+            )
+        )
+        expired_batches = result.scalars().all()
+
+        for batch in expired_batches:
+            # Combined document lives in the batch's output directory
+            await file_manager.cleanup_job(batch.id)
+            await db.delete(batch)
+            logger.info(f"Cleaned up batch {batch.id}")
+
+        await db.commit()
+        return len(expired_batches)
 
     async def cleanup():
         """Async cleanup function."""
@@ -38,7 +60,7 @@ def cleanup_expired_jobs():
                 result = await db.execute(
                     select(Job).where(
                         Job.expires_at < datetime.utcnow(),
-                        Job.status.in_(['completed', 'failed'])
+                        Job.status.in_(['completed', 'failed', 'cancelled'])
                     )
                 )
                 expired_jobs = result.scalars().all()
@@ -47,6 +69,7 @@ def cleanup_expired_jobs():
                     logger.info("No expired jobs to cleanup")
                     return {
                         'cleaned': 0,
+                        'batches_cleaned': await cleanup_batches(db),
                         'failed': 0,
                         'timestamp': datetime.utcnow().isoformat()
                     }
@@ -77,8 +100,12 @@ def cleanup_expired_jobs():
                 # Commit deletions
                 await db.commit()
 
+                # Batches go once all their jobs are gone
+                batches_cleaned = await cleanup_batches(db)
+
                 result = {
                     'cleaned': cleaned_count,
+                    'batches_cleaned': batches_cleaned,
                     'failed': failed_count,
                     'timestamp': datetime.utcnow().isoformat()
                 }
@@ -90,6 +117,22 @@ def cleanup_expired_jobs():
                 logger.error(f"Cleanup task failed: {e}", exc_info=True)
                 raise
 
-    # Run async function
-    loop = asyncio.get_event_loop()
-    return loop.run_until_complete(cleanup())
+    # Run async function on the worker's event loop
+    return run_sync(cleanup())
+
+
+@celery_app.task
+def cleanup_result_cache():
+    """
+    Periodic task to enforce result cache retention and size limits.
+
+    Runs: Every hour (configured in Celery beat)
+
+    Cached results outlive jobs: they have their own retention
+    (RESULT_CACHE_RETENTION_HOURS) and size limit (RESULT_CACHE_MAX_MB).
+    """
+    result = result_cache.cleanup()
+    result['timestamp'] = datetime.utcnow().isoformat()
+
+    logger.info(f"Result cache cleanup complete: {result}")
+    return result
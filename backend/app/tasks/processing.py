@@ -1,224 +1,1067 @@
 """
-PDF Processing Celery Task.
+PDF Processing Celery Tasks.
 
-Background task that processes PDF, parses questions, and generates Word document.
+The pipeline is a Celery chain of stage tasks, each routed to its own
+queue so worker pools can be sized per stage:
+
+    extract_stage  -> processing.extract   (PDF text extraction, CPU heavy)
+      or chord(extract_pages per page range) -> assemble_text
+    parse_stage    -> processing.parse     (question parsing)
+    generate_stage -> processing.generate  (Word document generation)
+    finalize_stage -> processing           (job bookkeeping, events)
+
+Stages pass a small dict of references (job_id, artifact paths) down the
+chain; intermediate results live on shared storage under
+STORAGE_PATH/artifacts/{job_id}.
+
+Long page ranges (EXTRACT_FANOUT_MIN_PAGES or more) are extracted as a
+chord of extract_pages subtasks, spread over every extraction worker that
+shares STORAGE_PATH. Each sub-range retries on its own.
+
+Stage outputs are recorded as checkpoints on Job.checkpoints
+({stage: {files: {path: size}, version, result}}). A redelivered or
+retried stage whose checkpoint is still valid (files present with the
+recorded size, same code version) returns the recorded result instead of
+redoing the work; extraction also resumes from its per-page artifacts.
+
+Cancellation is cooperative: stages poll the job's Redis cancel flag
+between pages, blocks and questions (CancellationToken), and a cancelled
+stage removes partial outputs, marks the job 'cancelled' and stops the
+chain (celery Ignore), freeing the worker slot. Cancelled extract_pages
+subtasks leave the job's artifacts in place while their siblings may still
+be writing; a stage that fails after cancellation cancels the job rather
+than failing it.
+
+Each job also has a wall time and memory budget (JobBudget, scaled by its
+page and question counts), checked at stage start and at the same
+points; Celery's soft/hard time limits back it up. An over-budget job
+fails with error_details.code time_limit_exceeded / memory_limit_exceeded.
+
+Identical jobs created while a job is pending or running follow it
+(single-flight, Job.leader_id) and queue nothing: the leader mirrors its
+progress onto them, links its outputs into them on completion and fails
+them with its own error. A cancelled leader promotes its oldest follower,
+which is queued in its place.
+
+Jobs that belong to a batch queue update_batch when they finish.
 """
-from celery import Task
+from celery import Task, chain, chord, group
+from celery.exceptions import Ignore, SoftTimeLimitExceeded
+from dataclasses import asdict
 from datetime import datetime
+from typing import Callable, List, Optional
 from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.core.redis import get_redis
 from app.services.pdf_parser import PDFParser
-from app.services.question_parser import QuestionParser
+from app.services.question_parser import QuestionParser, ParsedQuestion
 from app.services.document_generator import DocumentGenerator
 from app.services.file_manager import file_manager
-from app.services.websocket_manager import ws_manager
+from app.services.progress import ProgressReporter
+from app.services.result_cache import result_cache
+from app.services.event_bus import event_publisher
+from app.services.job_router import job_router, ACTIVE_STATUSES
+from app.services.single_flight import single_flight
+from app.tasks.batches import update_batch
+from app.services.job_control import (
+    CancellationToken, JobCancelled, JobBudget, BudgetExceeded, failure_details
+)
 from app.db.base import SyncSessionLocal
 from app.models.job import Job
-from sqlalchemy import select
+from sqlalchemy import select, update, or_, func, null
 import logging
-import asyncio
+import json
+import os
+import uuid
 
 logger = logging.getLogger(__name__)
 
+TEXT_ARTIFACT = 'text.txt'
+QUESTIONS_ARTIFACT = 'questions.json'
+
 
 def send_progress_sync(job_id: str, progress: int, step: str):
-    """Send progress update via WebSocket (synchronously)."""
+    """Publish progress update to the event bus (relayed to WebSocket clients by the API)."""
     try:
-        # Run async ws_manager in sync context
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(
-            ws_manager.send_progress(job_id, {
-                'progress': progress,
-                'step': step,
-                'timestamp': datetime.utcnow().isoformat()
-            })
-        )
-        loop.close()
+        event_publisher.publish_progress(job_id, {
+            'progress': progress,
+            'step': step,
+            'timestamp': datetime.utcnow().isoformat()
+        })
     except Exception as e:
         logger.error(f"Error sending progress: {e}")
 
 
+def process_pdf_pipeline(job_id: str, config: dict, lane: Optional[str] = None):
+    """
+    Build the processing chain for a job.
+
+    Args:
+        job_id: Job UUID as string
+        config: Job configuration (page range decides extraction fan-out)
+        lane: Routing lane from JobRouter ('fast' pins every stage to processing.fast)
+
+    Returns:
+        Celery chain signature (call apply_async() to queue it)
+    """
+    time_limit, _ = JobBudget.limits_for_config(config)
+    options = {
+        **job_router.queue_options(lane),
+        # Backstop for the cooperative budget check (a stage never needs the whole budget)
+        'soft_time_limit': int(time_limit),
+        'time_limit': int(time_limit) + settings.JOB_TIME_LIMIT_GRACE_SECONDS
+    }
+    page_start, page_end = config['page_start'], config['page_end']
+    fanout_min = settings.EXTRACT_FANOUT_MIN_PAGES
+
+    if fanout_min and page_end - page_start + 1 >= fanout_min:
+        chunk = max(settings.EXTRACT_CHUNK_PAGES, 1)
+        extract = chord(
+            group(
+                extract_pages.si(job_id, start, min(start + chunk - 1, page_end)).set(**options)
+                for start in range(page_start, page_end + 1, chunk)
+            ),
+            assemble_text.s(job_id).set(**options)
+        )
+    else:
+        extract = extract_stage.s(job_id).set(**options)
+
+    return chain(
+        extract,
+        parse_stage.s().set(**options),
+        generate_stage.s().set(**options),
+        finalize_stage.s().set(**options)
+    )
+
+
 @celery_app.task(bind=True)
 def process_pdf_task(self, job_id: str):
     """
-    Main PDF processing task with progress tracking.
+    Entry point kept for already-queued messages: replaced by the stage chain.
 
-    Steps:
-    1. Extract PDF text (0-20%)
-    2. Parse questions (20-70%)
-    3. Generate document (70-95%)
-    4. Save and finalize (95-100%)
+    Args:
+        self: Task instance (bound)
+        job_id: Job UUID as string
+    """
+    db = SyncSessionLocal()
+    try:
+        job = _get_job(db, job_id)
+        config, lane = job.config, job.lane
+    finally:
+        db.close()
+
+    return self.replace(process_pdf_pipeline(job_id, config, lane))
+
+
+@celery_app.task(bind=True)
+def extract_stage(self, job_id: str) -> dict:
+    """
+    Stage 1: Extract PDF text (5-20%, per page).
 
     Args:
         self: Task instance (bound)
         job_id: Job UUID as string
 
-    Raises:
-        Exception: If processing fails
+    Returns:
+        Stage result {job_id, text_path}
     """
     db = SyncSessionLocal()
 
     try:
-        # Get job
         logger.info(f"Starting processing for job {job_id}")
-        job = db.execute(
-            select(Job).where(Job.id == job_id)
-        ).scalar_one_or_none()
-
-        if not job:
-            raise ValueError(f"Job not found: {job_id}")
-
+        job = _get_job(db, job_id)
         config = job.config
+        token = _check_cancelled(job)
+        budget = _check_budget(job)
+        reporter = _progress_reporter(db, job, token, budget)
+
+        checkpoint = _get_checkpoint(job, 'extract')
+        if checkpoint:
+            logger.info(f"Job {job_id}: extraction checkpoint valid, skipping")
+            return {'job_id': job_id, **checkpoint['result']}
 
         # Update status to parsing
         job.status = 'parsing'
-        job.started_at = datetime.utcnow()
+        job.started_at = job.started_at or datetime.utcnow()
         db.commit()
 
-        # Step 1: Extract PDF text (0-20%)
-        job.progress = 5
-        job.current_step = "Extracting text from PDF..."
-        db.commit()
-        send_progress_sync(job_id, 5, "Extracting text from PDF...")
-
-        pdf_parser = PDFParser()
-        # Run async function in sync context
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        pdf_text = loop.run_until_complete(
-            pdf_parser.extract_text(
-                job.pdf_path,
-                config['page_start'],
-                config['page_end']
-            )
+        reporter.update(5, "Extracting text from PDF...", force=True)
+
+        page_start, page_end = config['page_start'], config['page_end']
+        extract_progress = reporter.stage_callback('extract')
+
+        page_paths = _extract_page_artifacts(
+            job,
+            page_start,
+            page_end,
+            on_page=lambda page: extract_progress((page - page_start + 1) / (page_end - page_start + 1))
         )
-        loop.close()
 
-        job.progress = 20
-        job.current_step = "Text extracted successfully"
-        db.commit()
-        send_progress_sync(job_id, 20, "Text extracted successfully")
+        text_path = _assemble_text_artifact(job, page_paths)
+        _save_checkpoint(db, job, 'extract', [text_path], {'text_path': text_path})
 
-        # Step 2: Parse questions (20-70%)
-        question_parser = QuestionParser()
+        reporter.update(20, "Text extracted successfully", force=True)
+
+        return {'job_id': job_id, 'text_path': text_path}
+
+    except JobCancelled:
+        _cancel_job(db, job_id)
+        raise Ignore()
+
+    except Exception as e:
+        _fail_job(db, job_id, e)
+        raise
+
+    finally:
+        event_publisher.flush()
+        db.close()
+
+
+@celery_app.task(bind=True, max_retries=settings.EXTRACT_MAX_RETRIES)
+def extract_pages(self, job_id: str, start_page: int, end_page: int) -> List[str]:
+    """
+    Stage 1 (fan-out): extract one page sub-range to per-page artifacts.
+
+    Transient failures retry this sub-range only (exponential backoff);
+    invalid ranges and exhausted retries fail the job.
+
+    Args:
+        self: Task instance (bound)
+        job_id: Job UUID as string
+        start_page: First page of sub-range (1-indexed)
+        end_page: Last page of sub-range (1-indexed)
+
+    Returns:
+        Page artifact paths in page order
+    """
+    db = SyncSessionLocal()
 
-        job.progress = 25
-        job.current_step = "Starting question parsing..."
+    try:
+        # First subtask to start moves the job to parsing
+        db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == 'pending')
+            .values(status='parsing', started_at=datetime.utcnow())
+        )
         db.commit()
-        send_progress_sync(job_id, 25, "Starting question parsing...")
-
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        parsed_questions = loop.run_until_complete(
-            question_parser.parse_questions(
-                pdf_text,
-                config['question_start'],
-                config['question_end']
+
+        job = _get_job(db, job_id)
+        config = job.config
+        token = _check_cancelled(job)
+        budget = _check_budget(job)
+        reporter = _progress_reporter(db, job, token, budget)
+        extract_progress = reporter.stage_callback('extract')
+
+        total_pages = config['page_end'] - config['page_start'] + 1
+        done_key = f"job:{job_id}:pages_done"
+        redis = get_redis()
+
+        def count_page(page_number: int):
+            # Overall extraction progress across all subtasks (idempotent on retry)
+            try:
+                pipe = redis.pipeline()
+                pipe.sadd(done_key, page_number)
+                pipe.expire(done_key, 86400)
+                pipe.scard(done_key)
+                pages_done = pipe.execute()[-1]
+            except Exception as e:
+                logger.warning(f"Error counting extracted page {page_number} for job {job_id}: {e}")
+                return
+
+            extract_progress(pages_done / total_pages)
+
+        # Pages finished before a retry/redelivery are kept
+        paths = _extract_page_artifacts(job, start_page, end_page, on_page=count_page)
+
+        reporter.flush()
+        logger.info(f"Job {job_id}: extracted pages {start_page}-{end_page}")
+
+        return paths
+
+    except JobCancelled:
+        # Sibling subtasks may still be writing page artifacts
+        _cancel_job(db, job_id, remove_files=False)
+        raise Ignore()
+
+    except (ValueError, FileNotFoundError, BudgetExceeded, SoftTimeLimitExceeded) as e:
+        # Not transient
+        _fail_job(db, job_id, e, remove_files=False)
+        raise
+
+    except Exception as e:
+        if self.request.retries < self.max_retries:
+            logger.warning(
+                f"Job {job_id}: pages {start_page}-{end_page} failed ({e}), "
+                f"retry {self.request.retries + 1}/{self.max_retries}"
             )
+            raise self.retry(exc=e, countdown=2 ** self.request.retries)
+
+        _fail_job(db, job_id, e, remove_files=False)
+        raise
+
+    finally:
+        event_publisher.flush()
+        db.close()
+
+
+@celery_app.task(bind=True)
+def assemble_text(self, page_paths: List[List[str]], job_id: str) -> dict:
+    """
+    Stage 1 (reduce): join per-page artifacts into the text artifact.
+
+    Args:
+        self: Task instance (bound)
+        page_paths: extract_pages results, in sub-range order
+        job_id: Job UUID as string
+
+    Returns:
+        Stage result {job_id, text_path}, as from extract_stage
+    """
+    db = SyncSessionLocal()
+
+    try:
+        job = _get_job(db, job_id)
+        token = _check_cancelled(job)
+        budget = _check_budget(job)
+        reporter = _progress_reporter(db, job, token, budget)
+
+        text_path = _assemble_text_artifact(job, [path for paths in page_paths for path in paths])
+        _save_checkpoint(db, job, 'extract', [text_path], {'text_path': text_path})
+
+        get_redis().delete(f"job:{job_id}:pages_done")
+
+        reporter.update(20, "Text extracted successfully", force=True)
+
+        return {'job_id': job_id, 'text_path': text_path}
+
+    except JobCancelled:
+        _cancel_job(db, job_id)
+        raise Ignore()
+
+    except Exception as e:
+        _fail_job(db, job_id, e)
+        raise
+
+    finally:
+        event_publisher.flush()
+        db.close()
+
+
+@celery_app.task(bind=True)
+def parse_stage(self, payload: dict) -> dict:
+    """
+    Stage 2: Parse questions (25-70%, per question block).
+
+    Args:
+        self: Task instance (bound)
+        payload: Result of extract_stage
+
+    Returns:
+        Stage result, plus questions_path
+    """
+    job_id = payload['job_id']
+    db = SyncSessionLocal()
+
+    try:
+        job = _get_job(db, job_id)
+        config = job.config
+        token = _check_cancelled(job)
+        budget = _check_budget(job)
+        reporter = _progress_reporter(db, job, token, budget)
+
+        checkpoint = _get_checkpoint(job, 'parse', QuestionParser.VERSION)
+        if checkpoint:
+            logger.info(f"Job {job_id}: parse checkpoint valid, skipping")
+            return {**payload, **checkpoint['result']}
+
+        reporter.update(25, "Starting question parsing...", force=True)
+
+        with open(payload['text_path'], 'r', encoding='utf-8') as f:
+            pdf_text = f.read()
+
+        question_parser = QuestionParser()
+        questions = question_parser.parse_questions_sync(
+            pdf_text,
+            config['question_start'],
+            config['question_end'],
+            progress_callback=reporter.stage_callback('parse')
+        )
+
+        questions_path = file_manager.get_artifact_path(job.id, QUESTIONS_ARTIFACT)
+        _write_artifact(
+            questions_path,
+            json.dumps([asdict(q) for q in questions], separators=(',', ':'))
+        )
+        _save_checkpoint(
+            db, job, 'parse', [questions_path], {'questions_path': questions_path},
+            version=QuestionParser.VERSION
         )
-        loop.close()
-
-        # Update progress for each question
-        questions = []
-        for i, question in enumerate(parsed_questions):
-            questions.append(question)
-            progress = 25 + int((i + 1) / len(parsed_questions) * 45)  # 25-70%
-            job.progress = progress
-            job.current_step = f"Parsing question {question.number}..."
-            db.commit()
-            send_progress_sync(job_id, progress, f"Parsing question {question.number}...")
-
-        job.progress = 70
-        job.current_step = f"Parsed {len(questions)} questions"
-        db.commit()
-        send_progress_sync(job_id, 70, f"Parsed {len(questions)} questions")
 
-        # Step 3: Generate document (70-95%)
+        reporter.update(70, f"Parsed {len(questions)} questions", force=True)
+
+        return {**payload, 'questions_path': questions_path}
+
+    except JobCancelled:
+        _cancel_job(db, job_id)
+        raise Ignore()
+
+    except Exception as e:
+        _fail_job(db, job_id, e)
+        raise
+
+    finally:
+        event_publisher.flush()
+        db.close()
+
+
+@celery_app.task(bind=True)
+def generate_stage(self, payload: dict) -> dict:
+    """
+    Stage 3: Generate document (75-95%, per question).
+
+    Args:
+        self: Task instance (bound)
+        payload: Result of parse_stage
+
+    Returns:
+        Stage result, plus output_path, output_filename, output_parts
+        and question counts
+    """
+    job_id = payload['job_id']
+    db = SyncSessionLocal()
+
+    try:
+        job = _get_job(db, job_id)
+        config = job.config
+        token = _check_cancelled(job)
+        budget = _check_budget(job)
+        reporter = _progress_reporter(db, job, token, budget)
+
+        checkpoint = _get_checkpoint(job, 'generate', DocumentGenerator.VERSION)
+        if checkpoint:
+            logger.info(f"Job {job_id}: generate checkpoint valid, skipping")
+            return {**payload, **checkpoint['result']}
+
+        questions = _load_questions(payload['questions_path'])
+
         job.status = 'generating'
-        db.commit()
+        reporter.update(75, "Generating Word document...", force=True)
 
-        job.progress = 75
-        job.current_step = "Generating Word document..."
-        db.commit()
-        send_progress_sync(job_id, 75, "Generating Word document...")
+        doc_gen = DocumentGenerator(compression=config.get('compression'))
+        shard_size = config.get('shard_size')
+        output_parts = None
 
-        doc_gen = DocumentGenerator()
+        if shard_size and len(questions) > shard_size:
+            # Several documents, downloaded as one ZIP bundle
+            filename = doc_gen.generate_bundle_filename(config)
+            output_path = file_manager.get_output_dir(job.id)
 
-        # Generate filename
-        filename = doc_gen.generate_filename(config)
-        output_path = file_manager.get_output_path(job.id, filename)
+            part_paths = doc_gen.create_sharded_documents(
+                questions,
+                config,
+                output_path,
+                shard_size,
+                progress_callback=reporter.stage_callback('generate'),
+                interrupt_check=reporter.interrupt_check
+            )
+
+            output_parts = [os.path.basename(path) for path in part_paths]
+            output_files = part_paths
+        else:
+            # Generate filename
+            filename = doc_gen.generate_filename(config)
+            output_path = file_manager.get_output_path(job.id, filename)
 
-        # Create document
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(
-            doc_gen.create_document(
+            # Create document
+            doc_gen.create_document_sync(
                 questions,
                 config,
-                output_path
+                output_path,
+                progress_callback=reporter.stage_callback('generate')
             )
-        )
-        loop.close()
+            output_files = [output_path]
 
-        # Step 4: Finalize (95-100%)
-        job.progress = 95
-        job.current_step = "Finalizing document..."
-        db.commit()
-        send_progress_sync(job_id, 95, "Finalizing document...")
+        result = {
+            'output_path': output_path,
+            'output_filename': filename,
+            'output_parts': output_parts,
+            'total_questions': len(questions),
+            'diagrams_detected': sum(1 for q in questions if q.has_diagram)
+        }
+        _save_checkpoint(db, job, 'generate', output_files, result, version=DocumentGenerator.VERSION)
+
+        reporter.update(95, "Finalizing document...", force=True)
+
+        return {**payload, **result}
+
+    except JobCancelled:
+        _cancel_job(db, job_id)
+        raise Ignore()
+
+    except Exception as e:
+        _fail_job(db, job_id, e)
+        raise
+
+    finally:
+        event_publisher.flush()
+        db.close()
+
+
+@celery_app.task(bind=True)
+def finalize_stage(self, payload: dict):
+    """
+    Stage 4: Finalize (95-100%): mark job completed and notify clients.
+
+    Args:
+        self: Task instance (bound)
+        payload: Result of generate_stage
+    """
+    job_id = payload['job_id']
+    db = SyncSessionLocal()
+
+    try:
+        job = _get_job(db, job_id)
+        _check_cancelled(job)
 
         # Update job
         job.status = 'completed'
         job.progress = 100
         job.current_step = "Complete!"
-        job.output_path = output_path
-        job.output_filename = filename
-        job.total_questions = len(questions)
-        job.diagrams_detected = sum(1 for q in questions if q.has_diagram)
+        job.output_path = payload['output_path']
+        job.output_filename = payload['output_filename']
+        job.output_parts = payload['output_parts']
+        job.total_questions = payload['total_questions']
+        job.diagrams_detected = payload['diagrams_detected']
         job.completed_at = datetime.utcnow()
 
         db.commit()
 
+        # Hand the result to identical jobs that followed this one
+        _complete_followers(db, job)
+        _notify_batches(db, job)
+
+        # Make result reusable by identical future jobs (single documents only)
+        if not job.output_parts:
+            result_cache.store(job.input_hash, job.output_path, {
+                'output_filename': job.output_filename,
+                'total_questions': job.total_questions,
+                'diagrams_detected': job.diagrams_detected
+            })
+
         send_progress_sync(job_id, 100, "Complete!")
 
         # Send completion event via WebSocket
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(
-            ws_manager.send_complete(job_id, {
-                'output_filename': filename,
-                'total_questions': len(questions),
-                'diagrams_detected': sum(1 for q in questions if q.has_diagram)
-            })
-        )
-        loop.close()
+        event_publisher.publish_complete(job_id, {
+            'output_filename': job.output_filename,
+            'total_questions': job.total_questions,
+            'diagrams_detected': job.diagrams_detected
+        })
 
         logger.info(f"Job {job_id} completed successfully")
 
+    except JobCancelled:
+        _cancel_job(db, job_id)
+        raise Ignore()
+
     except Exception as e:
-        # Handle errors
-        logger.error(f"Job {job_id} failed: {e}", exc_info=True)
+        _fail_job(db, job_id, e)
+        raise
+
+    finally:
+        event_publisher.flush()
+        db.close()
+
+
+def _get_job(db, job_id: str) -> Job:
+    """Load job or raise ValueError."""
+    job = db.execute(
+        select(Job).where(Job.id == job_id)
+    ).scalar_one_or_none()
+
+    if not job:
+        raise ValueError(f"Job not found: {job_id}")
+
+    return job
+
+
+def _progress_reporter(
+    db,
+    job: Job,
+    token: Optional[CancellationToken] = None,
+    budget: Optional[JobBudget] = None
+) -> ProgressReporter:
+    """
+    Create a throttled reporter that persists and publishes job progress.
+
+    Each update is one DB write plus one event at most every
+    PROGRESS_MIN_INTERVAL_MS (or PROGRESS_MIN_DELTA change); the write
+    also mirrors status and progress onto single-flight followers. Stage
+    callbacks raise JobCancelled once the job is cancelled (token) and
+    BudgetExceeded once it is over budget (budget).
+    """
+    job_id = str(job.id)
+
+    def on_progress(progress: int, step: str):
+        job.progress = progress
+        job.current_step = step
+        db.execute(
+            update(Job)
+            .where(Job.leader_id == job.id, Job.status.in_(ACTIVE_STATUSES))
+            .values(status=job.status, progress=progress, current_step=step)
+        )
+        db.commit()
+        send_progress_sync(job_id, progress, step)
+
+    def interrupt_check():
+        if token:
+            token.check()
+        if budget:
+            budget.check()
+
+    return ProgressReporter(on_progress, interrupt_check=interrupt_check)
+
+
+def _check_cancelled(job: Job) -> CancellationToken:
+    """
+    Stop a stage that should not run, before it does any work.
+
+    Args:
+        job: Job
+
+    Returns:
+        Cancellation token to poll while the stage runs
+
+    Raises:
+        JobCancelled: Job cancelled (already or just requested)
+    """
+    token = CancellationToken(job.id)
+    if job.status == 'cancelled' or token.is_cancelled(force=True):
+        raise JobCancelled(f"Job {job.id} was cancelled")
+
+    return token
+
+
+def _check_budget(job: Job) -> JobBudget:
+    """
+    Get the job's budget, failing a stage that starts over budget.
+
+    Args:
+        job: Job
+
+    Returns:
+        Budget to check while the stage runs
+
+    Raises:
+        BudgetExceeded: Job is already over budget (e.g. redelivered after a kill)
+    """
+    budget = JobBudget.for_job(job.config, job.started_at)
+    budget.check()
+    return budget
+
+
+def _cancel_job(db, job_id: str, remove_files: bool = True):
+    """
+    Mark job cancelled, remove partial outputs, notify clients and promote a follower.
+
+    Safe to call from several cancelled subtasks of the same job: only one
+    wins the conditional update and notifies clients.
+
+    Args:
+        db: Database session
+        job_id: Job UUID as string
+        remove_files: Delete outputs and artifacts now. extract_pages passes
+            False, since sibling subtasks may still be writing page artifacts
+            (the files then go with the job when it expires).
+    """
+    logger.info(f"Job {job_id} cancelled")
+
+    try:
+        db.rollback()
+        cancelled = db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status.in_(ACTIVE_STATUSES))
+            .values(
+                status='cancelled',
+                current_step="Cancelled",
+                checkpoints=null(),
+                completed_at=datetime.utcnow()
+            )
+        ).rowcount
+        db.commit()
 
         job = db.execute(
             select(Job).where(Job.id == job_id)
         ).scalar_one_or_none()
 
+        if job and cancelled:
+            event_publisher.publish_cancelled(job_id, {
+                'progress': job.progress,
+                'timestamp': datetime.utcnow().isoformat()
+            })
+
+        # The cancel flag is left to expire: sibling subtasks still poll it
+        if remove_files:
+            file_manager.remove_partial_files(job_id)
+
         if job:
-            job.status = 'failed'
-            job.error_message = str(e)
-            job.completed_at = datetime.utcnow()
-            db.commit()
-
-            # Send error event via WebSocket
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(
-                ws_manager.send_error(job_id, str(e), {
-                    'error_type': type(e).__name__
-                })
+            _notify_batches(db, job)
+            _promote_follower(db, job)
+
+    except Exception as e:
+        logger.error(f"Error marking job {job_id} cancelled: {e}")
+
+
+def _fail_job(db, job_id: str, error: Exception, remove_files: bool = True):
+    """
+    Mark job failed and notify clients (the chain stops at the failing stage).
+
+    Only active jobs are failed. A job whose cancellation was requested is
+    cancelled instead: a stage can fail because cancellation removed files
+    under it (e.g. a sibling extract_pages subtask), and that must not turn
+    the cancelled job into a failed one.
+
+    Args:
+        db: Database session
+        job_id: Job UUID as string
+        error: Exception that stopped the stage
+        remove_files: Passed on to _cancel_job when the job was cancelled
+    """
+    if CancellationToken(job_id).is_cancelled(force=True):
+        logger.info(f"Job {job_id} stopped after cancellation: {error}")
+        _cancel_job(db, job_id, remove_files)
+        return
+
+    logger.error(f"Job {job_id} failed: {error}", exc_info=True)
+
+    try:
+        db.rollback()
+        error_details = failure_details(error)
+        failed = db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status.in_(ACTIVE_STATUSES))
+            .values(
+                status='failed',
+                error_message=str(error),
+                error_details=error_details,
+                completed_at=func.coalesce(Job.completed_at, datetime.utcnow())
             )
-            loop.close()
+        ).rowcount
 
-        raise
+        if not failed:
+            # Already finished (cancelled, completed or failed by a sibling subtask)
+            db.rollback()
+            logger.info(f"Job {job_id} already finished, not marking it failed")
+            return
+
+        job = db.execute(
+            select(Job).where(Job.id == job_id)
+        ).scalar_one()
+
+        # Followers share the failure (they receive the same error event)
+        db.execute(
+            update(Job)
+            .where(Job.leader_id == job.id, Job.status.in_(ACTIVE_STATUSES))
+            .values(
+                status='failed',
+                error_message=job.error_message,
+                error_details=job.error_details,
+                completed_at=job.completed_at
+            )
+        )
+        db.commit()
+
+        # Send error event via WebSocket
+        event_publisher.publish_error(job_id, str(error), job.error_details)
 
+        single_flight.release(job.input_hash, job_id)
+        _notify_batches(db, job)
+    except Exception as e:
+        logger.error(f"Error marking job {job_id} failed: {e}")
+
+
+def _complete_followers(db, job: Job):
+    """
+    Complete a finished leader's followers with links to its outputs.
+
+    Runs after the leader is committed as completed, so a follower created
+    concurrently either is found here or sees the finished leader and
+    detaches itself (see jobs endpoint _confirm_leader).
+
+    Args:
+        db: Database session
+        job: Completed leader job
+    """
+    followers = db.execute(
+        select(Job).where(Job.leader_id == job.id, Job.status.in_(ACTIVE_STATUSES))
+    ).scalars().all()
+
+    for follower in followers:
+        try:
+            output_path = _link_outputs(job, follower.id)
+        except OSError as e:
+            logger.error(f"Error linking outputs of job {job.id} into follower {follower.id}: {e}")
+            follower.status = 'failed'
+            follower.error_message = f"Failed to copy result of identical job {job.id}"
+            follower.completed_at = datetime.utcnow()
+            continue
+
+        db.execute(
+            update(Job)
+            .where(Job.id == follower.id, Job.leader_id == job.id, Job.status.in_(ACTIVE_STATUSES))
+            .values(
+                status='completed',
+                progress=100,
+                current_step="Complete!",
+                output_path=output_path,
+                output_filename=job.output_filename,
+                output_parts=job.output_parts,
+                total_questions=job.total_questions,
+                diagrams_detected=job.diagrams_detected,
+                started_at=job.started_at,
+                completed_at=job.completed_at
+            )
+        )
+
+    db.commit()
+    single_flight.release(job.input_hash, str(job.id))
+
+    if followers:
+        logger.info(f"Job {job.id}: completed {len(followers)} follower(s)")
+
+
+def _notify_batches(db, job: Job):
+    """
+    Queue update_batch for the batches of a job that just finished and its followers.
+
+    Args:
+        db: Database session
+        job: Finished job
+    """
+    batch_ids = db.execute(
+        select(Job.batch_id)
+        .where(or_(Job.id == job.id, Job.leader_id == job.id), Job.batch_id.is_not(None))
+        .distinct()
+    ).scalars().all()
+
+    for batch_id in batch_ids:
+        update_batch.delay(str(batch_id))
+
+
+def _promote_follower(db, job: Job):
+    """
+    Promote the oldest follower of a cancelled leader and queue its pipeline.
+
+    Safe to call from several cancelled subtasks of the same job: only one
+    wins the conditional update.
+
+    Args:
+        db: Database session
+        job: Cancelled leader job
+    """
+    new_leader = db.execute(
+        select(Job)
+        .where(Job.leader_id == job.id, Job.status.in_(ACTIVE_STATUSES))
+        .order_by(Job.created_at)
+        .limit(1)
+    ).scalar_one_or_none()
+
+    if not new_leader:
+        single_flight.release(job.input_hash, str(job.id))
+        return
+
+    promoted = db.execute(
+        update(Job)
+        .where(Job.id == new_leader.id, Job.leader_id == job.id)
+        .values(leader_id=None, status='pending', progress=0, current_step=None)
+    ).rowcount
+    if not promoted:
+        db.rollback()
+        return
+
+    # Remaining followers now follow the promoted job
+    db.execute(
+        update(Job)
+        .where(Job.leader_id == job.id, Job.status.in_(ACTIVE_STATUSES))
+        .values(leader_id=new_leader.id, status='pending', progress=0, current_step=None)
+    )
+    db.commit()
+
+    single_flight.promote(job.input_hash, str(job.id), str(new_leader.id))
+    process_pdf_pipeline(str(new_leader.id), new_leader.config, new_leader.lane).apply_async()
+
+    logger.info(f"Job {job.id} cancelled: promoted follower {new_leader.id} to leader")
+
+
+def _link_outputs(job: Job, target_id) -> str:
+    """
+    Hard-link a completed job's outputs into another job's output directory.
+
+    Args:
+        job: Completed job
+        target_id: Job UUID receiving the outputs
+
+    Returns:
+        Target output_path (directory when sharded, else the document)
+    """
+    if job.output_parts:
+        output_dir = file_manager.get_output_dir(target_id)
+        for name in job.output_parts:
+            file_manager.link_file(os.path.join(job.output_path, name), os.path.join(output_dir, name))
+        return output_dir
+
+    output_path = file_manager.get_output_path(target_id, job.output_filename)
+    file_manager.link_file(job.output_path, output_path)
+    return output_path
+
+
+def _get_checkpoint(job: Job, stage: str, version: Optional[str] = None) -> Optional[dict]:
+    """
+    Get a stage checkpoint if it is still valid.
+
+    Valid means recorded with the same code version, and every recorded
+    file still exists with its recorded size.
+
+    Args:
+        job: Job
+        stage: Stage name (extract, parse, generate)
+        version: Code version the stage output depends on
+
+    Returns:
+        Checkpoint {files, version, result} or None
+    """
+    checkpoint = (job.checkpoints or {}).get(stage)
+    if not checkpoint or checkpoint.get('version') != version:
+        return None
+
+    for path, size in checkpoint['files'].items():
+        if not os.path.exists(path) or os.path.getsize(path) != size:
+            logger.warning(f"Job {job.id}: {stage} checkpoint invalid ({path} missing or changed)")
+            return None
+
+    return checkpoint
+
+
+def _save_checkpoint(
+    db,
+    job: Job,
+    stage: str,
+    files: List[str],
+    result: dict,
+    version: Optional[str] = None
+):
+    """
+    Record a stage checkpoint on the job row.
+
+    Args:
+        db: Database session
+        job: Job
+        stage: Stage name (extract, parse, generate)
+        files: Files making up the stage output
+        result: Stage result returned when the checkpoint is reused
+        version: Code version the stage output depends on
+    """
+    # Reassign (not mutate) so SQLAlchemy detects the JSONB change
+    job.checkpoints = {
+        **(job.checkpoints or {}),
+        stage: {
+            'files': {path: os.path.getsize(path) for path in files},
+            'version': version,
+            'result': result
+        }
+    }
+    db.commit()
+
+
+def _extract_page_artifacts(
+    job: Job,
+    start_page: int,
+    end_page: int,
+    on_page: Optional[Callable[[int], None]] = None
+) -> List[str]:
+    """
+    Extract a page range to per-page artifacts, resuming after existing ones.
+
+    Page artifacts are written atomically as each page is extracted, so
+    after a crash the range resumes at the first missing page.
+
+    Args:
+        job: Job
+        start_page: First page (1-indexed)
+        end_page: Last page (1-indexed)
+        on_page: Optional callback receiving each page number once its artifact exists
+
+    Returns:
+        Page artifact paths in page order
+    """
+    paths = {
+        page: file_manager.get_artifact_path(job.id, _page_artifact(page))
+        for page in range(start_page, end_page + 1)
+    }
+    resume_page = next((page for page, path in paths.items() if not os.path.exists(path)), None)
+
+    for page in range(start_page, resume_page or end_page + 1):
+        if on_page:
+            on_page(page)
+
+    if resume_page is not None:
+        if resume_page > start_page:
+            logger.info(f"Job {job.id}: resuming extraction at page {resume_page}")
+
+        def write_page(page_number: int, text: str):
+            _write_artifact(paths[page_number], text)
+            if on_page:
+                on_page(page_number)
+
+        # In the task thread, so the soft time limit interrupts extraction itself
+        PDFParser.extract_pages_sync(job.pdf_path, resume_page, end_page, page_callback=write_page)
+
+    return list(paths.values())
+
+
+def _assemble_text_artifact(job: Job, page_paths: List[str]) -> str:
+    """
+    Join per-page artifacts into the text artifact.
+
+    Args:
+        job: Job
+        page_paths: Page artifact paths in page order
+
+    Returns:
+        Text artifact path
+    """
+    page_texts = []
+    for path in page_paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            page_texts.append(f.read())
+
+    text_path = file_manager.get_artifact_path(job.id, TEXT_ARTIFACT)
+    _write_artifact(text_path, PDFParser.join_pages(page_texts))
+    return text_path
+
+
+def _write_artifact(path: str, content: str):
+    """
+    Write artifact atomically (a retried stage never sees a partial file).
+
+    The tmp name is unique per write: a redelivered stage may write the
+    same artifact while the original is still running.
+    """
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
     finally:
-        db.close()
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def _page_artifact(page_number: int) -> str:
+    """Artifact filename for one extracted page."""
+    return f"page_{page_number:05d}.txt"
+
+
+def _load_questions(path: str) -> List[ParsedQuestion]:
+    """Load parsed questions artifact."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [ParsedQuestion(**data) for data in json.load(f)]
@@ -257,3 +257,28 @@ def add_question_table(
     apply_table_formatting(table)
 
     return table
+
+
+def add_bookmark(paragraph, bookmark_id: int, name: str):
+    """
+    Add an empty bookmark to a paragraph.
+
+    Used to tag generated question tables so they can be located later
+    (e.g. for patching a single question in an existing document).
+
+    Args:
+        paragraph: Word paragraph object
+        bookmark_id: Numeric bookmark id (unique within the document)
+        name: Bookmark name (must start with a letter, max 40 characters)
+    """
+    start = OxmlElement('w:bookmarkStart')
+    start.set(qn('w:id'), str(bookmark_id))
+    start.set(qn('w:name'), name)
+
+    end = OxmlElement('w:bookmarkEnd')
+    end.set(qn('w:id'), str(bookmark_id))
+
+    # Bookmark goes right after paragraph properties (schema order)
+    index = 1 if paragraph._p.pPr is not None else 0
+    paragraph._p.insert(index, end)
+    paragraph._p.insert(index, start)
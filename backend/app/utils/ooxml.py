@@ -0,0 +1,154 @@
+"""
+OOXML Package Utilities.
+
+Low-level helpers for rewriting parts of an existing .docx (zip) package
+without re-serializing the whole document through python-docx.
+"""
+import copy
+import struct
+import zipfile
+from typing import Dict, Optional, Tuple
+from docx.opc.pkgwriter import PackageWriter
+
+# Local file header: fixed 30 bytes, file name and extra field lengths at offset 26
+_LOCAL_HEADER_SIZE = 30
+_DATA_DESCRIPTOR_FLAG = 0x08
+
+# Package compression modes: name -> (compress_type, compresslevel)
+COMPRESSION_MODES: Dict[str, Tuple[int, Optional[int]]] = {
+    'store': (zipfile.ZIP_STORED, None),
+    'fast': (zipfile.ZIP_DEFLATED, 1),
+    'default': (zipfile.ZIP_DEFLATED, None),  # zlib default (6), as python-docx saves
+    'max': (zipfile.ZIP_DEFLATED, 9),
+}
+
+
+def get_compression(mode: Optional[str]) -> Tuple[int, Optional[int]]:
+    """
+    Resolve a compression mode name.
+
+    Args:
+        mode: One of COMPRESSION_MODES (None means 'default')
+
+    Returns:
+        (compress_type, compresslevel) for zipfile
+
+    Raises:
+        ValueError: If mode is unknown
+    """
+    if mode is None:
+        mode = 'default'
+    if mode not in COMPRESSION_MODES:
+        raise ValueError(f"Invalid compression mode: {mode} (must be one of: {', '.join(COMPRESSION_MODES)})")
+    return COMPRESSION_MODES[mode]
+
+
+class _ZipPackageWriter:
+    """Physical package writer for python-docx with configurable compression."""
+
+    def __init__(self, pkg_file, compression: Optional[str]):
+        compress_type, compresslevel = get_compression(compression)
+        self._zipf = zipfile.ZipFile(pkg_file, 'w', compression=compress_type, compresslevel=compresslevel)
+
+    def write(self, pack_uri, blob: bytes):
+        self._zipf.writestr(pack_uri.membername, blob)
+
+    def close(self):
+        self._zipf.close()
+
+
+def save_document(doc, pkg_file, compression: Optional[str] = None):
+    """
+    Save a python-docx Document with the given package compression.
+
+    Equivalent to doc.save(), which always deflates at the default level.
+
+    Args:
+        doc: Word Document object
+        pkg_file: Output path or writable binary file object
+        compression: Compression mode (see COMPRESSION_MODES)
+    """
+    package = doc.part.package
+    for part in package.parts:
+        part.before_marshal()
+
+    writer = _ZipPackageWriter(pkg_file, compression)
+    try:
+        PackageWriter._write_content_types_stream(writer, package.parts)
+        PackageWriter._write_pkg_rels(writer, package.rels)
+        PackageWriter._write_parts(writer, package.parts)
+    finally:
+        writer.close()
+
+
+def _read_raw_member(fp, info: zipfile.ZipInfo) -> bytes:
+    """
+    Read a member's compressed bytes exactly as stored in the archive.
+
+    Args:
+        fp: Open binary file object of the source archive
+        info: ZipInfo of the member
+
+    Returns:
+        Raw (still compressed) member data
+    """
+    fp.seek(info.header_offset)
+    header = fp.read(_LOCAL_HEADER_SIZE)
+    name_len, extra_len = struct.unpack('<HH', header[26:30])
+    fp.seek(info.header_offset + _LOCAL_HEADER_SIZE + name_len + extra_len)
+    return fp.read(info.compress_size)
+
+
+def _write_raw_member(dst: zipfile.ZipFile, info: zipfile.ZipInfo, raw: bytes):
+    """
+    Append a member with pre-compressed data, without recompressing it.
+
+    Args:
+        dst: Destination archive opened for writing
+        info: ZipInfo copied from the source archive
+        raw: Raw member data from _read_raw_member()
+    """
+    zinfo = copy.copy(info)
+    # CRC and sizes are known up front, so no trailing data descriptor
+    zinfo.flag_bits &= ~_DATA_DESCRIPTOR_FLAG
+    zinfo.header_offset = dst.fp.tell()
+
+    dst.fp.write(zinfo.FileHeader(False))
+    dst.fp.write(raw)
+
+    dst.filelist.append(zinfo)
+    dst.NameToInfo[zinfo.filename] = zinfo
+    dst.start_dir = dst.fp.tell()
+    dst._didModify = True
+
+
+def replace_members(
+    src_path: str,
+    dst_path: str,
+    replacements: Dict[str, bytes],
+    compression: Optional[str] = None
+):
+    """
+    Copy a zip package, replacing the given members.
+
+    Untouched members are copied as raw compressed bytes (no decompression
+    or recompression); replaced members are compressed with the given
+    mode. Member order is kept.
+
+    Args:
+        src_path: Source .docx path
+        dst_path: Destination path (must differ from src_path)
+        replacements: Member name -> new uncompressed content
+        compression: Compression mode for replaced members (see COMPRESSION_MODES)
+    """
+    compress_type, compresslevel = get_compression(compression)
+
+    with zipfile.ZipFile(src_path, 'r') as src, \
+            zipfile.ZipFile(dst_path, 'w', compression=compress_type, compresslevel=compresslevel) as dst:
+        for info in src.infolist():
+            if info.filename in replacements:
+                zinfo = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+                zinfo.compress_type = compress_type
+                dst.writestr(zinfo, replacements[info.filename])
+            else:
+                _write_raw_member(dst, info, _read_raw_member(src.fp, info))
@@ -0,0 +1,87 @@
+"""
+Benchmark script for generated document compression modes.
+
+Generates a document of synthetic questions once, then saves it with each
+package compression mode (store, fast, default, max) and reports save
+time and file size, to choose DOCX_COMPRESSION for intranet vs. remote
+clients.
+
+Usage:
+    python benchmark_compression.py [--questions 500] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from docx import Document
+from app.services.question_parser import ParsedQuestion
+from app.services.document_generator import DocumentGenerator
+from app.services.fragment_cache import FragmentCache
+from app.utils.ooxml import COMPRESSION_MODES, save_document
+
+
+def make_questions(count: int) -> list:
+    """Build synthetic questions with realistic text lengths."""
+    return [
+        ParsedQuestion(
+            number=i,
+            question_text=[
+                f"Question {i}: A steam power plant operates between boiler pressure of {i % 90 + 10} bar "
+                f"and condenser pressure of 0.1 bar. Determine the Rankine cycle efficiency."
+            ],
+            options=[f"{30 + i % 7}.{i % 10}%", f"{32 + i % 5}.{i % 9}%", f"{35 + i % 3}.{i % 8}%", "None of these"],
+            correct_option_idx=i % 4,
+            solution_text=[
+                "Using steam tables, h1, h2, h3 and h4 are determined at the given pressures.",
+                "Efficiency = (Turbine work - Pump work) / Heat supplied."
+            ],
+            has_diagram=i % 10 == 0,
+            confidence=1.0
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--questions', type=int, default=500, help='Number of questions')
+    parser.add_argument('--repeat', type=int, default=3, help='Saves per mode (best time is reported)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Build document once (fragment cache disabled so it is not polluted)
+        generator = DocumentGenerator(cache=FragmentCache(Path(tmp_dir) / 'cache', max_bytes=0))
+        doc = Document()
+        generator._set_page_margins(doc)
+        for question in make_questions(args.questions):
+            generator._add_question(doc, question)
+            doc.add_page_break()
+
+        print("=" * 60)
+        print(f"Compression benchmark - {args.questions} questions")
+        print("=" * 60)
+        print(f"{'mode':<10}{'save (s)':>12}{'size (KB)':>14}{'ratio':>10}")
+
+        sizes = {}
+        for mode in COMPRESSION_MODES:
+            output_path = os.path.join(tmp_dir, f"{mode}.docx")
+            best = float('inf')
+
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                save_document(doc, output_path, mode)
+                best = min(best, time.perf_counter() - start)
+
+            sizes[mode] = os.path.getsize(output_path)
+            ratio = sizes[mode] / sizes['store']
+            print(f"{mode:<10}{best:>12.3f}{sizes[mode] / 1024:>14.1f}{ratio:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
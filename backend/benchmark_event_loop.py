@@ -0,0 +1,96 @@
+"""
+Benchmark script for worker event loop overhead.
+
+Compares the per-job cost of running async calls from Celery task code:
+1. Old: new_event_loop() / run_until_complete() / close() around every call
+2. New: one persistent worker loop (app.core.event_loop), progress
+   updates submitted without waiting, other calls awaited via run_sync()
+
+Each simulated job makes one progress update per question plus a handful
+of awaited calls (extract, parse, generate, complete), using the real
+ws_manager.send_progress (no clients connected).
+
+Usage:
+    python benchmark_event_loop.py [--questions 100] [--jobs 20]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.core.event_loop import run_sync, submit, stop_worker_loop
+from app.services.websocket_manager import ws_manager
+
+AWAITED_CALLS = 4  # extract, parse, generate, complete
+
+
+def progress_payload(i: int) -> dict:
+    return {'progress': i % 100, 'step': f"Parsing question {i}...", 'timestamp': datetime.utcnow().isoformat()}
+
+
+async def service_call():
+    """Stand-in for an awaited service call."""
+    return None
+
+
+def job_new_loop_per_call(job_id: str, questions: int):
+    """Old pattern: fresh event loop around every async call."""
+    for i in range(questions):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(ws_manager.send_progress(job_id, progress_payload(i)))
+        loop.close()
+
+    for _ in range(AWAITED_CALLS):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(service_call())
+        loop.close()
+
+
+def job_persistent_loop(job_id: str, questions: int):
+    """New pattern: persistent loop shared by all calls."""
+    for i in range(questions):
+        submit(ws_manager.send_progress(job_id, progress_payload(i)))
+
+    for _ in range(AWAITED_CALLS):
+        run_sync(service_call())
+
+
+def measure(job_fn, jobs: int, questions: int) -> float:
+    """Return mean seconds of async-call overhead per job."""
+    start = time.perf_counter()
+    for j in range(jobs):
+        job_fn(f"benchmark-job-{j}", questions)
+    return (time.perf_counter() - start) / jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--questions', type=int, default=100, help='Progress updates per job')
+    parser.add_argument('--jobs', type=int, default=20, help='Number of simulated jobs')
+    args = parser.parse_args()
+
+    # Warm up both paths (imports, loop thread start)
+    job_new_loop_per_call("warmup", 5)
+    job_persistent_loop("warmup", 5)
+
+    old = measure(job_new_loop_per_call, args.jobs, args.questions)
+    new = measure(job_persistent_loop, args.jobs, args.questions)
+    stop_worker_loop()
+
+    print("=" * 60)
+    print(f"Event loop overhead - {args.questions} progress updates + {AWAITED_CALLS} awaited calls per job")
+    print("=" * 60)
+    print(f"  New loop per call:  {old * 1000:8.2f} ms/job")
+    print(f"  Persistent loop:    {new * 1000:8.2f} ms/job")
+    print(f"  Speedup:            {old / new:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
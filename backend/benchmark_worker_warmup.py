@@ -0,0 +1,147 @@
+"""
+Benchmark script for worker warm-up.
+
+Simulates Celery prefork: a parent process imports the task modules,
+then forks children that each run one small job (extract a PDF, parse
+questions, generate a Word document). Compares:
+1. Cold: children warm up on their first job
+2. Warm: parent runs app.core.warmup.warm_up(freeze=True) before forking
+
+Reports first-job latency and per-child memory (RSS, PSS and private
+bytes from /proc/self/smaps_rollup, measured after the job). Linux only.
+
+Usage:
+    python benchmark_worker_warmup.py [--children 4] [--questions 20]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+
+def question_lines(count: int) -> list:
+    lines = []
+    for n in range(1, count + 1):
+        lines += [
+            f"Q{n}. What is the value of expression number {n}?",
+            "(a) One", "(b) Two", "(c) Three", "(d) Four",
+            "Ans: (b)",
+            f"Solution: Worked solution for question {n}.",
+        ]
+    return lines
+
+
+def memory_kb() -> dict:
+    """Rss/Pss/private memory of this process (kB)."""
+    values = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[1].isdigit():
+                values[parts[0].rstrip(':')] = int(parts[1])
+    return {
+        'rss': values.get('Rss', 0),
+        'pss': values.get('Pss', 0),
+        'private': values.get('Private_Clean', 0) + values.get('Private_Dirty', 0),
+    }
+
+
+def run_first_job(pdf_path: str, questions: int, output_path: str) -> float:
+    """Run one job through the services; return seconds."""
+    from app.services.pdf_parser import PDFParser
+    from app.services.question_parser import QuestionParser
+    from app.services.document_generator import DocumentGenerator
+    from app.services.fragment_cache import FragmentCache
+
+    start = time.perf_counter()
+    text = asyncio.run(PDFParser.extract_text(pdf_path, 1, 1))
+    parsed = asyncio.run(QuestionParser().parse_questions(text, 1, questions))
+    generator = DocumentGenerator(cache=FragmentCache(max_bytes=0))  # no cache hits
+    asyncio.run(generator.create_document(parsed, {}, output_path))
+    return time.perf_counter() - start
+
+
+def run_mode(warm: bool, children: int, questions: int) -> list:
+    """Parent side of one mode: (optionally) warm up, fork children, collect results."""
+    import logging
+    logging.disable(logging.WARNING)
+
+    # What a Celery worker parent imports at startup (task modules via include)
+    import app.tasks.processing  # noqa: F401
+    from app.core.warmup import minimal_pdf, warm_up
+
+    workdir = tempfile.mkdtemp(prefix='warmup_bench_')
+    pdf_path = os.path.join(workdir, 'input.pdf')
+    with open(pdf_path, 'wb') as f:
+        f.write(minimal_pdf(question_lines(questions)))
+
+    if warm:
+        warm_up(freeze=True)
+
+    results = []
+    for i in range(children):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+
+        if pid == 0:
+            # Child: first job, then report
+            os.close(read_fd)
+            latency = run_first_job(pdf_path, questions, os.path.join(workdir, f'out_{i}.docx'))
+            payload = json.dumps({'latency': latency, **memory_kb()}).encode()
+            os.write(write_fd, payload)
+            os._exit(0)
+
+        os.close(write_fd)
+        with os.fdopen(read_fd, 'rb') as r:
+            results.append(json.loads(r.read()))
+        os.waitpid(pid, 0)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--children', type=int, default=4, help='Forked children per mode')
+    parser.add_argument('--questions', type=int, default=20, help='Questions in the test job')
+    parser.add_argument('--mode', choices=['cold', 'warm'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        # Internal: one mode per fresh interpreter
+        print(json.dumps(run_mode(args.mode == 'warm', args.children, args.questions)))
+        return
+
+    summary = {}
+    for mode in ('cold', 'warm'):
+        out = subprocess.run(
+            [sys.executable, __file__, '--mode', mode,
+             '--children', str(args.children), '--questions', str(args.questions)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        rows = json.loads(out.strip().splitlines()[-1])
+        summary[mode] = {key: sum(row[key] for row in rows) / len(rows) for key in rows[0]}
+
+    print("=" * 60)
+    print(f"Worker warm-up - {args.children} forked children, first job of {args.questions} questions")
+    print("=" * 60)
+    print(f"  {'':6} {'first job':>12} {'RSS':>10} {'PSS':>10} {'private':>10}")
+    for mode, row in summary.items():
+        print(
+            f"  {mode:6} {row['latency'] * 1000:9.1f} ms {row['rss'] / 1024:7.1f} MB "
+            f"{row['pss'] / 1024:7.1f} MB {row['private'] / 1024:7.1f} MB"
+        )
+    cold, warm = summary['cold'], summary['warm']
+    print(f"  First-job latency: {cold['latency'] / warm['latency']:.1f}x faster")
+    print(f"  Private memory per child: {(cold['private'] - warm['private']) / 1024:+.1f} MB saved")
+
+
+if __name__ == "__main__":
+    main()
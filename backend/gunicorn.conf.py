@@ -0,0 +1,42 @@
+"""
+Gunicorn configuration for running the API in production.
+
+Usage:
+    gunicorn -c gunicorn.conf.py app.main:socket_app
+
+Each worker is a uvicorn process with its own Socket.IO server and event
+relay. Socket.IO clients start on HTTP long-polling, and every request of
+a session must reach the process that holds it. Workers of one gunicorn
+share a port and can't be made sticky, so run one worker (the default)
+per replica and scale out with replicas behind a load balancer with
+sticky sessions (e.g. nginx ip_hash). Set SOCKETIO_REDIS_URL so emits
+from one replica reach clients of the others.
+"""
+import os
+
+from app.core.config import settings
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", 1))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Workers finish in-flight requests and flush pending progress on shutdown
+graceful_timeout = 30
+timeout = 120
+keepalive = 5
+
+loglevel = settings.LOG_LEVEL.lower()
+
+
+def on_starting(server):
+    """Warn about multi-worker setups (no sticky sessions, no Socket.IO message queue)."""
+    if workers > 1:
+        server.log.warning(
+            f"Running {workers} workers: long-polling Socket.IO clients need sticky sessions, "
+            "which gunicorn workers can't provide; prefer one worker per replica"
+        )
+    if workers > 1 and not settings.SOCKETIO_REDIS_URL:
+        server.log.warning(
+            f"Running {workers} workers without SOCKETIO_REDIS_URL: "
+            "events emitted by the API only reach clients of the same worker"
+        )
@@ -0,0 +1,221 @@
+"""
+Load test for the WebSocket server.
+
+Opens many simulated Socket.IO clients (default 20,000) against a running
+server, each subscribed to one of --rooms job rooms, then publishes
+progress events through Redis the way workers do (EventPublisher ->
+EventRelay -> Socket.IO) and measures how long they take to reach the
+clients. Reports:
+1. Connect throughput (handshake + subscribe, clients/s)
+2. Emit latency percentiles (publish to client receive; includes the
+   server's WS_FLUSH_HZ coalescing window, start it with WS_FLUSH_HZ=0
+   to measure the raw path)
+3. Disconnect throughput (clients/s)
+
+Clients are minimal Engine.IO v4 / Socket.IO v5 websocket clients (no
+polling upgrade) spread over several processes, so the load generator is
+not the bottleneck. Needs `websockets` (installed with uvicorn[standard])
+and the server's Redis. Raise the open files limit on both sides first
+(ulimit -n 65536).
+
+Usage:
+    uvicorn app.main:socket_app --port 8000
+    python loadtest_websocket.py [--url http://localhost:8000] [--clients 20000] [--rooms 200]
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing as mp
+import os
+import resource
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+
+def raise_nofile_limit():
+    """Raise the soft open files limit to the hard limit."""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    return hard
+
+
+def percentile(values: list, p: float) -> float:
+    """p-th percentile of sorted values."""
+    if not values:
+        return float('nan')
+    index = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+    return values[index]
+
+
+class Client:
+    """Minimal Socket.IO client: connect, subscribe, answer pings, record progress latency."""
+
+    def __init__(self, url: str, job_id: str, latencies: list):
+        self.url = url
+        self.job_id = job_id
+        self.latencies = latencies
+        self.ws = None
+        self.reader = None
+
+    async def connect(self):
+        import websockets
+
+        self.ws = await websockets.connect(self.url, compression=None, max_size=None, open_timeout=60)
+        await self.ws.recv()  # Engine.IO open packet
+        await self.ws.send('40')  # Socket.IO connect (default namespace)
+        while not (await self.ws.recv()).startswith('40'):
+            pass
+        await self.ws.send('42' + json.dumps(['subscribe', {'job_id': self.job_id}]))
+        self.reader = asyncio.create_task(self._read())
+
+    async def _read(self):
+        try:
+            async for message in self.ws:
+                if message == '2':
+                    await self.ws.send('3')  # Engine.IO pong
+                elif message.startswith('42'):
+                    event, data = json.loads(message[2:])[:2]
+                    if event == 'progress' and 'sent_at' in data:
+                        self.latencies.append(time.time() - data['sent_at'])
+        except Exception:
+            pass
+
+    async def close(self):
+        if self.reader:
+            self.reader.cancel()
+        await self.ws.send('41')  # Socket.IO disconnect
+        await self.ws.close()
+
+
+async def run_clients(url, job_ids, concurrency, results, emits_done):
+    """Connect clients, collect latencies until emits are done, then disconnect."""
+    latencies = []
+    clients = [Client(url, job_id, latencies) for job_id in job_ids]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(call):
+        async with semaphore:
+            try:
+                await call()
+                return True
+            except Exception:
+                return False
+
+    start = time.time()
+    connected = await asyncio.gather(*(limited(client.connect) for client in clients))
+    results.put(('connect', sum(connected), len(clients) - sum(connected), start, time.time()))
+
+    await asyncio.get_running_loop().run_in_executor(None, emits_done.wait)
+
+    clients = [client for client, ok in zip(clients, connected) if ok]
+    start = time.time()
+    closed = await asyncio.gather(*(limited(client.close) for client in clients))
+    results.put(('disconnect', sum(closed), len(clients) - sum(closed), start, time.time(), latencies))
+
+
+def client_process(url, job_ids, concurrency, results, emits_done):
+    raise_nofile_limit()
+    asyncio.run(run_clients(url, job_ids, concurrency, results, emits_done))
+
+
+def publish_events(rooms: list, emits: int, interval: float):
+    """Publish progress for every room through Redis, like the workers do."""
+    from app.services.event_bus import EventPublisher
+
+    publisher = EventPublisher(flush_interval_ms=0)
+    for n in range(1, emits + 1):
+        for job_id in rooms:
+            publisher.publish_progress(job_id, {
+                'progress': n * 100 // emits,
+                'step': f"Load test {n}/{emits}",
+                'sent_at': time.time()
+            })
+        publisher.flush()
+        time.sleep(interval)
+
+    # Terminal events let the server drop the rooms' progress state
+    for job_id in rooms:
+        publisher.publish_complete(job_id, {'output_filename': None})
+    publisher.flush()
+
+
+def collect(results, processes: int, phase: str) -> dict:
+    """Aggregate one phase's reports from all client processes."""
+    reports = [results.get() for _ in range(processes)]
+    assert all(report[0] == phase for report in reports)
+    return {
+        'ok': sum(report[1] for report in reports),
+        'failed': sum(report[2] for report in reports),
+        'seconds': max(report[4] for report in reports) - min(report[3] for report in reports),
+        'latencies': sorted(l for report in reports if len(report) > 5 for l in report[5]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--url', default='http://localhost:8000', help='Server URL')
+    parser.add_argument('--clients', type=int, default=20000, help='Simulated clients')
+    parser.add_argument('--rooms', type=int, default=200, help='Job rooms (clients spread evenly)')
+    parser.add_argument('--processes', type=int, default=min(os.cpu_count() or 1, 8), help='Client processes')
+    parser.add_argument('--concurrency', type=int, default=200, help='Concurrent handshakes per process')
+    parser.add_argument('--emits', type=int, default=20, help='Progress events per room')
+    parser.add_argument('--interval', type=float, default=0.5, help='Seconds between progress rounds')
+    parser.add_argument('--settle', type=float, default=2.0, help='Seconds to wait for the last events')
+    args = parser.parse_args()
+
+    limit = raise_nofile_limit()
+    if args.clients // args.processes + 100 > limit:
+        print(f"Open files limit {limit} is too low for {args.clients} clients; raise it (ulimit -n)")
+        return
+
+    ws_url = args.url.replace('http', 'ws', 1).rstrip('/') + '/socket.io/?EIO=4&transport=websocket'
+    rooms = [str(uuid.uuid4()) for _ in range(args.rooms)]
+    job_ids = [rooms[n % len(rooms)] for n in range(args.clients)]
+
+    results = mp.Queue()
+    emits_done = mp.Event()
+    processes = [
+        mp.Process(
+            target=client_process,
+            args=(ws_url, job_ids[n::args.processes], args.concurrency, results, emits_done)
+        )
+        for n in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+
+    connect = collect(results, args.processes, 'connect')
+    time.sleep(1)  # Let subscriptions land
+
+    publish_events(rooms, args.emits, args.interval)
+    time.sleep(args.settle)
+    emits_done.set()
+
+    disconnect = collect(results, args.processes, 'disconnect')
+    for process in processes:
+        process.join()
+
+    latencies = disconnect['latencies']
+    expected = connect['ok'] * args.emits
+
+    print("=" * 60)
+    print(f"WebSocket load test - {args.clients} clients, {args.rooms} rooms, {args.processes} processes")
+    print("=" * 60)
+    for name, phase in (('Connect', connect), ('Disconnect', disconnect)):
+        rate = phase['ok'] / phase['seconds'] if phase['seconds'] else 0
+        print(f"  {name:10} {phase['ok']:>7} ok {phase['failed']:>6} failed "
+              f"{phase['seconds']:>8.2f}s {rate:>10.0f} clients/s")
+    print(f"\n  Progress received: {len(latencies)} (at most {expected}; coalescing drops intermediate updates)")
+    print("  Emit latency (ms): " + "  ".join(
+        f"p{p}={percentile(latencies, p) * 1000:.1f}" for p in (50, 95, 99)
+    ) + f"  max={latencies[-1] * 1000 if latencies else float('nan'):.1f}")
+
+
+if __name__ == "__main__":
+    main()
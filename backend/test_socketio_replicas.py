@@ -0,0 +1,196 @@
+"""
+Test script for running several API replicas.
+
+Starts two local replicas of app.main:socket_app sharing a Socket.IO
+message queue (SOCKETIO_REDIS_URL, defaults to REDIS_URL) and checks:
+1. Worker events (EventPublisher -> EventRelay) reach clients of both
+   replicas exactly once
+2. Events emitted by the API of one replica (cancelling a pending job)
+   reach clients connected to the other
+
+Needs Postgres (migrated) and Redis from .env, and `websockets`
+(installed with uvicorn[standard]). Stop Celery workers first so the
+test job is still pending when it is cancelled.
+
+Usage:
+    python test_socketio_replicas.py [--ports 8101 8102]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.core.config import settings
+
+
+class SocketClient:
+    """Minimal websocket-only Socket.IO client collecting received events."""
+
+    def __init__(self, base_url: str):
+        self.url = base_url.replace('http', 'ws', 1) + '/socket.io/?EIO=4&transport=websocket'
+        self.events = asyncio.Queue()
+        self.ws = None
+        self.reader = None
+
+    async def connect(self):
+        import websockets
+
+        self.ws = await websockets.connect(self.url)
+        await self.ws.recv()  # Engine.IO open packet
+        await self.ws.send('40')
+        self.reader = asyncio.create_task(self._read())
+
+    async def subscribe(self, job_id: str):
+        await self.ws.send('42' + json.dumps(['subscribe', {'job_id': job_id}]))
+        await self.wait_for('subscribed')
+
+    async def wait_for(self, event: str, timeout: float = 5.0, match=None):
+        """Next received event with this name (and matching data); None on timeout."""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                name, data = await asyncio.wait_for(self.events.get(), remaining)
+            except asyncio.TimeoutError:
+                return None
+            if name == event and (match is None or match(data)):
+                return data
+
+    async def _read(self):
+        async for message in self.ws:
+            if message == '2':
+                await self.ws.send('3')  # Engine.IO pong
+            elif message.startswith('42'):
+                name, data = json.loads(message[2:])[:2]
+                await self.events.put((name, data))
+
+    async def close(self):
+        self.reader.cancel()
+        await self.ws.close()
+
+
+def start_replica(port: int) -> subprocess.Popen:
+    """Start one API replica with the shared Socket.IO message queue."""
+    env = dict(os.environ)
+    env.setdefault('SOCKETIO_REDIS_URL', settings.SOCKETIO_REDIS_URL or settings.REDIS_URL)
+    return subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'app.main:socket_app', '--port', str(port), '--log-level', 'warning'],
+        cwd=Path(__file__).parent,
+        env=env
+    )
+
+
+async def wait_healthy(base_url: str, timeout: float = 30.0):
+    async with httpx.AsyncClient() as client:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(f"{base_url}/health")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.5)
+    raise RuntimeError(f"{base_url} did not start")
+
+
+async def check_relayed_events_once(url_a: str, url_b: str) -> bool:
+    """Worker events reach clients of both replicas, once each."""
+    from app.services.event_bus import EventPublisher
+
+    job_id = str(uuid.uuid4())
+    clients = [SocketClient(url_a), SocketClient(url_b)]
+    for client in clients:
+        await client.connect()
+        await client.subscribe(job_id)
+
+    marker = uuid.uuid4().hex
+    publisher = EventPublisher(flush_interval_ms=0)
+    publisher.publish_progress(job_id, {'progress': 50, 'step': marker})
+    publisher.flush()
+
+    ok = True
+    for name, client in zip(('A', 'B'), clients):
+        first = await client.wait_for('progress', match=lambda data: data.get('step') == marker)
+        duplicate = await client.wait_for('progress', timeout=1.0, match=lambda data: data.get('step') == marker)
+        print(f"  Replica {name} client: {'received' if first else 'MISSING'}"
+              f"{', DUPLICATED' if duplicate else ''}")
+        ok = ok and first is not None and duplicate is None
+        await client.close()
+
+    return ok
+
+
+async def check_api_events_cross_replica(url_a: str, url_b: str) -> bool:
+    """Cancelling a pending job on replica A notifies a client of replica B."""
+    from app.core.warmup import minimal_pdf
+
+    async with httpx.AsyncClient(timeout=30) as http:
+        response = await http.post(
+            f"{url_a}{settings.API_V1_PREFIX}/jobs/",
+            files={'pdf_file': ('replicas.pdf', minimal_pdf([f"Q1. Replica test {uuid.uuid4().hex}"]), 'application/pdf')},
+            data={'page_start': 1, 'page_end': 1, 'question_start': 1, 'question_end': 1}
+        )
+        response.raise_for_status()
+        job_id = response.json()['id']
+
+        client = SocketClient(url_b)
+        await client.connect()
+        await client.subscribe(job_id)
+
+        response = await http.post(f"{url_a}{settings.API_V1_PREFIX}/jobs/{job_id}/cancel")
+        response.raise_for_status()
+
+        cancelled = await client.wait_for('cancelled')
+        await client.close()
+
+    print(f"  Replica B client: {'received' if cancelled else 'MISSING'} cancellation of job {job_id}")
+    return cancelled is not None
+
+
+async def run(ports):
+    url_a, url_b = (f"http://127.0.0.1:{port}" for port in ports)
+    replicas = [start_replica(port) for port in ports]
+
+    try:
+        await wait_healthy(url_a)
+        await wait_healthy(url_b)
+        await asyncio.sleep(1)  # Event relays subscribing
+
+        results = []
+        for check in (check_relayed_events_once, check_api_events_cross_replica):
+            print(f"\n{check.__doc__}")
+            results.append(await check(url_a, url_b))
+    finally:
+        for replica in replicas:
+            replica.terminate()
+            replica.wait()
+
+    print("\n" + ("All checks passed" if all(results) else "FAILED"))
+    return all(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--ports', type=int, nargs=2, default=[8101, 8102], help='Replica ports')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Socket.IO across API replicas - Test Script")
+    print("=" * 60)
+    sys.exit(0 if asyncio.run(run(args.ports)) else 1)
+
+
+if __name__ == "__main__":
+    main()
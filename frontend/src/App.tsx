@@ -15,10 +15,12 @@ interface JobResponse {
   pdf_filename?: string
 }
 
+// Progress events carry only the fields that changed since the previous one
 interface ProgressData {
-  progress: number
-  step: string
-  timestamp: string
+  seq: number
+  progress?: number
+  step?: string
+  timestamp?: string
 }
 
 interface CompleteData {
@@ -63,6 +65,7 @@ function App() {
 
   // Connect to WebSocket
   useEffect(() => {
+    // Default transports (long-polling fallback); several API replicas need sticky sessions
     const newSocket = io(API_URL)
     setSocket(newSocket)
 
@@ -87,8 +90,8 @@ function App() {
 
       // Listen for progress updates
       socket.on('progress', (data: ProgressData) => {
-        setProgress(data.progress)
-        setCurrentStep(data.step)
+        if (data.progress !== undefined) setProgress(data.progress)
+        if (data.step !== undefined) setCurrentStep(data.step)
       })
 
       // Listen for completion